@@ -0,0 +1,5 @@
+"""
+Export benchmarks of PeakRDL-etana on synthetic register maps.
+
+Run from the repository root with ``python -m benchmarks``.
+"""
@@ -0,0 +1,121 @@
+"""
+Usage:
+    python -m benchmarks [designs...] [-o results.json] [options]
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict
+
+from .designs import get_design_names
+from .runner import run_benchmarks, compare_results
+
+
+def parse_params(values: list) -> Dict[str, Dict[str, int]]:
+    params: Dict[str, Dict[str, int]] = {}
+    for value in values:
+        try:
+            key, n = value.split("=", 1)
+            design, param = key.split(".", 1)
+            params.setdefault(design, {})[param] = int(n)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Invalid parameter '{value}'. Expected DESIGN.PARAM=INT"
+            )
+    return params
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark PeakRDL-etana export time and memory on synthetic register maps",
+    )
+    parser.add_argument(
+        "designs",
+        nargs="*",
+        metavar="DESIGN",
+        help=f"Designs to benchmark: {', '.join(get_design_names())} (default: all)",
+    )
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="DESIGN.PARAM=INT",
+        help="Override a design size parameter, e.g. flat_regs.n=10000",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of timed runs per design. The fastest is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip the traced run that measures peak memory",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Passed through to the exporter's --jobs option (default: 1)",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="BASELINE",
+        help="Compare against a previous results file. Exits with an error if any design regressed",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Factor by which export time or memory may grow before --compare reports a regression (default: 1.2)",
+    )
+    args = parser.parse_args()
+
+    for name in args.designs:
+        if name not in get_design_names():
+            parser.error(f"Unknown design '{name}'")
+
+    try:
+        params = parse_params(args.param)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    export_kwargs = {}
+    if args.jobs > 1:
+        export_kwargs["jobs"] = args.jobs
+
+    results = run_benchmarks(
+        names=args.designs or None,
+        params=params,
+        repeat=args.repeat,
+        measure_memory=not args.no_memory,
+        export_kwargs=export_kwargs,
+        log=print,
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions relative to {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
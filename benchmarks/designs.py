@@ -0,0 +1,193 @@
+"""
+Synthetic SystemRDL designs for exporter benchmarks.
+
+Each generator returns the SystemRDL source of a single top-level addrmap
+named after the design. Sizes are parameterized so that the same design
+can be scaled up to stress a particular part of the exporter.
+"""
+
+from typing import Callable, Dict, List
+
+
+def flat_regs(n: int = 2000) -> str:
+    """
+    N individually instantiated registers, each with a mix of field types
+    """
+    lines = [
+        "addrmap flat_regs {",
+        "    reg reg_t {",
+        "        field {sw=rw; hw=r;} ctrl[15:0] = 0;",
+        "        field {sw=r; hw=w;} status[23:16];",
+        "        field {sw=rw; hw=r; singlepulse;} go[24:24] = 0;",
+        "        field {sw=rw; hw=rw; we;} data[31:25] = 0;",
+        "    };",
+    ]
+    lines.extend(f"    reg_t r{i};" for i in range(n))
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def nested_regfile_arrays(depth: int = 6, dim: int = 4, n_regs: int = 16) -> str:
+    """
+    Regfile arrays nested depth levels deep, each level an array of dim
+    elements. The innermost regfile holds n_regs registers.
+    """
+    lines = [
+        "reg nested_reg_t {",
+        "    field {sw=rw; hw=r;} a[15:0] = 0;",
+        "    field {sw=r; hw=w;} b[31:16];",
+        "};",
+        "regfile rf0_t {",
+    ]
+    lines.extend(f"    nested_reg_t r{i};" for i in range(n_regs))
+    lines.append("};")
+    for level in range(1, depth):
+        lines.extend(
+            [
+                f"regfile rf{level}_t {{",
+                f"    rf{level - 1}_t sub[{dim}];",
+                "};",
+            ]
+        )
+    lines.extend(
+        [
+            "addrmap nested_regfile_arrays {",
+            f"    rf{depth - 1}_t top[{dim}];",
+            "};",
+        ]
+    )
+    return "\n".join(lines) + "\n"
+
+
+def wide_regs(n: int = 200, regwidth: int = 128, accesswidth: int = 32) -> str:
+    """
+    N registers that are wider than the CPU interface. Writable registers have
+    one field per accesswidth-sized subword; read-only registers have a single
+    field spanning all subwords.
+    """
+    lines = [
+        "addrmap wide_regs {",
+        "    reg wide_rw_t {",
+        f"        regwidth = {regwidth};",
+        f"        accesswidth = {accesswidth};",
+    ]
+    for lsb in range(0, regwidth, accesswidth):
+        lines.append(
+            f"        field {{sw=rw; hw=r;}} word{lsb // accesswidth}"
+            f"[{lsb + accesswidth - 1}:{lsb}] = 0;"
+        )
+    lines.extend(
+        [
+            "    };",
+            "    reg wide_ro_t {",
+            f"        regwidth = {regwidth};",
+            f"        accesswidth = {accesswidth};",
+            f"        field {{sw=r; hw=w;}} value[{regwidth - 1}:0];",
+            "    };",
+        ]
+    )
+    for i in range(n):
+        if i % 2:
+            lines.append(f"    wide_ro_t r{i};")
+        else:
+            lines.append(f"    wide_rw_t r{i};")
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def external_mems(n: int = 100, mementries: int = 256, memwidth: int = 32) -> str:
+    """
+    N external memories, alternating between read-write and read-only, next
+    to an internal control register
+    """
+    lines = [
+        "addrmap external_mems {",
+        "    reg {",
+        "        field {sw=rw; hw=r;} enable[31:0] = 0;",
+        "    } ctrl;",
+    ]
+    for i in range(n):
+        sw = "r" if i % 2 else "rw"
+        lines.extend(
+            [
+                "    external mem {",
+                f"        mementries = {mementries};",
+                f"        memwidth = {memwidth};",
+                f"        sw = {sw};",
+                f"    }} m{i};",
+            ]
+        )
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def counters(n: int = 500) -> str:
+    """
+    N registers holding up, down, up/down and saturating counters
+    """
+    lines = [
+        "addrmap counters {",
+        "    reg counter_reg_t {",
+        "        field {sw=r; hw=na; counter;} up[7:0] = 0;",
+        "        field {sw=r; hw=na; counter; decrvalue=1;} down[15:8] = 0;",
+        "        field {",
+        "            sw=r; hw=r; counter;",
+        "            incrvalue=1; decrvalue=1;",
+        "            overflow; underflow;",
+        "        } updown[23:16] = 0;",
+        "        field {",
+        "            sw=rw; hw=na; counter;",
+        "            incrsaturate; decrvalue=1; decrsaturate;",
+        "        } sat[31:24] = 0;",
+        "    };",
+    ]
+    lines.extend(f"    counter_reg_t c{i};" for i in range(n))
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+def interrupts(n: int = 500) -> str:
+    """
+    N interrupt status registers with enables and halt masks
+    """
+    lines = [
+        "addrmap interrupts {",
+        "    reg {",
+        "        field {sw=rw; hw=na;} en[31:0] = 0;",
+        "    } irq_enable;",
+        "    reg {",
+        "        field {sw=rw; hw=na;} mask[31:0] = 0;",
+        "    } irq_mask;",
+        "    reg intr_reg_t {",
+        "        field {",
+        "            sw=rw; hw=w;",
+        "            level intr;",
+        "            woclr;",
+        "        } status[31:0] = 0;",
+        "    };",
+    ]
+    for i in range(n):
+        lines.extend(
+            [
+                f"    intr_reg_t irq{i};",
+                f"    irq{i}.status->enable = irq_enable.en;",
+                f"    irq{i}.status->haltmask = irq_mask.mask;",
+            ]
+        )
+    lines.append("};")
+    return "\n".join(lines) + "\n"
+
+
+# Design name -> generator
+DESIGNS: Dict[str, Callable[..., str]] = {
+    "flat_regs": flat_regs,
+    "nested_regfile_arrays": nested_regfile_arrays,
+    "wide_regs": wide_regs,
+    "external_mems": external_mems,
+    "counters": counters,
+    "interrupts": interrupts,
+}
+
+
+def get_design_names() -> List[str]:
+    return list(DESIGNS.keys())
@@ -0,0 +1,269 @@
+"""
+Times and measures the memory use of exports of the synthetic designs.
+
+Each design is measured in phases:
+
+- ``compile``: compiling and elaborating the generated SystemRDL
+- ``export``: ``RegblockExporter.export()``
+
+Wall time is the best of a number of untraced runs. Peak memory is measured
+in a separate run with ``tracemalloc`` enabled, since tracing slows down
+execution considerably. The export phase is further broken down into the
+exporter's own phases, as recorded by its
+:class:`~peakrdl_etana.profiling.ExportProfiler`: their times come from the
+fastest untraced run and their peak memory from the traced run.
+"""
+
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from systemrdl import RDLCompiler
+from systemrdl.node import AddrmapNode
+
+from peakrdl_etana import RegblockExporter
+from peakrdl_etana.__about__ import __version__
+from peakrdl_etana.profiling import ExportProfiler
+from peakrdl_etana.udps import ALL_UDPS
+
+from .designs import DESIGNS
+
+RESULTS_FORMAT_VERSION = 1
+
+# Export time differences below this many seconds are treated as noise
+MIN_TIME_DELTA = 0.05
+# Peak memory differences of the exporter's phases below this many bytes are
+# treated as noise
+MIN_PHASE_MEMORY_DELTA = 256 * 2**10
+
+
+def _measure(fn: Callable[[], Any], trace: bool) -> Tuple[Any, float, Optional[int]]:
+    """
+    Run fn, returning its result, wall time and, if trace is set, the peak
+    traced memory in bytes
+    """
+    if trace:
+        tracemalloc.start()
+    try:
+        t = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+    finally:
+        if trace:
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _compile(rdl_path: str) -> AddrmapNode:
+    rdlc = RDLCompiler()
+    for udp in ALL_UDPS:
+        rdlc.register_udp(udp)
+    rdlc.compile_file(rdl_path)
+    return rdlc.elaborate().top
+
+
+def _run_once(
+    rdl_path: str, output_dir: str, export_kwargs: Dict[str, Any], trace: bool
+) -> Dict[str, Dict[str, Any]]:
+    phases: Dict[str, Dict[str, Any]] = {}
+
+    top, elapsed, peak = _measure(lambda: _compile(rdl_path), trace)
+    phases["compile"] = {"time": elapsed, "peak_memory": peak}
+
+    # Profiling renders sections serially, so it is skipped for parallel
+    # exports
+    profiler = None
+    if export_kwargs.get("jobs", 1) <= 1:
+        profiler = ExportProfiler(trace_memory=trace)
+
+    exporter = RegblockExporter()
+    _, elapsed, peak = _measure(
+        lambda: exporter.export(top, output_dir, profiler=profiler, **export_kwargs),
+        trace,
+    )
+    if profiler is not None and profiler.peak_memory is not None:
+        # The profiler resets the tracemalloc peak at each phase
+        peak = max(peak or 0, profiler.peak_memory)
+    phases["export"] = {"time": elapsed, "peak_memory": peak}
+    if profiler is not None:
+        phases["export"]["phases"] = {
+            name: stats.to_dict() for name, stats in profiler.phases.items()
+        }
+    return phases
+
+
+def run_design(
+    name: str,
+    params: Optional[Dict[str, int]] = None,
+    repeat: int = 3,
+    measure_memory: bool = True,
+    export_kwargs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Benchmark the export of a single synthetic design.
+
+    Parameters
+    ----------
+    name: str
+        Name of the design generator. See ``benchmarks.designs.DESIGNS``
+    params: dict
+        Overrides of the design generator's size parameters
+    repeat: int
+        Number of timed runs. The fastest one is reported.
+    measure_memory: bool
+        Do an additional traced run to measure peak memory per phase
+    export_kwargs: dict
+        Additional keyword arguments passed to ``RegblockExporter.export()``
+    """
+    params = params or {}
+    export_kwargs = export_kwargs or {}
+    rdl = DESIGNS[name](**params)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rdl_path = os.path.join(tmpdir, f"{name}.rdl")
+        output_dir = os.path.join(tmpdir, "out")
+        with open(rdl_path, "w", encoding="utf-8") as f:
+            f.write(rdl)
+
+        runs = [
+            _run_once(rdl_path, output_dir, export_kwargs, trace=False)
+            for _ in range(max(repeat, 1))
+        ]
+        phases: Dict[str, Dict[str, Any]] = {}
+        for phase in runs[0]:
+            phases[phase] = {"time": min(run[phase]["time"] for run in runs)}
+        fastest = min(runs, key=lambda run: run["export"]["time"])
+        if "phases" in fastest["export"]:
+            phases["export"]["phases"] = fastest["export"]["phases"]
+
+        if measure_memory:
+            traced = _run_once(rdl_path, output_dir, export_kwargs, trace=True)
+            for phase, result in traced.items():
+                phases[phase]["peak_memory"] = result["peak_memory"]
+                # Keep the untraced times of the exporter's phases
+                for sub, stats in phases[phase].get("phases", {}).items():
+                    traced_stats = result.get("phases", {}).get(sub, {})
+                    stats["peak_memory"] = traced_stats.get("peak_memory")
+
+        output_size = sum(
+            os.path.getsize(os.path.join(output_dir, filename))
+            for filename in os.listdir(output_dir)
+        )
+
+    return {
+        "design": name,
+        "params": params,
+        "rdl_lines": rdl.count("\n"),
+        "output_bytes": output_size,
+        "phases": phases,
+    }
+
+
+def run_benchmarks(
+    names: Optional[List[str]] = None,
+    params: Optional[Dict[str, Dict[str, int]]] = None,
+    repeat: int = 3,
+    measure_memory: bool = True,
+    export_kwargs: Optional[Dict[str, Any]] = None,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Benchmark the export of several synthetic designs and return the results
+    as a JSON-serializable dictionary
+    """
+    if names is None:
+        names = list(DESIGNS.keys())
+    params = params or {}
+
+    results = []
+    for name in names:
+        result = run_design(
+            name, params.get(name), repeat, measure_memory, export_kwargs
+        )
+        if log is not None:
+            log(format_result(result))
+        results.append(result)
+
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "peakrdl_etana_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "argv": sys.argv[1:],
+        "results": results,
+    }
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    parts = []
+    for phase, m in result["phases"].items():
+        s = f"{phase} {m['time']:.3f}s"
+        if m.get("peak_memory") is not None:
+            s += f" / {m['peak_memory'] / 2**20:.1f} MiB"
+        parts.append(s)
+    return f"{result['design']}: " + ", ".join(parts)
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Compare the export phase of two benchmark runs.
+
+    Returns a description of every design whose export time or peak memory,
+    or the peak memory of one of the exporter's phases, grew by more than
+    the given factor relative to the baseline. Designs that were run with
+    different parameters are not compared. Time differences smaller than
+    ``MIN_TIME_DELTA`` and phase memory differences smaller than
+    ``MIN_PHASE_MEMORY_DELTA`` are ignored.
+    """
+    base_results = {r["design"]: r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = base_results.get(result["design"])
+        if base is None or base["params"] != result["params"]:
+            continue
+        base_export = base["phases"]["export"]
+        export = result["phases"]["export"]
+
+        checks = [
+            (
+                "export time",
+                base_export.get("time"),
+                export.get("time"),
+                MIN_TIME_DELTA,
+            ),
+            (
+                "export peak_memory",
+                base_export.get("peak_memory"),
+                export.get("peak_memory"),
+                0,
+            ),
+        ]
+        base_phases = base_export.get("phases", {})
+        for name, stats in export.get("phases", {}).items():
+            checks.append(
+                (
+                    f"export phase '{name}' peak_memory",
+                    base_phases.get(name, {}).get("peak_memory"),
+                    stats.get("peak_memory"),
+                    MIN_PHASE_MEMORY_DELTA,
+                )
+            )
+
+        for what, old, new, min_delta in checks:
+            if not old or new is None or new - old < min_delta:
+                continue
+            if new > old * threshold:
+                regressions.append(
+                    f"{result['design']}: {what} increased "
+                    f"from {old:.6g} to {new:.6g} ({new / old:.2f}x)"
+                )
+    return regressions
@@ -12,16 +12,11 @@ Requires: peakrdl-regblock to be installed
 import sys
 import os
 import argparse
-import tempfile
 
 # Add the package directory to Python path so we can import modules
 script_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, script_dir)
 
-# Import our modules
-from hwif_wrapper_tool.parser import parse_hwif_report  # noqa: E402
-from hwif_wrapper_tool.wrapper_builder import WrapperBuilder  # noqa: E402
-
 
 def main():
     """Main entry point"""
@@ -57,14 +52,68 @@ def main():
         "--rename", help="Override the top-component's instantiated name"
     )
 
+    # The remaining options match those of 'peakrdl regblock'
+    parser.add_argument(
+        "--hwif-report", action="store_true", help="Generate a HWIF report file"
+    )
+
+    parser.add_argument(
+        "--addr-width",
+        type=int,
+        help="Override the CPU interface's address width",
+    )
+
+    parser.add_argument(
+        "--rt-read-fanin",
+        action="store_true",
+        help="Enable additional read path retiming",
+    )
+
+    parser.add_argument(
+        "--rt-read-response",
+        action="store_true",
+        help="Enable additional retiming stage between readback fan-in and cpu interface",
+    )
+
+    parser.add_argument(
+        "--rt-external",
+        help="Retime outputs to external components. Comma-separated list of: reg,regfile,mem,addrmap,all",
+    )
+
+    parser.add_argument(
+        "--default-reset",
+        choices=["rst", "rst_n", "arst", "arst_n"],
+        default="rst",
+        help="Default style of reset signal (default: rst)",
+    )
+
+    parser.add_argument(
+        "--err-if-bad-addr",
+        action="store_true",
+        help="Respond with an error on accesses to unmapped addresses",
+    )
+
+    parser.add_argument(
+        "--err-if-bad-rw",
+        action="store_true",
+        help="Respond with an error on illegal reads or writes",
+    )
+
     args = parser.parse_args()
 
+    rt_external = set()
+    if args.rt_external:
+        rt_external = {key.strip().lower() for key in args.rt_external.split(",")}
+        invalid = rt_external - {"reg", "regfile", "mem", "addrmap", "all"}
+        if invalid:
+            parser.error(f"invalid option for --rt-external: {', '.join(invalid)}")
+        if "all" in rt_external:
+            rt_external = {"reg", "regfile", "mem", "addrmap"}
+
     try:
         # Import here to avoid issues if not installed
         from systemrdl import RDLCompiler
-        from peakrdl_regblock import RegblockExporter
         from peakrdl_regblock.udps import ALL_UDPS
-        from peakrdl_regblock.identifier_filter import kw_filter as kwf
 
         # Dynamically build CPU interface map based on what's available
         # This ensures compatibility with different peakrdl-regblock versions
@@ -135,71 +184,42 @@ def main():
 
         cpuif_cls = cpuif_map[args.cpuif]
 
-        # Create temporary directory for hwif report
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Export with hwif report enabled
-            exp = RegblockExporter()
-            exp.export(
-                root,
-                temp_dir,
-                cpuif_cls=cpuif_cls,
-                module_name=args.module_name,
-                package_name=args.package_name,
-                generate_hwif_report=True,
-                reuse_hwif_typedefs=(args.type_style == "lexical"),
-            )
-
-            # Get the actual module and package names
-            if args.module_name is None:
-                actual_module_name = kwf(root.top.inst_name)
-            else:
-                actual_module_name = args.module_name
-
-            if args.package_name is None:
-                actual_package_name = f"{actual_module_name}_pkg"
-            else:
-                actual_package_name = args.package_name
-
-            # Create output directory
-            os.makedirs(args.output, exist_ok=True)
-
-            # Check if hwif report exists
-            report_path = os.path.join(temp_dir, f"{actual_module_name}_hwif.rpt")
-
-            if not os.path.exists(report_path):
-                # No report means no hwif signals - generate wrapper with empty lists
-                input_signals = []
-                output_signals = []
-            else:
-                # Parse hwif report
-                input_signals, output_signals = parse_hwif_report(report_path)
-
-            # Note: Generate wrapper even if no hwif signals (empty lists are fine)
-
-            # Read module file from temp directory
-            module_path = os.path.join(temp_dir, f"{actual_module_name}.sv")
-            with open(module_path, "r", encoding="utf-8") as f:
-                module_content = f.read()
-
-            # Build wrapper
-            builder = WrapperBuilder(
-                module_name=actual_module_name,
-                package_name=actual_package_name,
-                inst_name=root.top.inst_name,
-                module_content=module_content,
-                input_signals=input_signals,
-                output_signals=output_signals,
-            )
-
-            wrapper_content = builder.generate()
-
-            # Write wrapper file
-            wrapper_path = os.path.join(args.output, f"{actual_module_name}_wrapper.sv")
-            with open(wrapper_path, "w", encoding="utf-8") as f:
-                f.write(wrapper_content)
-
-            print(f"Generated wrapper: {args.output}/{actual_module_name}_wrapper.sv")
-            print("\n✅ Wrapper generation complete!")
+        # Export the regblock and its wrapper in one run
+        from hwif_wrapper_tool.exporter import WrapperExporter
+
+        # regblock opens the hwif report before creating the output directory
+        os.makedirs(args.output, exist_ok=True)
+
+        exp = WrapperExporter()
+        exp.export(
+            root,
+            args.output,
+            cpuif_cls=cpuif_cls,
+            module_name=args.module_name,
+            package_name=args.package_name,
+            reuse_hwif_typedefs=(args.type_style == "lexical"),
+            retime_read_fanin=args.rt_read_fanin,
+            retime_read_response=args.rt_read_response,
+            retime_external_reg="reg" in rt_external,
+            retime_external_regfile="regfile" in rt_external,
+            retime_external_mem="mem" in rt_external,
+            retime_external_addrmap="addrmap" in rt_external,
+            generate_hwif_report=args.hwif_report,
+            address_width=args.addr_width,
+            default_reset_activelow=args.default_reset.endswith("_n"),
+            default_reset_async=args.default_reset.startswith("arst"),
+            err_if_bad_addr=args.err_if_bad_addr,
+            err_if_bad_rw=args.err_if_bad_rw,
+            generate_hwif_wrapper=True,
+        )
+
+        print(f"Generated files in {args.output}:")
+        print(f"  - {exp.ds.package_name}.sv")
+        print(f"  - {exp.ds.module_name}.sv")
+        if args.hwif_report:
+            print(f"  - {exp.ds.module_name}_hwif.rpt")
+        print(f"  - {exp.ds.module_name}_wrapper.sv")
+        print("\n✅ Wrapper generation complete!")
 
     except Exception as e:
         print(f"\n❌ Error: {e}", file=sys.stderr)
@@ -0,0 +1,198 @@
+"""
+Wrapper Exporter
+PeakRDL-regblock exporter that can also write the hwif wrapper module
+"""
+import inspect
+import os
+import tempfile
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union
+
+from peakrdl_regblock import RegblockExporter
+from systemrdl.node import AddrmapNode, RootNode
+
+from .hwif_signal import HwifSignal
+from .parser import parse_hwif_report
+from .wrapper_builder import WrapperBuilder
+
+if TYPE_CHECKING:
+    from peakrdl_regblock.hwif import Hwif
+
+
+# The signal collector extends the hwif struct generators of peakrdl-regblock
+# (Hwif._gen_in_cls/_gen_out_cls). They are not a public API, so they are
+# checked at runtime and the public hwif report is used when they don't match.
+_PUSH_STRUCT_PARAMS = ("type_name", "inst_name", "array_dimensions", "packed")
+_ADD_MEMBER_PARAMS = ("name", "width", "lsb", "signed")
+
+
+def _has_params(func: Any, names: Tuple[str, ...]) -> bool:
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+    return all(name in params for name in names)
+
+
+def hwif_model_supported(hwif: "Hwif") -> bool:
+    """
+    Check that the hwif struct generators of the installed peakrdl-regblock
+    provide what the signal collector hooks into
+    """
+    for attr in ("_gen_in_cls", "_gen_out_cls"):
+        gen_cls = getattr(hwif, attr, None)
+        if gen_cls is None:
+            return False
+        if not (
+            _has_params(getattr(gen_cls, "push_struct", None), _PUSH_STRUCT_PARAMS)
+            and _has_params(getattr(gen_cls, "add_member", None), _ADD_MEMBER_PARAMS)
+            and callable(getattr(gen_cls, "pop_struct", None))
+        ):
+            return False
+        try:
+            gen = gen_cls(hwif)
+        except TypeError:
+            return False
+        report_stack = getattr(gen, "hwif_report_stack", None)
+        if not (isinstance(report_stack, list) and len(report_stack) == 1):
+            return False
+    return True
+
+
+def _collecting_generator(gen_cls: Type) -> Type:
+    """Extend one of the hwif struct generator classes so that it records
+    every struct member it emits as a HwifSignal"""
+
+    class HwifSignalCollector(gen_cls):  # type: ignore[valid-type,misc]
+        def __init__(self, hwif: "Hwif") -> None:
+            super().__init__(hwif)
+            self.prefix = self.hwif_report_stack[0]
+            self.segments: List[Tuple[str, Tuple[int, ...]]] = []
+            self.signals: List[HwifSignal] = []
+
+        def push_struct(  # type: ignore[no-untyped-def]
+            self, type_name, inst_name, array_dimensions=None, packed=False
+        ) -> None:
+            super().push_struct(type_name, inst_name, array_dimensions, packed)
+            self.segments.append((inst_name, tuple(array_dimensions or ())))
+
+        def pop_struct(self) -> None:
+            super().pop_struct()
+            self.segments.pop()
+
+        def add_member(  # type: ignore[no-untyped-def]
+            self, name, width=1, *, lsb=0, signed=False
+        ) -> None:
+            super().add_member(name, width, lsb=lsb, signed=signed)
+            self.signals.append(
+                HwifSignal(self.prefix, tuple(self.segments), name, width, lsb)
+            )
+
+    return HwifSignalCollector
+
+
+def collect_hwif_signals(hwif: "Hwif") -> Tuple[List[HwifSignal], List[HwifSignal]]:
+    """
+    Walk the design with the exporter's own hwif struct generators and return
+    the input and output signals
+    """
+    type_name = hwif.top_node.inst_name
+
+    gen_in = _collecting_generator(hwif._gen_in_cls)(hwif)
+    gen_in.get_struct(hwif.top_node, f"{type_name}__in_t")
+
+    gen_out = _collecting_generator(hwif._gen_out_cls)(hwif)
+    gen_out.get_struct(hwif.top_node, f"{type_name}__out_t")
+
+    return gen_in.signals, gen_out.signals
+
+
+class WrapperExporter(RegblockExporter):
+    """
+    RegblockExporter with an additional ``generate_hwif_wrapper`` option.
+
+    The wrapper is built from the exporter's live hwif model in the same run
+    that writes the regblock module and package. If a hwif report is
+    generated anyway, or the installed peakrdl-regblock does not expose that
+    model as expected, the signals are read from the hwif report instead.
+    """
+
+    def export(  # type: ignore[override]
+        self, node: Union[AddrmapNode, RootNode], output_dir: str, **kwargs: Any
+    ) -> None:
+        """
+        Parameters
+        ----------
+        generate_hwif_wrapper: bool
+            If set, also write ``<module_name>_wrapper.sv``, which flattens
+            the hwif structs into individual ports.
+
+        All other arguments are passed to ``RegblockExporter.export()``.
+        """
+        generate_hwif_wrapper = kwargs.pop("generate_hwif_wrapper", False)
+
+        super().export(node, output_dir, **kwargs)
+
+        if generate_hwif_wrapper:
+            signals = self._get_hwif_signals(node, output_dir, kwargs)
+            self.write_hwif_wrapper(output_dir, *signals)
+
+    def _get_hwif_signals(
+        self,
+        node: Union[AddrmapNode, RootNode],
+        output_dir: str,
+        kwargs: Dict[str, Any],
+    ) -> Tuple[List[HwifSignal], List[HwifSignal]]:
+        report_name = f"{self.ds.module_name}_hwif.rpt"
+        if kwargs.get("generate_hwif_report", False):
+            return parse_hwif_report(os.path.join(output_dir, report_name))
+
+        hwif = getattr(self, "hwif", None)
+        if hwif is not None and hwif_model_supported(hwif):
+            return collect_hwif_signals(hwif)
+
+        # Export again with a hwif report, without touching output_dir
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            super().export(node, tmp_dir, **dict(kwargs, generate_hwif_report=True))
+            return parse_hwif_report(os.path.join(tmp_dir, report_name))
+
+    def write_hwif_wrapper(
+        self,
+        output_dir: str,
+        input_signals: List[HwifSignal],
+        output_signals: List[HwifSignal],
+    ) -> str:
+        """
+        Write the hwif wrapper of the most recent export. Returns its path.
+        """
+        builder = WrapperBuilder(
+            module_name=self.ds.module_name,
+            package_name=self.ds.package_name,
+            inst_name=self.ds.top_node.inst_name,
+            params=self._get_module_parameters(),
+            non_hwif_ports=self._get_non_hwif_ports(),
+            input_signals=input_signals,
+            output_signals=output_signals,
+        )
+
+        wrapper_path = os.path.join(output_dir, f"{self.ds.module_name}_wrapper.sv")
+        with open(wrapper_path, "w", encoding="utf-8") as f:
+            f.write(builder.generate())
+        return wrapper_path
+
+    def _get_module_parameters(self) -> Optional[List[str]]:
+        if not self.module_has_parameters():
+            return None
+        return list(self.cpuif.parameters)
+
+    def _get_non_hwif_ports(self) -> List[str]:
+        """All module port declarations except hwif_in and hwif_out"""
+        ports = []
+        for line in self.get_module_port_list().split("\n"):
+            line = line.strip().rstrip(",")
+            if not line or line.startswith("//"):
+                continue
+            # hwif struct ports are declared with a package-scoped type
+            if "::" in line and ("hwif_in" in line or "hwif_out" in line):
+                continue
+            ports.append(line)
+        return ports
@@ -0,0 +1,108 @@
+"""
+HWIF Signal
+Structured description of a single hwif struct member
+"""
+from typing import List, Optional, Tuple
+
+
+class HwifSignal:
+    """Represents a single hwif signal
+
+    Built from the exporter's hwif struct generators, or from a line of the
+    hwif report, with the struct hierarchy, array dimensions and bit range
+    already split out.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        segments: Tuple[Tuple[str, Tuple[int, ...]], ...],
+        member: str,
+        width: int,
+        lsb: int,
+    ):
+        # "hwif_in" or "hwif_out"
+        self.prefix = prefix
+        # (instance name, array dimensions) of each struct level below the
+        # top-level hwif struct
+        self.segments = segments
+        self.member = member
+        self.width = width
+        self.lsb = lsb
+
+        if prefix == "hwif_in":
+            self.direction = "input"
+        elif prefix == "hwif_out":
+            self.direction = "output"
+        else:
+            raise ValueError(f"Unknown hwif prefix: {prefix}")
+
+        # Size of each array dimension, outermost first
+        self.array_dims: List[int] = [dim for _, dims in segments for dim in dims]
+
+        # Generate flat name
+        self.flat_name = "_".join([name for name, _ in segments] + [member])
+        self.port_name = self._generate_port_name()
+
+    def _generate_port_name(self) -> str:
+        """Generate port name with suffix removal ONLY if the member is next or value
+        Converts to lowercase to match etana's naming convention
+        """
+        name = self.flat_name
+
+        # Only remove suffix if the member itself is next or value
+        # (not if it's part of the field name like f_next_value)
+        if self.member == "next":
+            name = name[:-5]
+        elif self.member == "value":
+            name = name[:-6]
+
+        # Remove redundant names (e.g., x_x becomes x)
+        parts = name.split("_")
+        if len(parts) >= 2 and parts[-1] == parts[-2]:
+            name = "_".join(parts[:-1])
+
+        # Convert to lowercase to match etana's naming convention
+        return name.lower()
+
+    def get_struct_path(self, index_vars: Optional[List[str]] = None) -> str:
+        """Hierarchical path of the member in the hwif struct
+
+        Array levels are indexed by index_vars, in order. Without index
+        variables, each array level is shown with its range, as in the hwif
+        report.
+        """
+        parts = [self.prefix]
+        var_iter = iter(index_vars or [])
+        for name, dims in self.segments:
+            if index_vars is None:
+                parts.append(name + "".join(f"[0:{dim - 1}]" for dim in dims))
+            else:
+                parts.append(name + "".join(f"[{next(var_iter)}]" for _ in dims))
+        parts.append(self.member)
+        return ".".join(parts)
+
+    @property
+    def struct_path(self) -> str:
+        return self.get_struct_path()
+
+    def get_port_declaration(self) -> str:
+        """Generate port declaration string with unpacked array format
+
+        Format: <direction> logic [packed] <name> [unpacked...]
+        Example: output logic [31:0] signal_name [7:0]
+        """
+        # Build unpacked dimensions (arrays) - in REVERSE order
+        # These go AFTER the signal name
+        unpacked_dims = ""
+        for size in reversed(self.array_dims):
+            unpacked_dims += f" [{size-1}:0]"
+
+        # Build packed dimension (bit width) - goes BEFORE signal name
+        if self.width == 1 and self.lsb == 0:
+            packed_dim = ""
+        else:
+            packed_dim = f"[{self.lsb + self.width - 1}:{self.lsb}] "
+
+        # Format: <direction> logic [packed] <name> [unpacked...]
+        return f"{self.direction} logic {packed_dim}{self.prefix}_{self.port_name}{unpacked_dims}"
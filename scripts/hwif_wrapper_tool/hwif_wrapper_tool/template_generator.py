@@ -1,9 +1,8 @@
 """
 Template Generator for Wrapper Module
 """
-import re
 from typing import List, Tuple
-from .parser import HwifSignal
+from .hwif_signal import HwifSignal
 
 
 def generate_flat_assignments(signals: List[HwifSignal], is_input: bool) -> str:
@@ -42,10 +41,11 @@ def _generate_array_assignment(signal: HwifSignal, is_input: bool) -> List[str]:
     lines.append("    generate")
 
     # Create nested for loops
-    for idx, ((first, last), var) in enumerate(zip(signal.array_dims, index_vars)):
-        size = abs(first - last)
+    for idx, (dim, var) in enumerate(zip(signal.array_dims, index_vars)):
         indent = "    " * (idx + 2)
-        lines.append(f"{indent}for (genvar {var} = 0; {var} <= {size}; {var}++) begin")
+        lines.append(
+            f"{indent}for (genvar {var} = 0; {var} <= {dim - 1}; {var}++) begin"
+        )
 
     # Generate the assignment
     indent = "    " * (len(signal.array_dims) + 2)
@@ -54,8 +54,8 @@ def _generate_array_assignment(signal: HwifSignal, is_input: bool) -> List[str]:
     # Array indices for flat port (REVERSED order)
     flat_indices = "".join([f"[{var}]" for var in reversed(index_vars)])
 
-    # Replace each [N:M] in struct path with index variables
-    struct_path_with_indices = _insert_indices_in_path(signal.struct_path, index_vars)
+    # Index each array level of the struct path with its loop variable
+    struct_path_with_indices = signal.get_struct_path(index_vars)
 
     if is_input:
         lines.append(
@@ -76,21 +76,6 @@ def _generate_array_assignment(signal: HwifSignal, is_input: bool) -> List[str]:
     return lines
 
 
-def _insert_indices_in_path(struct_path: str, index_vars: List[str]) -> str:
-    """Replace each [N:M] range with corresponding index variable"""
-    idx_counter = 0
-
-    def replace_with_index(match):
-        nonlocal idx_counter
-        if idx_counter < len(index_vars):
-            result = f"[{index_vars[idx_counter]}]"
-            idx_counter += 1
-            return result
-        return match.group(0)
-
-    return re.sub(r"\[(\d+):(\d+)\]", replace_with_index, struct_path)
-
-
 def parse_cpu_ports(port_declaration: str) -> List[Tuple[str, str]]:
     """
     Parse CPU interface port declaration to extract port names for connections
@@ -2,9 +2,8 @@
 Wrapper Builder
 Constructs the wrapper module content
 """
-import re
-from typing import List
-from .parser import HwifSignal
+from typing import List, Optional
+from .hwif_signal import HwifSignal
 from .template_generator import generate_flat_assignments
 
 
@@ -16,75 +15,23 @@ class WrapperBuilder:
         module_name: str,
         package_name: str,
         inst_name: str,
-        module_content: str,
+        params: Optional[List[str]],
+        non_hwif_ports: List[str],
         input_signals: List[HwifSignal],
         output_signals: List[HwifSignal],
     ):
         self.module_name = module_name
         self.package_name = package_name
         self.inst_name = inst_name
-        self.module_content = module_content
         self.input_signals = input_signals
         self.output_signals = output_signals
 
-        # Extract info from module
-        self._parse_module()
+        # Parameter declarations of the regblock module, or None if it has none
+        self.has_params = params is not None
+        self.params = params or []
 
-    def _parse_module(self):
-        """Parse module content to extract key information"""
-        # Check for parameters
-        param_match = re.search(
-            r"module\s+\w+\s*#\s*\((.*?)\)\s*\(", self.module_content, re.DOTALL
-        )
-        self.has_params = param_match is not None
-        self.params = []
-        if self.has_params:
-            param_text = param_match.group(1).strip()  # type: ignore[union-attr]
-            for param_line in param_text.split("\n"):
-                param_line = param_line.strip().rstrip(",")
-                if param_line:
-                    self.params.append(param_line)
-
-        # Extract all non-hwif ports from the module
-        self.non_hwif_ports = self._extract_non_hwif_ports()
-
-    def _extract_non_hwif_ports(self) -> List[str]:
-        """Extract all ports except hwif_in and hwif_out"""
-        ports: List[str] = []
-
-        # Find port section
-        if self.has_params:
-            match = re.search(
-                r"module\s+\w+\s*#\s*\([^)]+\)\s*\((.*?)\);",
-                self.module_content,
-                re.DOTALL,
-            )
-        else:
-            match = re.search(
-                r"module\s+\w+\s*\((.*?)\);", self.module_content, re.DOTALL
-            )
-
-        if not match:
-            return ports
-
-        port_section = match.group(1)
-
-        # Split by comma, but be careful of commas inside brackets
-        for line in port_section.split("\n"):
-            line = line.strip()
-            if not line or line.startswith("//"):
-                continue
-
-            # Remove trailing comma
-            line = line.rstrip(",")
-
-            # Skip hwif ports (they contain ::)
-            if "::" in line and ("hwif_in" in line or "hwif_out" in line):
-                continue
-
-            ports.append(line)
-
-        return ports
+        # All module ports except hwif_in and hwif_out
+        self.non_hwif_ports = non_hwif_ports
 
     def generate(self) -> str:
         """Generate the complete wrapper module content"""
@@ -186,9 +133,9 @@ class WrapperBuilder:
             param_insts = []
             for param_decl in self.params:
                 # Extract parameter name from declaration like "parameter ID_WIDTH = 1"
-                param_match = re.search(r"parameter\s+(\w+)\s*=", param_decl)
-                if param_match:
-                    param_name = param_match.group(1)
+                lhs = param_decl.split("=", 1)[0].split()
+                if len(lhs) >= 2 and lhs[0] == "parameter":
+                    param_name = lhs[-1]
                     param_insts.append(f".{param_name}({param_name})")
                 else:
                     # Fallback: use the parameter declaration as-is (shouldn't happen)
@@ -205,13 +152,7 @@ class WrapperBuilder:
         for port_decl in self.non_hwif_ports:
             # Extract port name, handling edge case where bit width has no space
             # e.g., "input wire [3:0]s_axil_wstrb" -> "s_axil_wstrb"
-            port_match = re.search(r"\[[\d:]+\](\w+)|\b(\w+)$", port_decl)
-            if port_match:
-                port_name = (
-                    port_match.group(1) if port_match.group(1) else port_match.group(2)
-                )
-            else:
-                port_name = port_decl.split()[-1]
+            port_name = port_decl.rsplit("]", 1)[-1].split()[-1]
             ports.append(f"        .{port_name}({port_name})")
 
         # Connect hwif ports to internal structs
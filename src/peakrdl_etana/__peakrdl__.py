@@ -1,13 +1,18 @@
 from typing import TYPE_CHECKING, Dict, Type, List, Any
 import functools
 import sys
+import tempfile
+
+from systemrdl import RDLCompiler
 
 from peakrdl.plugins.exporter import (
     ExporterSubcommandPlugin,
 )  # pylint: disable=import-error
 from peakrdl.config import schema  # pylint: disable=import-error
+from peakrdl import process_input  # pylint: disable=import-error
 
 from .exporter import RegblockExporter
+from .profiling import ExportProfiler
 from .cpuif import (
     CpuifBase,
     apb3,
@@ -26,6 +31,7 @@ from . import entry_points
 if TYPE_CHECKING:
     import argparse
     from systemrdl.node import AddrmapNode
+    from peakrdl.plugins.importer import ImporterPlugin
 
 
 class Choice(schema.String):
@@ -170,6 +176,12 @@ class Exporter(ExporterSubcommandPlugin):
             default=False,
             help="Enable additional retiming stage between readback fan-in and cpu interface",
         )
+        arg_group.add_argument(
+            "--rt-decode",
+            action="store_true",
+            default=False,
+            help="Register the address decode outputs. Adds 1 cycle of read and write latency",
+        )
         arg_group.add_argument(
             "--rt-external",
             help="Retime outputs to external components. Specify a comma-separated list of: reg,regfile,mem,addrmap,all",
@@ -213,6 +225,26 @@ class Exporter(ExporterSubcommandPlugin):
             per SystemRDL specification. Useful for simpler integration and better tool compatibility.""",
         )
 
+        arg_group.add_argument(
+            "--decode-style",
+            choices=["flat", "tree"],
+            default="flat",
+            help="""Address decode style. 'flat' compares the full address for every
+            register. 'tree' decodes the address range of each regfile and addrmap
+            once and compares only the low address bits for the registers inside it
+            [flat]""",
+        )
+
+        arg_group.add_argument(
+            "--readback-style",
+            choices=["if", "andor"],
+            default="if",
+            help="""Readback mux style. 'if' assigns the readback data with a sequence of
+            if statements. 'andor' ORs together the register values, masked by a
+            one-hot hit vector, as a balanced tree. Not used with --rt-read-fanin
+            [if]""",
+        )
+
         arg_group.add_argument(
             "--generate-template",
             action="store_true",
@@ -236,7 +268,120 @@ class Exporter(ExporterSubcommandPlugin):
             help="""Generate error responses for reads to write-only registers or writes to read-only registers""",
         )
 
-    def do_export(self, top_node: "AddrmapNode", options: "argparse.Namespace") -> None:
+        arg_group.add_argument(
+            "--jobs",
+            type=int,
+            default=1,
+            metavar="N",
+            help="""Render the large sections of the module in N parallel worker
+            processes. Output is identical to a serial export [1]""",
+        )
+
+        arg_group.add_argument(
+            "--cache-dir",
+            metavar="DIR",
+            default=None,
+            help="""Cache rendered module sections in DIR, keyed by a hash of the
+            elaborated design and exporter options. Unchanged register blocks are
+            not regenerated on later exports, and the field logic is only
+            regenerated for the top-level children that changed. A hit-rate
+            summary is printed""",
+        )
+
+        arg_group.add_argument(
+            "--write-if-changed",
+            action="store_true",
+            default=False,
+            help="""Leave existing output files untouched if their content would
+            not change, so that their timestamps do not trigger rebuilds""",
+        )
+
+        arg_group.add_argument(
+            "--watch",
+            action="store_true",
+            default=False,
+            help="""Keep running and re-export whenever one of the SystemRDL
+            source files changes. Implies --write-if-changed. Unless --cache-dir
+            is given, rendered sections are cached in a temporary directory for
+            the duration of the session""",
+        )
+
+        arg_group.add_argument(
+            "--watch-interval",
+            type=float,
+            default=0.5,
+            metavar="SECONDS",
+            help="""How often to check the source files for changes in --watch
+            mode [0.5]""",
+        )
+
+        arg_group.add_argument(
+            "--profile",
+            action="store_true",
+            default=False,
+            help="""Print the wall time and call count of each phase of the export""",
+        )
+
+        arg_group.add_argument(
+            "--profile-memory",
+            action="store_true",
+            default=False,
+            help="""Also measure the peak memory of each phase. Implies --profile.
+            Memory tracing slows down the export considerably""",
+        )
+
+        arg_group.add_argument(
+            "--profile-dir",
+            metavar="DIR",
+            default=None,
+            help="""Run the export under cProfile and write the statistics to
+            DIR/<module_name>.pstats. Implies --profile""",
+        )
+
+    def main(
+        self, importers: "List[ImporterPlugin]", options: "argparse.Namespace"
+    ) -> None:
+        if not options.watch:
+            super().main(importers, options)
+            return
+
+        # Imported here so the watch loop is only loaded if it is used
+        from .watch import DesignWatcher
+
+        def compile_design() -> "AddrmapNode":
+            rdlc = RDLCompiler()
+            for udp in self.udp_definitions:
+                rdlc.register_udp(udp)
+            parameters = process_input.parse_parameters(rdlc, options.parameters)
+            process_input.process_input(rdlc, importers, options.input_files, options)
+            root = rdlc.elaborate(
+                top_def_name=options.top_def_name,
+                inst_name=options.inst_name,
+                parameters=parameters,
+            )
+            return root.top
+
+        export_kwargs = self.get_export_kwargs(options)
+        export_kwargs["write_if_changed"] = True
+
+        with tempfile.TemporaryDirectory() as tmp_cache_dir:
+            if export_kwargs["cache_dir"] is None:
+                export_kwargs["cache_dir"] = tmp_cache_dir
+            watcher = DesignWatcher(
+                compile_design,
+                options.output,
+                export_kwargs,
+                input_files=options.input_files,
+                interval=options.watch_interval,
+            )
+            print("Watching for changes. Press Ctrl-C to stop.")
+            watcher.run()
+
+    def get_export_kwargs(self, options: "argparse.Namespace") -> Dict[str, Any]:
+        """
+        Translate the command line options to RegblockExporter.export()
+        keyword arguments
+        """
         cpuifs = self.get_cpuifs()
 
         retime_external_reg = False
@@ -282,29 +427,59 @@ class Exporter(ExporterSubcommandPlugin):
         else:
             raise RuntimeError
 
+        return {
+            "cpuif_cls": cpuifs[options.cpuif],
+            "module_name": options.module_name,
+            "package_name": options.package_name,
+            "reuse_hwif_typedefs": (options.type_style == "lexical"),
+            "retime_read_fanin": options.rt_read_fanin,
+            "retime_read_response": options.rt_read_response,
+            "retime_decode": options.rt_decode,
+            "retime_external_reg": retime_external_reg,
+            "retime_external_regfile": retime_external_regfile,
+            "retime_external_mem": retime_external_mem,
+            "retime_external_addrmap": retime_external_addrmap,
+            "generate_hwif_report": options.hwif_report,
+            "address_width": options.addr_width,
+            "default_reset_activelow": default_reset_activelow,
+            "default_reset_async": default_reset_async,
+            "in_str": options.in_str,
+            "out_str": options.out_str,
+            "allow_wide_field_subwords": options.allow_wide_field_subwords,
+            "flatten_nested_blocks": options.flatten_nested_blocks,
+            "decode_style": options.decode_style,
+            "readback_style": options.readback_style,
+            "generate_template": options.generate_template,
+            "err_if_bad_addr": options.err_if_bad_addr,
+            "err_if_bad_rw": options.err_if_bad_rw,
+            "jobs": options.jobs,
+            "cache_dir": options.cache_dir,
+            "write_if_changed": options.write_if_changed,
+        }
+
+    def do_export(self, top_node: "AddrmapNode", options: "argparse.Namespace") -> None:
+        profiler = None
+        if options.profile or options.profile_memory or options.profile_dir:
+            profiler = ExportProfiler(
+                trace_memory=options.profile_memory,
+                profile_dir=options.profile_dir,
+            )
+
         x = RegblockExporter()
         x.export(
             top_node,
             options.output,
-            cpuif_cls=cpuifs[options.cpuif],
-            module_name=options.module_name,
-            package_name=options.package_name,
-            reuse_hwif_typedefs=(options.type_style == "lexical"),
-            retime_read_fanin=options.rt_read_fanin,
-            retime_read_response=options.rt_read_response,
-            retime_external_reg=retime_external_reg,
-            retime_external_regfile=retime_external_regfile,
-            retime_external_mem=retime_external_mem,
-            retime_external_addrmap=retime_external_addrmap,
-            generate_hwif_report=options.hwif_report,
-            address_width=options.addr_width,
-            default_reset_activelow=default_reset_activelow,
-            default_reset_async=default_reset_async,
-            in_str=options.in_str,
-            out_str=options.out_str,
-            allow_wide_field_subwords=options.allow_wide_field_subwords,
-            flatten_nested_blocks=options.flatten_nested_blocks,
-            generate_template=options.generate_template,
-            err_if_bad_addr=options.err_if_bad_addr,
-            err_if_bad_rw=options.err_if_bad_rw,
+            profiler=profiler,
+            **self.get_export_kwargs(options),
         )
+
+        if x.export_cache is not None:
+            print(f"export cache: {x.export_cache}")
+
+        if options.write_if_changed:
+            print(f"output files: {x.output_files}")
+
+        if profiler is not None:
+            print(profiler.report())
+            if profiler.profile_path is not None:
+                print(f"cProfile statistics written to {profiler.profile_path}")
@@ -1,8 +1,7 @@
-from typing import TYPE_CHECKING, Union, Optional, List
+from typing import TYPE_CHECKING, Union, Optional, List, Iterator, Tuple
 
 from systemrdl.node import FieldNode, RegNode
-from systemrdl.walker import WalkerAction
-from systemrdl.walker import RDLWalker
+from systemrdl.walker import RDLListener, WalkerAction
 
 from .utils import (
     IndexedPath,
@@ -14,10 +13,40 @@ from .sv_int import SVInt
 
 if TYPE_CHECKING:
     from .exporter import RegblockExporter
-    from systemrdl.node import AddrmapNode, AddressableNode
-    from systemrdl.node import Node, RegfileNode, MemNode
+    from .design_ir import AddressableInfo
+    from systemrdl.node import AddressableNode
+    from systemrdl.node import Node, RegfileNode, MemNode, AddrmapNode
 else:
-    from systemrdl.node import RegfileNode, MemNode
+    from systemrdl.node import RegfileNode, MemNode, AddrmapNode
+
+
+class DecodeScope:
+    """
+    Address range of a regfile or addrmap in the "tree" decode style.
+
+    All addresses in the range share the bits of ``cpuif_addr`` above
+    ``lsb``. Those are compared once, by the range's hit signal, so the
+    registers inside only compare the bits below ``lsb``.
+    """
+
+    __slots__ = ("hit", "lsb", "in_array", "hit_expr")
+
+    def __init__(
+        self,
+        hit: Optional[str],
+        lsb: int,
+        in_array: bool = False,
+        hit_expr: Optional[str] = None,
+    ) -> None:
+        # Name of the hit signal, or None if the range has no common upper
+        # bits to pre-decode
+        self.hit = hit
+        self.lsb = lsb
+        # Range is, or is inside of, an array. Its address is not constant,
+        # so nested ranges are not pre-decoded separately.
+        self.in_array = in_array
+        # Expression assigned to the hit signal, if this scope declares one
+        self.hit_expr = hit_expr
 
 
 class AddressDecode:
@@ -32,8 +61,189 @@ class AddressDecode:
         logic_gen = DecodeStrbGenerator(self)
         s = logic_gen.get_logic(self.top_node)
         assert s is not None  # guaranteed to have at least one reg
+        if self.exp.ds.decode_style == "tree":
+            hits = DecodeTreeGenerator(self).get_logic(self.top_node)
+            if hits:
+                s += "\n" + hits
         return s
 
+    def get_top_scope(self) -> DecodeScope:
+        return DecodeScope(None, self.exp.ds.addr_width)
+
+    def get_scope(self, node: "AddressableNode", parent: DecodeScope) -> DecodeScope:
+        """
+        Returns the decode scope of a non-external regfile or addrmap inside
+        the parent scope. This is the parent scope itself if the node's range
+        does not narrow down the address any further.
+        """
+        if parent.in_array:
+            return parent
+
+        # Whole range of the node, including all of its array elements
+        lo = node.raw_absolute_address - self.top_node.raw_absolute_address
+        hi = lo + node.total_size - 1
+        lsb = (lo ^ hi).bit_length()
+        in_array = bool(node.array_dimensions)
+
+        if lsb >= parent.lsb:
+            if in_array:
+                return DecodeScope(parent.hit, parent.lsb, True)
+            return parent
+
+        p = IndexedPath(self.top_node, node)
+        prefix = SVInt((lo >> lsb) & ((1 << (parent.lsb - lsb)) - 1), parent.lsb - lsb)
+        expr = f"(cpuif_addr[{parent.lsb - 1}:{lsb}] == {prefix})"
+        if parent.hit is not None:
+            expr = f"{parent.hit} & {expr}"
+        return DecodeScope(f"decoded_hit_{p.path}", lsb, in_array, expr)
+
+    def get_scoped_addr_match(
+        self, scope: DecodeScope, addr: int, addr_expr: Optional[str] = None
+    ) -> str:
+        """
+        Returns the expression that matches cpuif_addr against the address of
+        a register inside the scope.
+
+        addr is the register's address relative to the top node. Registers
+        inside arrays pass the expression of their address in addr_expr
+        instead.
+        """
+        aw = self.exp.ds.addr_width
+        if scope.hit is None:
+            # Nothing pre-decoded. Compare the full address.
+            if addr_expr is not None:
+                return f"(cpuif_addr == {addr_expr}[{aw-1}:0])"
+            return f"(cpuif_addr == {SVInt(addr, aw)})"
+
+        if scope.lsb == 0:
+            # Range spans a single address. The hit is the whole compare.
+            return scope.hit
+
+        if addr_expr is not None:
+            match = f"(cpuif_addr[{scope.lsb-1}:0] == {addr_expr}[{scope.lsb-1}:0])"
+        else:
+            offset = SVInt(addr & ((1 << scope.lsb) - 1), scope.lsb)
+            match = f"(cpuif_addr[{scope.lsb-1}:0] == {offset})"
+        return f"{scope.hit} & {match}"
+
+    def get_index_slices(
+        self,
+        scope: DecodeScope,
+        addr: int,
+        dims: List[int],
+        strides: List[int],
+    ) -> Optional[List[Optional[Tuple[int, int]]]]:
+        """
+        Returns the (msb, lsb) of the bits of cpuif_addr that hold each array
+        index of a register at addr, outermost first, or None for dimensions
+        of size 1.
+
+        Returns None if the indexes are not plain bit slices of the address:
+        a stride is not a power of two, or adding an index to addr would carry
+        into other address bits.
+        """
+        slices: List[Optional[Tuple[int, int]]] = []
+        used = 0
+        for dim, stride in zip(dims, strides):
+            if dim == 1:
+                slices.append(None)
+                continue
+            if stride & (stride - 1):
+                return None
+            lsb = stride.bit_length() - 1
+            msb = lsb + (dim - 1).bit_length() - 1
+            mask = ((1 << (msb + 1)) - 1) & ~((1 << lsb) - 1)
+            if (mask & used) or (mask & addr) or msb >= scope.lsb:
+                return None
+            used |= mask
+            slices.append((msb, lsb))
+        return slices
+
+    def get_indexed_addr_match(
+        self,
+        scope: DecodeScope,
+        addr: int,
+        slices: List[Optional[Tuple[int, int]]],
+    ) -> str:
+        """
+        Returns the expression that matches cpuif_addr against the address of
+        an element of a register array, whose indexes are the address bit
+        slices returned by get_index_slices().
+
+        The address bits outside of the slices are compared against the
+        address of the array's first element, and are the same for all
+        elements. Each slice is compared against its loop index, which decodes
+        it to one-hot across the elements.
+        """
+        terms = self.get_index_range_terms(scope, addr, slices)
+        for i, sl in enumerate(slices):
+            if sl is not None:
+                msb, lsb = sl
+                terms.append(f"(cpuif_addr[{msb}:{lsb}] == ({msb - lsb + 1})'(i{i}))")
+
+        if scope.hit is not None:
+            terms.insert(0, scope.hit)
+        return " & ".join(terms)
+
+    def get_index_range_terms(
+        self,
+        scope: DecodeScope,
+        addr: int,
+        slices: List[Optional[Tuple[int, int]]],
+        signal: str = "cpuif_addr",
+    ) -> List[str]:
+        """
+        Returns the compares of the address bits below the scope's lsb that
+        lie outside of the index slices. Together they match every element of
+        the array whose first element is at addr.
+        """
+        terms = []
+        bit = scope.lsb
+        for msb, lsb in sorted((sl for sl in slices if sl is not None), reverse=True):
+            if bit > msb + 1:
+                terms.append(self._get_addr_slice_match(signal, addr, bit - 1, msb + 1))
+            bit = lsb
+        if bit > 0:
+            terms.append(self._get_addr_slice_match(signal, addr, bit - 1, 0))
+        return terms
+
+    def _get_addr_slice_match(self, signal: str, addr: int, msb: int, lsb: int) -> str:
+        width = msb - lsb + 1
+        value = SVInt((addr >> lsb) & ((1 << width) - 1), width)
+        return f"({signal}[{msb}:{lsb}] == {value})"
+
+    def _iter_strobes(self) -> Iterator[Tuple[str, Tuple[int, ...]]]:
+        """
+        Yields the name and array dimensions of every decoded strobe
+        """
+        for info in self.exp.ds.design_ir.addressables:
+            if isinstance(info.node, RegNode):
+                p = self.get_access_strobe(info.node)
+                yield p.path, info.array_dimensions
+            else:
+                p = self.get_external_block_access_strobe(info.node)
+                yield p.path, ()
+
+    def get_retimed_strobe_reset(self) -> str:
+        """
+        Reset assignments of the decode stage's strobe registers
+        """
+        lines = []
+        for path, dims in self._iter_strobes():
+            loops = "".join(
+                f"for(int i{i}=0; i{i}<{dim}; i{i}++) " for i, dim in enumerate(dims)
+            )
+            index = "".join(f"[i{i}]" for i in range(len(dims)))
+            lines.append(f"{loops}{path}{index} <= '0;")
+        return "\n".join(lines)
+
+    def get_retimed_strobe_update(self) -> str:
+        """
+        Assignments that load the decode stage's strobe registers from the
+        combinational decoder
+        """
+        return "\n".join(f"{path} <= next_{path};" for path, _ in self._iter_strobes())
+
     def get_implementation(self) -> str:
         gen = DecodeLogicGenerator(self)
         s = gen.get_content(self.top_node)
@@ -90,28 +300,39 @@ class AddressDecode:
         return p
 
 
-class DecodeStrbGenerator(RDLForLoopGenerator):
+class DecodeStrbGenerator:
+    """
+    Declares the decoded strobe of every register and external block.
+
+    Consumes the flat register/external block table of the design IR rather
+    than walking the design again.
+    """
+
     def __init__(self, addr_decode: AddressDecode) -> None:
         self.addr_decode = addr_decode
-        super().__init__()
         self._logic_stack: List[object] = []
-        self.printed = False
-        self.policy = external_policy(self.addr_decode.exp.ds)
 
     def get_logic(self, node: "Node") -> Optional[str]:
-
-        walker = RDLWalker()
-        walker.walk(node, self, skip_top=True)
+        assert node == self.addr_decode.top_node
+        for info in self.addr_decode.exp.ds.design_ir.addressables:
+            if isinstance(info.node, RegNode):
+                n_subwords = info.node.get_property(
+                    "regwidth"
+                ) // info.node.get_property("accesswidth")
+                self.build_logic(info, n_subwords)
+            else:
+                p = self.addr_decode.get_external_block_access_strobe(info.node)
+                self._logic_stack.append(f"logic {p.path};")
+                if self.addr_decode.exp.ds.retime_decode:
+                    self._logic_stack.append(f"logic next_{p.path};")
 
         return self.finish()
 
-    def build_logic(self, node: "RegNode", active=1) -> None:
-        p = self.addr_decode.get_access_strobe(node)
-        # Use IndexedPath to get ALL nested array dimensions
-        full_path = IndexedPath(self.addr_decode.top_node, node)
-        array_dimensions = full_path.array_dimensions
+    def build_logic(self, info: "AddressableInfo", active: int = 1) -> None:
+        assert isinstance(info.node, RegNode)
+        p = self.addr_decode.get_access_strobe(info.node)
 
-        if array_dimensions is None:
+        if not info.array_dimensions:
             # No array dimensions
             if active == 1:
                 # Single bit: remove [0:0] range
@@ -120,7 +341,7 @@ class DecodeStrbGenerator(RDLForLoopGenerator):
                 s = f"logic [{active-1}:0] {p.path};"
         else:
             # Has array dimensions
-            array_suffix = "".join(f"[{dim}]" for dim in array_dimensions)
+            array_suffix = "".join(f"[{dim}]" for dim in info.array_dimensions)
             if active == 1:
                 # Single bit with array: remove [0:0] but keep unpacked array format
                 s = f"logic {p.path} {array_suffix};"
@@ -129,72 +350,90 @@ class DecodeStrbGenerator(RDLForLoopGenerator):
                 s = f"logic [{active-1}:0] {p.path} {array_suffix};"
 
         self._logic_stack.append(s)
+        if self.addr_decode.exp.ds.retime_decode:
+            # Output of the combinational decoder, ahead of the decode stage
+            self._logic_stack.append(s.replace(p.path, f"next_{p.path}", 1))
 
-    def enter_AddressableComponent(self, node: "AddressableNode") -> None:
-        super().enter_AddressableComponent(node)
+    def finish(self) -> Optional[str]:
+        s = self._logic_stack
+        return "\n".join(str(item) for item in s)
 
-    def enter_Regfile(self, node: "RegfileNode") -> Optional[WalkerAction]:
-        if self.policy.is_external(node):
-            # Declare strobe signal for external regfile
-            p = self.addr_decode.get_external_block_access_strobe(node)
-            s = f"logic {p.path};"
-            self._logic_stack.append(s)
-            return WalkerAction.SkipDescendants
-        return WalkerAction.Continue
 
-    def enter_Addrmap(self, node: "AddrmapNode") -> Optional[WalkerAction]:
-        # Skip top-level
-        if node == self.addr_decode.top_node:
-            return WalkerAction.Continue
+class DecodeTreeGenerator(RDLListener):
+    """
+    Declares and assigns the hit signals of the pre-decoded regfile and
+    addrmap ranges of the "tree" decode style.
+    """
 
-        if self.policy.is_external(node):
-            # Declare strobe signal for external addrmap
-            p = self.addr_decode.get_external_block_access_strobe(node)
-            s = f"logic {p.path};"
-            self._logic_stack.append(s)
-            return WalkerAction.SkipDescendants
-        return WalkerAction.Continue
+    def __init__(self, addr_decode: AddressDecode) -> None:
+        super().__init__()
+        self.addr_decode = addr_decode
+        self.policy = external_policy(addr_decode.exp.ds)
+        self._scope_stack = [addr_decode.get_top_scope()]
+        self._lines: List[str] = []
 
-    def enter_Mem(self, node: "MemNode") -> None:
-        if not node.external:
-            raise
-        # Declare strobe signal for external mem
-        p = self.addr_decode.get_external_block_access_strobe(node)
-        s = f"logic {p.path};"
-        self._logic_stack.append(s)
+    def get_logic(self, node: "Node") -> str:
+        self.addr_decode.exp.ds.design_ir.walk(node, self, skip_top=True)
+        return "\n".join(self._lines)
 
-    def enter_Reg(self, node: "RegNode") -> Optional[WalkerAction]:
-        # Skip registers inside external blocks
-        if is_inside_external_block(
-            node, self.addr_decode.top_node, self.addr_decode.exp.ds
-        ):
+    def enter_AddressableComponent(
+        self, node: "AddressableNode"
+    ) -> Optional[WalkerAction]:
+        parent = self._scope_stack[-1]
+        if isinstance(node, (RegNode, MemNode)) or self.policy.is_external(node):
+            # Not a range of registers that is decoded by this block
+            self._scope_stack.append(parent)
             return WalkerAction.SkipDescendants
 
-        n_subwords = node.get_property("regwidth") // node.get_property("accesswidth")
-
-        self.build_logic(node, n_subwords)
-        self.printed = False
+        scope = self.addr_decode.get_scope(node, parent)
+        if scope.hit_expr is not None:
+            self._lines.append(f"logic {scope.hit};")
+            self._lines.append(f"assign {scope.hit} = {scope.hit_expr};")
+        self._scope_stack.append(scope)
+        if scope.in_array:
+            # No further scopes inside arrays
+            return WalkerAction.SkipDescendants
         return WalkerAction.Continue
 
-    def finish(self) -> Optional[str]:
-        s = self._logic_stack
-        return "\n".join(str(item) for item in s)
+    def exit_AddressableComponent(self, node: "AddressableNode") -> None:
+        self._scope_stack.pop()
 
 
 class DecodeLogicGenerator(RDLForLoopGenerator):
     def __init__(self, addr_decode: AddressDecode) -> None:
         self.addr_decode = addr_decode
+        self.exp = addr_decode.exp
         super().__init__()
 
         # List of address strides for each dimension
         self._array_stride_stack = []  # type: List[int]
+        # Size of each dimension in _array_stride_stack
+        self._array_dim_stack = []  # type: List[int]
         self.policy = external_policy(self.addr_decode.exp.ds)
 
+        # Pre-decoded address range of the current node. The "flat" decode
+        # style only uses the top-level scope, which compares full addresses.
+        self._tree = self.addr_decode.exp.ds.decode_style == "tree"
+        self._scope_stack = [self.addr_decode.get_top_scope()]
+
+        # With a registered decode stage, the decoder drives the inputs of the
+        # strobe registers instead of the strobes themselves
+        self._strb_prefix = "next_" if self.addr_decode.exp.ds.retime_decode else ""
+
     def enter_AddressableComponent(
         self, node: "AddressableNode"
     ) -> Optional[WalkerAction]:
         super().enter_AddressableComponent(node)
 
+        scope = self._scope_stack[-1]
+        if (
+            self._tree
+            and isinstance(node, (RegfileNode, AddrmapNode))
+            and not self.policy.is_external(node)
+        ):
+            scope = self.addr_decode.get_scope(node, scope)
+        self._scope_stack.append(scope)
+
         if node.array_dimensions:
             # Collect strides for each array dimension
             current_stride = node.array_stride
@@ -203,7 +442,10 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
                 strides.append(current_stride)
                 current_stride *= dim  # type: ignore[operator]
             strides.reverse()
-            self._array_stride_stack.extend([s for s in strides if s is not None])
+            for dim, stride in zip(node.array_dimensions, strides):
+                if stride is not None:
+                    self._array_stride_stack.append(stride)
+                    self._array_dim_stack.append(dim)
 
         return WalkerAction.Continue
 
@@ -230,6 +472,29 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
             )
         return a
 
+    def _get_array_addr_match(
+        self, node: RegNode, scope: DecodeScope, addr: int
+    ) -> str:
+        """
+        Returns the expression that matches cpuif_addr against an element of
+        the current array. Arrays with power-of-two strides decode the element
+        indexes from address bit slices. Other arrays compare against the
+        element's address, which is first computed into next_cpuif_addr.
+        """
+        slices = self.addr_decode.get_index_slices(
+            scope, addr, self._array_dim_stack, self._array_stride_stack
+        )
+        if slices is not None:
+            return self.addr_decode.get_indexed_addr_match(scope, addr, slices)
+
+        offset = addr - (
+            node.raw_absolute_address - self.addr_decode.top_node.raw_absolute_address
+        )
+        self.add_content(
+            f"next_cpuif_addr = {self._get_address_str(node, subword_offset=offset)};"
+        )
+        return self.addr_decode.get_scoped_addr_match(scope, addr, "next_cpuif_addr")
+
     def _get_addr_match_range_expr(
         self, *, addr_lo: str, addr_lo_int: int, addr_hi: str
     ) -> str:
@@ -265,7 +530,7 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
             )
             addr_hi = f"{addr_str} + {SVInt(node.size - 1, self.addr_decode.exp.ds.addr_width)}"
             rhs = f"cpuif_req_masked & {self._get_addr_match_range_expr(addr_lo=addr_str, addr_lo_int=addr_lo_int, addr_hi=addr_hi)}"
-            self.add_content(f"{strb.path} = {rhs};")
+            self.add_content(f"{self._strb_prefix}{strb.path} = {rhs};")
 
             # Also assign is_valid_addr when err_if_bad_rw is set so that it can be used to catch
             # invalid RW accesses on existing registers only.
@@ -296,7 +561,7 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
             )
             addr_hi = f"{addr_str} + {SVInt(node.size - 1, self.addr_decode.exp.ds.addr_width)}"
             rhs = f"cpuif_req_masked & {self._get_addr_match_range_expr(addr_lo=addr_str, addr_lo_int=addr_lo_int, addr_hi=addr_hi)}"
-            self.add_content(f"{strb.path} = {rhs};")
+            self.add_content(f"{self._strb_prefix}{strb.path} = {rhs};")
 
             # Also assign is_valid_addr when err_if_bad_rw is set so that it can be used to catch
             # invalid RW accesses on existing registers only.
@@ -340,7 +605,7 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
             else:
                 raise RuntimeError("External memory must be readable and/or writable")
 
-            self.add_content(f"{strb.path} = {rhs};")
+            self.add_content(f"{self._strb_prefix}{strb.path} = {rhs};")
             self.add_content(f"is_external |= {rhs};")
 
             # Also assign is_valid_addr when err_if_bad_rw is set so that it can be used to catch
@@ -364,15 +629,17 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
         regwidth = node.get_property("regwidth")
         accesswidth = node.get_property("accesswidth")
 
+        scope = self._scope_stack[-1]
+        addr = (
+            node.raw_absolute_address - self.addr_decode.top_node.raw_absolute_address
+        )
+
         if regwidth == accesswidth:
             p = self.addr_decode.get_access_strobe(node)
             if len(self._array_stride_stack):
-                self.add_content(f"next_cpuif_addr = {self._get_address_str(node)};")
-                addr_match = f"cpuif_req_masked & (cpuif_addr == next_cpuif_addr[{self.addr_decode.exp.ds.addr_width-1}:0])"
+                addr_match = f"cpuif_req_masked & {self._get_array_addr_match(node, scope, addr)}"
             else:
-                addr_match = (
-                    f"cpuif_req_masked & (cpuif_addr == {self._get_address_str(node)})"
-                )
+                addr_match = f"cpuif_req_masked & {self.addr_decode.get_scoped_addr_match(scope, addr)}"
 
             # Determine strobe condition based on read/write access
             readable = node.has_sw_readable
@@ -389,9 +656,9 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
                 raise RuntimeError("Register must be readable and/or writable")
 
             if len(self._array_stride_stack):
-                s = f"{p.path}{p.index_str} = {rhs};"
+                s = f"{self._strb_prefix}{p.path}{p.index_str} = {rhs};"
             else:
-                s = f"{p.path} = {rhs};"
+                s = f"{self._strb_prefix}{p.path} = {rhs};"
             self.add_content(s)
 
             # Also assign is_valid_addr when err_if_bad_rw is set so that it can be used to catch
@@ -414,16 +681,13 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
             for i in range(n_subwords):
                 p = self.addr_decode.get_access_strobe(node)
                 if len(self._array_stride_stack):
-                    self.add_content(
-                        f"next_cpuif_addr = {self._get_address_str(node, subword_offset=(i*subword_stride))};"
-                    )
-                    rhs = f"cpuif_req_masked & (cpuif_addr == next_cpuif_addr[{self.addr_decode.exp.ds.addr_width-1}:0])"
+                    rhs = f"cpuif_req_masked & {self._get_array_addr_match(node, scope, addr + i*subword_stride)}"
                 else:
-                    rhs = f"cpuif_req_masked & (cpuif_addr == {self._get_address_str(node, subword_offset=(i*subword_stride))})"
+                    rhs = f"cpuif_req_masked & {self.addr_decode.get_scoped_addr_match(scope, addr + i*subword_stride)}"
                 if 0 == len(p.index):
-                    s = f"{p.path}[{i}] = {rhs};"
+                    s = f"{self._strb_prefix}{p.path}[{i}] = {rhs};"
                 else:
-                    s = f"{p.path}{p.index_str}[{i}] = {rhs};"
+                    s = f"{self._strb_prefix}{p.path}{p.index_str}[{i}] = {rhs};"
                 self.add_content(s)
 
                 # Also assign is_valid_addr when err_if_bad_rw is set so that it can be used to catch
@@ -479,9 +743,11 @@ class DecodeLogicGenerator(RDLForLoopGenerator):
 
     def exit_AddressableComponent(self, node: "AddressableNode") -> None:
         super().exit_AddressableComponent(node)
+        self._scope_stack.pop()
 
         if not node.array_dimensions:
             return
 
         for _ in node.array_dimensions:
             self._array_stride_stack.pop()
+            self._array_dim_stack.pop()
@@ -2,9 +2,8 @@ from typing import TYPE_CHECKING, List
 import inspect
 import os
 
-import jinja2 as jj
-
 from ..utils import clog2, is_pow2, roundup_pow2
+from ..jinja_env import get_cpuif_template
 
 if TYPE_CHECKING:
     from ..exporter import RegblockExporter
@@ -56,11 +55,6 @@ class CpuifBase:
 
     def get_implementation(self) -> str:
         class_dir = self._get_template_path_class_dir()
-        loader = jj.FileSystemLoader(class_dir)
-        jj_env = jj.Environment(
-            loader=loader,
-            undefined=jj.StrictUndefined,
-        )
 
         context = {
             "cpuif": self,
@@ -71,5 +65,5 @@ class CpuifBase:
             "roundup_pow2": roundup_pow2,
         }
 
-        template = jj_env.get_template(self.template_path)
+        template = get_cpuif_template(class_dir, self.template_path)
         return template.render(context)
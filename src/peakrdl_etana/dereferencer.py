@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Union, Optional
+from typing import TYPE_CHECKING, Union, Optional, Dict
 from systemrdl.node import AddrmapNode, FieldNode, SignalNode, RegNode, AddressableNode
 from systemrdl.rdltypes import PropertyReference
 
@@ -45,6 +45,7 @@ class Dereferencer:
         self,
         obj: Union[int, FieldNode, SignalNode, PropertyReference],
         width: Optional[int] = None,
+        index_exprs: Optional[Dict[str, str]] = None,
     ) -> Union[SVInt, str]:
         """
         Returns the Verilog string that represents the readable value associated
@@ -56,6 +57,9 @@ class Dereferencer:
         expression is returned that represents its value.
 
         The optional width argument can be provided to hint at the expression's desired bitwidth.
+
+        The optional index_exprs argument maps loop iterators to the expressions
+        that index a field's array dimensions instead.
         """
         if isinstance(obj, int):
             # Is a simple scalar value
@@ -70,10 +74,14 @@ class Dereferencer:
                 )
 
             if obj.implements_storage:
-                return self.field_logic.get_storage_identifier(obj)
+                return self.field_logic.get_storage_identifier(
+                    obj, index_exprs=index_exprs
+                )
 
             if self.hwif.has_value_input(obj):
-                return self.hwif.get_input_identifier(obj, width)
+                return self.hwif.get_input_identifier(
+                    obj, width, index_exprs=index_exprs
+                )
 
             # Field does not have a storage element, nor does it have a HW input
             # must be a constant value as defined by its reset value
@@ -0,0 +1,408 @@
+"""
+Single-pass intermediate representation of the design being exported.
+
+The register model is traversed exactly once. The traversal caches every
+node's children so that all later passes (scanner, validator and the code
+generators) replay the cached tree instead of re-building Node objects, and
+collects compact, array-aware tables of the things the generators actually
+need: registers, fields, external blocks and their address intervals.
+
+The same traversal also indexes, for every node, its nearest ancestor that
+is treated as external by the code generator, and for every regfile and
+addrmap whether it contains sw-readable/writable registers, so that these
+queries do not have to walk the tree again.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, NamedTuple
+
+from systemrdl.node import (
+    Node,
+    AddressableNode,
+    RegNode,
+    RegfileNode,
+    AddrmapNode,
+    MemNode,
+    FieldNode,
+    RootNode,
+)
+from systemrdl.walker import RDLListener, RDLSteerableWalker, WalkerAction
+
+from .utils import is_external_for_codegen
+
+if TYPE_CHECKING:
+    from .exporter import DesignState
+
+
+class AddressableInfo:
+    """
+    Table entry for a register or an external block that is decoded directly
+    by this regblock.
+    """
+
+    __slots__ = (
+        "node",
+        "address",
+        "array_dimensions",
+        "array_strides",
+        "is_external",
+    )
+
+    def __init__(
+        self,
+        node: AddressableNode,
+        address: int,
+        array_dimensions: Tuple[int, ...],
+        array_strides: Tuple[int, ...],
+        is_external: bool,
+    ) -> None:
+        self.node = node
+        # Address offset relative to the top node (first element of any arrays)
+        self.address = address
+        # All array dimensions from the top node down to this node (outer first)
+        self.array_dimensions = array_dimensions
+        # Address stride of each entry in array_dimensions
+        self.array_strides = array_strides
+        self.is_external = is_external
+
+    @property
+    def is_array(self) -> bool:
+        return bool(self.array_dimensions)
+
+    @property
+    def span_end(self) -> int:
+        """
+        Last address covered by this entry, including all array elements
+        """
+        end = self.address + self.node.size - 1
+        for dim, stride in zip(self.array_dimensions, self.array_strides):
+            end += (dim - 1) * stride
+        return end
+
+
+class FieldInfo:
+    """
+    Table entry for a field of a register in the register table.
+    """
+
+    __slots__ = ("node", "reg")
+
+    def __init__(self, node: FieldNode, reg: AddressableInfo) -> None:
+        self.node = node
+        self.reg = reg
+
+
+class RegFields:
+    """
+    Field metadata of a register, computed once and shared by all generators.
+    """
+
+    __slots__ = (
+        "fields",
+        "readable_fields",
+        "writable_fields",
+        "n_sw_fields",
+        "regwidth",
+        "accesswidth",
+        "n_subwords",
+        "has_intr",
+        "has_halt",
+        "buffer_writes",
+        "buffer_reads",
+    )
+
+    def __init__(self, node: RegNode, fields: List[FieldNode]) -> None:
+        # All fields, in design order
+        self.fields = tuple(fields)
+        # sw-readable/writable fields, sorted by ascending low bit
+        self.readable_fields = tuple(
+            sorted((f for f in fields if f.is_sw_readable), key=lambda f: f.low)
+        )
+        self.writable_fields = tuple(
+            sorted((f for f in fields if f.is_sw_writable), key=lambda f: f.low)
+        )
+        # Number of fields that are sw-readable or sw-writable
+        self.n_sw_fields = sum(
+            1 for f in fields if f.is_sw_readable or f.is_sw_writable
+        )
+
+        self.regwidth: int = node.get_property("regwidth")
+        self.accesswidth: int = node.get_property("accesswidth")
+        self.n_subwords = self.regwidth // self.accesswidth
+
+        self.has_intr = any(f.get_property("intr") for f in fields)
+        self.has_halt = any(
+            f.get_property("haltenable") is not None
+            or f.get_property("haltmask") is not None
+            for f in fields
+        )
+
+        self.buffer_writes: bool = node.get_property("buffer_writes", default=False)
+        self.buffer_reads: bool = node.get_property("buffer_reads", default=False)
+
+    @property
+    def is_single_sw_field(self) -> bool:
+        """
+        Register has exactly one sw-accessible field. External registers of
+        this kind use register-level data signals without a field suffix.
+        """
+        return self.n_sw_fields == 1
+
+    @property
+    def is_wide(self) -> bool:
+        return self.n_subwords > 1
+
+
+class AddressInterval(NamedTuple):
+    start: int
+    end: int
+    info: AddressableInfo
+
+
+class DesignIR:
+    """
+    Intermediate representation built from one traversal of the top node.
+    """
+
+    def __init__(self, ds: "DesignState") -> None:
+        self.ds = ds
+        self.top_node = ds.top_node
+
+        # Cached children of every node in the tree, keyed by id(node)
+        self._children: Dict[int, List[Node]] = {}
+        # Table entries, keyed by id(node)
+        self._infos: Dict[int, AddressableInfo] = {}
+
+        # Registers and external blocks decoded by this regblock, in design order
+        self.addressables: List[AddressableInfo] = []
+        self.registers: List[AddressableInfo] = []
+        self.fields: List[FieldInfo] = []
+        self.external_blocks: List[AddressableInfo] = []
+
+        # Nearest ancestor treated as external for codegen (below the top
+        # node), keyed by id(node.inst) so that all elements of an array and
+        # all Node objects of the same instance share one entry
+        self._external_ancestors: Dict[int, Optional[Node]] = {
+            id(self.top_node.inst): None
+        }
+        # (has sw-readable, has sw-writable) registers of regfiles and addrmaps,
+        # keyed by id(node.inst)
+        self._sw_access: Dict[int, Tuple[bool, bool]] = {}
+        # Registers of the tree as returned by the traversal (not indexed into
+        # any array), and their field metadata, computed on first use. Both
+        # keyed by id(node.inst).
+        self._reg_nodes: Dict[int, RegNode] = {}
+        self._reg_fields: Dict[int, RegFields] = {}
+
+        self.n_nodes = 0
+
+        self._build(self.top_node, (), (), False, None)
+
+        self.address_intervals: List[AddressInterval] = sorted(
+            (
+                AddressInterval(info.address, info.span_end, info)
+                for info in self.addressables
+            ),
+            key=lambda x: x.start,
+        )
+
+    def _build(
+        self,
+        node: Node,
+        dims: Tuple[int, ...],
+        strides: Tuple[int, ...],
+        inside_external: bool,
+        external_ancestor: Optional[Node],
+    ) -> Tuple[bool, bool]:
+        """
+        Returns whether the subtree below node contains any sw-readable and
+        sw-writable registers
+        """
+        children = node.children()
+        self._children[id(node)] = children
+        self.n_nodes += 1
+
+        # sw-readable/writable registers anywhere below node, and among
+        # node's direct children only
+        readable = writable = False
+        child_readable = child_writable = False
+
+        for child in children:
+            self._external_ancestors[id(child.inst)] = external_ancestor
+
+            if not isinstance(child, AddressableNode):
+                self._build(child, dims, strides, inside_external, external_ancestor)
+                continue
+
+            child_dims = dims
+            child_strides = strides
+            if child.array_dimensions:
+                assert child.array_stride is not None
+                current_stride = child.array_stride
+                new_strides = []
+                for dim in reversed(child.array_dimensions):
+                    new_strides.append(current_stride)
+                    current_stride *= dim
+                new_strides.reverse()
+                child_dims = dims + tuple(child.array_dimensions)
+                child_strides = strides + tuple(new_strides)
+
+            is_external = is_external_for_codegen(child, self.ds)
+            child_external_ancestor = child if is_external else external_ancestor
+
+            child_inside_external = inside_external
+            if not inside_external:
+                info = AddressableInfo(
+                    child,
+                    child.raw_absolute_address - self.top_node.raw_absolute_address,
+                    child_dims,
+                    child_strides,
+                    is_external,
+                )
+                self._infos[id(child)] = info
+                if isinstance(child, RegNode):
+                    self.addressables.append(info)
+                    self.registers.append(info)
+                elif isinstance(child, MemNode) or (
+                    is_external and isinstance(child, (RegfileNode, AddrmapNode))
+                ):
+                    self.addressables.append(info)
+                    self.external_blocks.append(info)
+                    child_inside_external = True
+
+            sub_readable, sub_writable = self._build(
+                child,
+                child_dims,
+                child_strides,
+                child_inside_external,
+                child_external_ancestor,
+            )
+
+            if isinstance(child, RegNode):
+                self._reg_nodes[id(child.inst)] = child
+                fields = [
+                    field
+                    for field in self._children[id(child)]
+                    if isinstance(field, FieldNode)
+                ]
+                sub_readable = any(field.is_sw_readable for field in fields)
+                sub_writable = any(field.is_sw_writable for field in fields)
+                child_readable |= sub_readable
+                child_writable |= sub_writable
+
+                if not inside_external:
+                    for field in fields:
+                        self.fields.append(FieldInfo(field, self._infos[id(child)]))
+
+            readable |= sub_readable
+            writable |= sub_writable
+
+        if isinstance(node, AddrmapNode):
+            self._sw_access[id(node.inst)] = (readable, writable)
+        elif isinstance(node, RegfileNode):
+            # Regfiles only consider their own registers
+            self._sw_access[id(node.inst)] = (child_readable, child_writable)
+
+        return readable, writable
+
+    def children(self, node: Node) -> List[Node]:
+        """
+        Returns the cached children of a node that belongs to this IR
+        """
+        children = self._children.get(id(node))
+        if children is None:
+            return node.children()
+        return children
+
+    def get_info(self, node: AddressableNode) -> Optional[AddressableInfo]:
+        """
+        Returns the register/external block table entry of a node, if any
+        """
+        return self._infos.get(id(node))
+
+    def is_indexed(self, node: Node) -> bool:
+        """
+        Whether node belongs to the tree below the top node
+        """
+        return id(node.inst) in self._external_ancestors
+
+    def get_external_ancestor(self, node: Node) -> Optional[Node]:
+        """
+        Returns the nearest ancestor of node that is treated as external for
+        codegen, not counting the top node, or None if there is none
+        """
+        return self._external_ancestors.get(id(node.inst))
+
+    def is_inside_external(self, node: Node) -> bool:
+        return self.get_external_ancestor(node) is not None
+
+    def get_sw_access(self, node: Node) -> Optional[Tuple[bool, bool]]:
+        """
+        Returns whether a regfile or addrmap contains sw-readable and
+        sw-writable registers, or None if node is not an indexed regfile or
+        addrmap
+        """
+        return self._sw_access.get(id(node.inst))
+
+    def get_reg_fields(self, node: RegNode) -> RegFields:
+        """
+        Returns the field metadata of a register.
+
+        The same record is returned for every element of a register array.
+        Its fields are those of the register as found by the traversal, so
+        they carry no array indexes.
+        """
+        reg_fields = self._reg_fields.get(id(node.inst))
+        if reg_fields is None:
+            node = self._reg_nodes.get(id(node.inst), node)
+            fields = [f for f in self.children(node) if isinstance(f, FieldNode)]
+            reg_fields = RegFields(node, fields)
+            self._reg_fields[id(node.inst)] = reg_fields
+        return reg_fields
+
+    def walk(self, node: Node, *listeners: RDLListener, skip_top: bool = False) -> None:
+        """
+        Drop-in replacement for ``RDLWalker().walk()`` that replays the cached
+        tree instead of re-creating nodes.
+        """
+        DesignWalker(self).walk(node, *listeners, skip_top=skip_top)
+
+
+class DesignWalker(RDLSteerableWalker):
+    """
+    Steerable walker that traverses the children cached by a :class:`DesignIR`.
+
+    Callback order and walker actions behave exactly like the stock walker.
+    Nodes that are not part of the IR fall back to a regular traversal.
+    """
+
+    def __init__(self, ir: DesignIR) -> None:
+        super().__init__()
+        self.ir = ir
+
+    def walk(self, node: Node, *listeners: RDLListener, skip_top: bool = False) -> None:
+        if skip_top or isinstance(node, RootNode):
+            for child in self.ir.children(node):
+                self._walk(child, listeners)
+                if self.current_action == WalkerAction.StopNow:
+                    return
+        else:
+            self._walk(node, listeners)
+
+    def _walk(self, node: Node, listeners: Tuple[RDLListener, ...]) -> None:  # type: ignore[override]
+        for listener in listeners:
+            self.current_action = self.do_enter(node, listener)
+            if self.current_action == WalkerAction.StopNow:
+                return
+
+        if self.current_action == WalkerAction.SkipDescendants:
+            self.current_action = WalkerAction.Continue
+        else:
+            for child in self.ir.children(node):
+                self._walk(child, listeners)
+                if self.current_action == WalkerAction.StopNow:
+                    return
+
+        for listener in listeners:
+            self.current_action = self.do_exit(node, listener)
+            if self.current_action == WalkerAction.StopNow:
+                return
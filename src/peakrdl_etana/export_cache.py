@@ -0,0 +1,285 @@
+"""
+On-disk cache of rendered module sections.
+
+Sections are stored under a hash of the elaborated top-level subtree, the
+exporter options and the exporter implementation itself. A later export of
+an unchanged register block reuses the stored sections instead of
+regenerating them. The field logic is also stored per top-level child, so
+that an edit only regenerates the field logic of the children it changed.
+"""
+
+import enum
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from systemrdl.node import Node, AddressableNode, FieldNode
+from systemrdl.rdltypes import UserEnum, UserStruct
+from systemrdl.rdltypes.references import PropertyReference
+
+from .__about__ import __version__
+
+if TYPE_CHECKING:
+    from .exporter import RegblockExporter
+
+
+_implementation_hash: Optional[str] = None
+
+
+def get_implementation_hash() -> str:
+    """
+    Hash of the exporter's own sources and templates, so that cached
+    sections are invalidated by any change to the generator.
+    """
+    global _implementation_hash  # pylint: disable=global-statement
+    if _implementation_hash is None:
+        h = hashlib.sha256(__version__.encode())
+        pkg_dir = os.path.dirname(__file__)
+        for dirpath, dirnames, filenames in os.walk(pkg_dir):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for filename in sorted(filenames):
+                if not filename.endswith((".py", ".sv")):
+                    continue
+                path = os.path.join(dirpath, filename)
+                h.update(os.path.relpath(path, pkg_dir).encode())
+                with open(path, "rb") as f:
+                    h.update(f.read())
+        _implementation_hash = h.hexdigest()
+    return _implementation_hash
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Returns a representation of a property value that only depends on its
+    content, not on object identity.
+    """
+    if isinstance(value, Node):
+        return ("node", value.get_path())
+    if isinstance(value, PropertyReference):
+        return ("ref", value.node.get_path(), value.name)
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, UserEnum):
+        return ("enum", value.name, value.value)
+    if isinstance(value, type) and issubclass(value, UserEnum):
+        return (
+            "enum_type",
+            value.__name__,
+            tuple((m.name, m.value, m.rdl_name, m.rdl_desc) for m in value),
+        )
+    if isinstance(value, UserStruct):
+        return (
+            "struct",
+            type(value).__name__,
+            tuple((k, _canonical(v)) for k, v in sorted(value.members.items())),
+        )
+    if isinstance(value, enum.Enum):
+        return (type(value).__name__, value.name)
+    return repr(value)
+
+
+def _node_record(node: Node, referenced: Dict[str, Node]) -> List[Any]:
+    """
+    Returns everything the generated sections depend on of a single node.
+    Nodes referenced by its properties are added to referenced.
+    """
+    record = [
+        type(node).__name__,
+        node.inst_name,
+        getattr(node, "external", None),
+    ]
+    if isinstance(node, AddressableNode):
+        record.extend(
+            [
+                node.raw_address_offset,
+                node.size,
+                node.array_dimensions,
+                node.array_stride,
+            ]
+        )
+    elif isinstance(node, FieldNode):
+        record.extend([node.lsb, node.msb])
+
+    props = []
+    for prop in sorted(node.list_properties()):
+        value = node.get_property(prop)
+        props.append((prop, _canonical(value)))
+        for v in value if isinstance(value, list) else [value]:
+            ref = v.node if isinstance(v, PropertyReference) else v
+            if isinstance(ref, Node) and ref.get_path() not in referenced:
+                referenced[ref.get_path()] = ref
+    record.append(tuple(props))
+    return record
+
+
+def _iter_subtree_records(
+    exp: "RegblockExporter", node: Node, depth: int, referenced: Dict[str, Node]
+) -> Iterator[Tuple]:
+    """
+    Yields one record per node of the subtree below and including node
+    """
+    yield (depth, *_node_record(node, referenced))
+    for child in exp.ds.design_ir.children(node):
+        yield from _iter_subtree_records(exp, child, depth + 1, referenced)
+
+
+def _iter_referenced_records(
+    referenced: Dict[str, Node], top_node: Node
+) -> Iterator[Tuple]:
+    """
+    Yields the records of nodes referenced from within a subtree (for example
+    reset signals declared outside of it, or fields of another register) and
+    of their parents, since they also affect the generated logic
+    """
+    top_path = top_node.get_path()
+    for path in sorted(referenced.keys()):
+        ref: Optional[Node] = referenced[path]
+        while ref is not None and ref.parent is not None:
+            if ref.get_path() == top_path:
+                break
+            yield ("referenced", ref.get_path(), *_node_record(ref, {}))
+            ref = ref.parent
+
+
+def _design_state_record(exp: "RegblockExporter") -> Tuple:
+    """
+    Settings and design-wide flags of the design state. Some of them are
+    derived from the whole register block (such as the address width), so
+    they are part of the key of every top-level child.
+    """
+    items: List[Tuple[str, Any]] = []
+    for name, value in sorted(vars(exp.ds).items()):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            items.append((name, value))
+        elif isinstance(value, (set, frozenset)):
+            items.append((name, tuple(sorted(str(v) for v in value))))
+        elif isinstance(value, dict):
+            items.append((name, tuple(value.keys())))
+        elif isinstance(value, list):
+            items.append((name, _canonical(value)))
+    return tuple(items)
+
+
+class ExportCache:
+    """
+    Stores rendered module sections in a cache directory and tracks hit/miss
+    statistics.
+
+    Most sections are stored under a key of the whole register block. The
+    sections listed in ``sections.CHILD_SECTIONS`` are stored per top-level
+    child instead, under a key of that child's subtree, so that a change to
+    one child only invalidates its own part of them.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.child_hits = 0
+        self.child_misses = 0
+        self.key: Optional[str] = None
+        # Top-level children of the register block and their keys, in order
+        self.child_keys: List[Tuple[Node, str]] = []
+
+    def compute_key(self, exp: "RegblockExporter", options: Dict[str, Any]) -> str:
+        """
+        Hash of the design subtree, exporter options and exporter implementation.
+        Also computes the key of each top-level child.
+        """
+        base = hashlib.sha256(get_implementation_hash().encode())
+        for name in sorted(options.keys()):
+            value = options[name]
+            if isinstance(value, type):
+                value = f"{value.__module__}.{value.__qualname__}"
+            base.update(repr((name, value)).encode())
+
+        top_node = exp.ds.top_node
+        top_referenced: Dict[str, Node] = {}
+        top_records = [
+            (
+                "top",
+                top_node.inst_name,
+                tuple(
+                    (p.name, _canonical(p.get_value()))
+                    for p in top_node.inst.parameters
+                ),
+            ),
+            (0, *_node_record(top_node, top_referenced)),
+        ]
+        for record in top_records:
+            base.update(repr(record).encode())
+
+        design = base.copy()
+        context = base.copy()
+        context.update(repr(_design_state_record(exp)).encode())
+
+        all_referenced = dict(top_referenced)
+        self.child_keys = []
+        for child in exp.ds.design_ir.children(top_node):
+            referenced = dict(top_referenced)
+            h = context.copy()
+            for record in _iter_subtree_records(exp, child, 1, referenced):
+                data = repr(record).encode()
+                h.update(data)
+                design.update(data)
+            for record in _iter_referenced_records(referenced, top_node):
+                h.update(repr(record).encode())
+            all_referenced.update(referenced)
+            self.child_keys.append((child, h.hexdigest()))
+
+        for record in _iter_referenced_records(all_referenced, top_node):
+            design.update(repr(record).encode())
+        self.key = design.hexdigest()
+        return self.key
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    @property
+    def path(self) -> str:
+        assert self.key is not None
+        return self._get_path(self.key)
+
+    def load(self, key: Optional[str] = None) -> Dict[str, str]:
+        """
+        Returns the cached sections of the given key, by default the key of
+        the whole register block
+        """
+        path = self.path if key is None else self._get_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                sections = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(sections, dict):
+            return {}
+        return sections
+
+    def store(self, sections: Dict[str, str], key: Optional[str] = None) -> None:
+        path = self.path if key is None else self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sections, f)
+        # Atomic, so that concurrent exports never see a partial file
+        os.replace(tmp_path, path)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def __str__(self) -> str:
+        s = (
+            f"{self.hits} section hits, {self.misses} section misses "
+            f"({self.hit_rate:.1%} hit rate)"
+        )
+        if self.child_hits or self.child_misses:
+            s += (
+                f", field logic of {self.child_hits} of "
+                f"{self.child_hits + self.child_misses} top-level children reused"
+            )
+        return s
@@ -1,8 +1,8 @@
 import os
-from typing import Union, Any, cast, List, Set, Type, Optional
+import multiprocessing
+from typing import Union, Any, cast, Dict, Iterable, List, Set, Tuple, Type, Optional
 from collections import OrderedDict
 
-import jinja2 as jj
 from systemrdl.node import AddrmapNode, RootNode, SignalNode
 
 from .addr_decode import AddressDecode
@@ -10,24 +10,49 @@ from .field_logic import FieldLogic
 from .dereferencer import Dereferencer
 from .readback import Readback
 from .identifier_filter import kw_filter as kwf
-from .utils import clog2
+from .utils import clog2, IdentifierCache, IndexedPath
 from .scan_design import DesignScanner
+from .sections import render_sections, can_fork
+from .export_cache import ExportCache
+from .output_files import OutputFiles
+from .stream_writer import LineStrippingWriter
+from .design_ir import DesignIR
+from .jinja_env import get_jj_env
+from .profiling import ExportProfiler, profile_phase
 from .validate_design import DesignValidator
 from .cpuif.base import CpuifBase
 from .cpuif.apb4 import APB4_Cpuif_flattened
 from .hwif import Hwif
 from .write_buffering import WriteBuffering
 from .read_buffering import ReadBuffering
-from .external_acks import (
-    ExternalWriteAckGenerator,
-    ExternalReadAckGenerator,
-    ExternalReadErrGenerator,
-    ExternalWriteErrGenerator,
-    ExternalMemReqValueGenerator,
-)
+from .external_acks import ExternalInterfaceCollector
 from .parity import ParityErrorReduceGenerator
 
 
+# (node, output_dir) or (node, output_dir, options)
+ExportTarget = Union[
+    Tuple[Union[RootNode, AddrmapNode], str],
+    Tuple[Union[RootNode, AddrmapNode], str, Dict[str, Any]],
+]
+
+# Exporter and targets of the batch in progress, inherited by forked workers
+_batch: Optional[
+    Tuple[
+        "RegblockExporter",
+        List[Tuple[Union[RootNode, AddrmapNode], str, Dict[str, Any]]],
+    ]
+] = None
+
+
+def _export_batch_target(idx: int) -> None:
+    assert _batch is not None
+    exp, batch = _batch
+    node, output_dir, options = batch[idx]
+    # Worker processes cannot start their own process pools
+    options = dict(options, jobs=1)
+    exp.export(node, output_dir, **options)
+
+
 class RegblockExporter:
     def __init__(self, **kwargs: Any) -> None:
         # Check for stray kwargs
@@ -46,22 +71,22 @@ class RegblockExporter:
         self.dereferencer: "Dereferencer" = cast("Dereferencer", None)
         self.ds: "DesignState" = cast("DesignState", None)
 
-        loader = jj.ChoiceLoader(
-            [
-                jj.FileSystemLoader(os.path.dirname(__file__)),
-                jj.PrefixLoader(
-                    {
-                        "base": jj.FileSystemLoader(os.path.dirname(__file__)),
-                    },
-                    delimiter=":",
-                ),
-            ]
-        )
+        # Identifier cache of the most recent export. Entries are dropped once
+        # the export completes, but its hit/miss statistics remain available.
+        self.identifier_cache = IdentifierCache()
 
-        self.jj_env = jj.Environment(
-            loader=loader,
-            undefined=jj.StrictUndefined,
-        )
+        # On-disk section cache of the most recent export, if one was requested
+        self.export_cache: Optional[ExportCache] = None
+
+        # Profiler of the most recent export, if one was requested
+        self.profiler: Optional[ExportProfiler] = None
+
+        # Files written or left unchanged by the most recent export
+        self.output_files = OutputFiles()
+
+        # Shared by all exporters in this process so that templates are only
+        # compiled once
+        self.jj_env = get_jj_env()
 
     def export(
         self, node: Union[RootNode, AddrmapNode], output_dir: str, **kwargs: Any
@@ -111,6 +136,16 @@ class RegblockExporter:
             response path sequentially may not result in any meaningful timing improvement.
 
             Enabling this option will increase read transfer latency by 1 clock cycle.
+        retime_decode: bool
+            Set this to ``True`` to register the output of the address decoder.
+            The decoded register strobes are flopped together with the request,
+            its direction, address, write data and write bit-enables, so that the
+            field logic and readback are no longer in the same timing path as the
+            address comparators. Useful for large register blocks that do not
+            close timing on the write path.
+
+            Enabling this option will increase both read and write transfer latency
+            by 1 clock cycle.
         retime_external_reg: bool
             Retime outputs to external ``reg`` components.
         retime_external_regfile: bool
@@ -139,6 +174,48 @@ class RegblockExporter:
             the parent address space instead of being treated as external interfaces.
             Memory (mem) blocks are always external per SystemRDL specification.
             Defaults to False (maintains backward compatibility).
+        decode_style: str
+            Structure of the address decoder.
+
+            - ``"flat"`` (default): Every register strobe compares the full
+              CPU address against the register's address.
+            - ``"tree"``: The upper address bits of each regfile and addrmap
+              range are pre-decoded once into a hit signal, and the registers
+              inside only compare the remaining offset bits. The strobes are
+              functionally identical, with fewer and narrower comparators.
+        readback_style: str
+            Structure of the readback mux. Has no effect if ``retime_read_fanin``
+            is set.
+
+            - ``"if"`` (default): A sequence of ``if`` statements that each
+              assign the readback data of one register address.
+            - ``"andor"``: Each register address sets one bit of a one-hot hit
+              vector. The register values are masked by their hit bit and ORed
+              together as a balanced tree, so the logic depth only grows with
+              the log of the number of registers.
+        jobs: int
+            Number of worker processes used to render the large sections of the
+            module (address decode, field logic, buffering, readback) in parallel.
+            Requires a platform that supports ``fork``, otherwise sections are
+            rendered serially. Output is identical to the serial path.
+            Defaults to 1 (serial).
+        cache_dir: str
+            Directory of an on-disk cache of rendered module sections. Sections
+            are stored under a hash of the elaborated design, the exporter
+            options and the exporter version, and are reused by later exports of
+            an unchanged design. Statistics of the most recent export are
+            available in :attr:`export_cache`. Defaults to None (no caching).
+        profiler: :class:`~peakrdl_etana.profiling.ExportProfiler`
+            Record the wall time, call count and optionally the peak memory of
+            each phase of the export in this profiler. Statistics accumulate if
+            the same profiler is passed to several exports. While profiling,
+            sections are rendered serially regardless of ``jobs``, so that
+            each of them is recorded. Defaults to None (no profiling).
+        write_if_changed: bool
+            Compare the content of each output file with the existing file and
+            leave the existing file untouched if it is identical, so that its
+            timestamp does not change. Which files were written is recorded in
+            :attr:`output_files`. Defaults to False.
         """
 
         # If it is the root node, skip to top addrmap
@@ -147,7 +224,90 @@ class RegblockExporter:
         else:
             top_node = node
 
-        self.ds = DesignState(top_node, kwargs)
+        # Identifier paths are memoized for the duration of this export only
+        self.profiler = kwargs.pop("profiler", None)
+        module_name = kwargs.get("module_name") or kwf(top_node.inst_name)
+
+        self.identifier_cache = IdentifierCache()
+        IndexedPath.cache = self.identifier_cache
+        if self.profiler is not None:
+            self.profiler.start()
+        try:
+            self._do_export(top_node, output_dir, kwargs)
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop(module_name)
+            IndexedPath.cache = None
+            self.identifier_cache.clear()
+
+    def export_many(
+        self,
+        targets: Iterable[ExportTarget],
+        processes: int = 1,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Export several register blocks in one process.
+
+        All exports share this exporter's Jinja environment and compiled
+        templates, so startup costs are only paid once.
+
+        Parameters
+        ----------
+        targets: list
+            Register blocks to export. Each entry is a ``(node, output_dir)`` or
+            ``(node, output_dir, options)`` tuple, where ``options`` is a dict of
+            keyword arguments for this target that take precedence over the
+            common ones.
+        processes: int
+            Number of worker processes to spread the exports across. Requires a
+            platform that supports ``fork``, otherwise targets are exported
+            serially. Targets are also exported serially if a ``profiler``
+            option is given. Defaults to 1 (serial).
+        kwargs:
+            Options common to all targets. See :meth:`export`.
+        """
+        global _batch  # pylint: disable=global-statement
+
+        batch = []
+        for target in targets:
+            node, output_dir = target[0], target[1]
+            options = dict(kwargs)
+            if len(target) > 2:
+                options.update(target[2])
+            batch.append((node, output_dir, options))
+
+        # Statistics recorded in worker processes would be lost
+        profiling = any(options.get("profiler") for _, _, options in batch)
+
+        if processes <= 1 or len(batch) <= 1 or profiling or not can_fork():
+            for node, output_dir, options in batch:
+                self.export(node, output_dir, **options)
+            return
+
+        _batch = (self, batch)
+        try:
+            ctx = multiprocessing.get_context("fork")
+            with ctx.Pool(min(processes, len(batch))) as pool:
+                pool.map(_export_batch_target, range(len(batch)), chunksize=1)
+        finally:
+            _batch = None
+
+    def _do_export(
+        self, top_node: AddrmapNode, output_dir: str, kwargs: Dict[str, Any]
+    ) -> None:
+        jobs = kwargs.pop("jobs", 1)  # type: int
+        cache_dir = kwargs.pop("cache_dir", None)  # type: Optional[str]
+        self.output_files = OutputFiles(kwargs.pop("write_if_changed", False))
+
+        # Snapshot of the options that affect the generated output
+        options = dict(kwargs)
+
+        if self.profiler is not None:
+            # Sections rendered in worker processes could not be recorded
+            jobs = 1
+
+        self.ds = DesignState(top_node, kwargs, self.profiler)
 
         cpuif_cls = (
             kwargs.pop("cpuif_cls", None) or APB4_Cpuif_flattened
@@ -161,36 +321,42 @@ class RegblockExporter:
             )
 
         # Construct exporter components
-        self.cpuif = cpuif_cls(self)
-        self.hwif = Hwif(
-            self,
-            hwif_in_str=self.ds.hwif_in_str,
-            hwif_out_str=self.ds.hwif_out_str,
-        )
+        with profile_phase(self.profiler, "setup"):
+            self.cpuif = cpuif_cls(self)
+            self.hwif = Hwif(
+                self,
+                hwif_in_str=self.ds.hwif_in_str,
+                hwif_out_str=self.ds.hwif_out_str,
+            )
 
-        # Store hwif report flag for later use
-        self.generate_hwif_report = generate_hwif_report
-        self.readback = Readback(self)
-        self.address_decode = AddressDecode(self)
-        self.field_logic = FieldLogic(self)
-        self.write_buffering = WriteBuffering(self)
-        self.read_buffering = ReadBuffering(self)
-        self.dereferencer = Dereferencer(self)
-        ext_write_acks = ExternalWriteAckGenerator(self)
-        ext_read_acks = ExternalReadAckGenerator(self)
-        ext_read_err = ExternalReadErrGenerator(self)
-        ext_write_err = ExternalWriteErrGenerator(self)
-        ext_mem_req_value = ExternalMemReqValueGenerator(self)
-        parity = ParityErrorReduceGenerator(self)
+            # Store hwif report flag for later use
+            self.generate_hwif_report = generate_hwif_report
+            self.readback = Readback(self)
+            self.address_decode = AddressDecode(self)
+            self.field_logic = FieldLogic(self)
+            self.write_buffering = WriteBuffering(self)
+            self.read_buffering = ReadBuffering(self)
+            self.dereferencer = Dereferencer(self)
+            parity = ParityErrorReduceGenerator(self)
 
         # Validate that there are no unsupported constructs
-        DesignValidator(self).do_validate()
+        with profile_phase(self.profiler, "validate"):
+            DesignValidator(self).do_validate()
+
+        # Render the large independent sections (including readback) before
+        # the module template, optionally in parallel worker processes and
+        # reusing sections from the export cache
+        if cache_dir is not None:
+            self.export_cache = ExportCache(cache_dir)
+            with profile_phase(self.profiler, "cache_key"):
+                self.export_cache.compute_key(self, options)
+        else:
+            self.export_cache = None
+        sections = render_sections(self, jobs, self.export_cache)
 
-        # Compute readback implementation early.
-        # Readback has the capability to disable retiming if the fanin is tiny.
-        # This affects the rest of the design's implementation, and must be known
-        # before any other templates are rendered
-        readback_implementation = self.readback.get_implementation()
+        # Collect ack/err logic of all external blocks in a single pass
+        with profile_phase(self.profiler, "external_interfaces"):
+            external_interfaces = ExternalInterfaceCollector(self).collect()
 
         # Build Jinja template context
         context = {
@@ -202,12 +368,8 @@ class RegblockExporter:
             "default_resetsignal_name": self.dereferencer.default_resetsignal_name,
             "address_decode": self.address_decode,
             "field_logic": self.field_logic,
-            "readback_implementation": readback_implementation,
-            "ext_write_acks": ext_write_acks,
-            "ext_read_acks": ext_read_acks,
-            "ext_read_err": ext_read_err,
-            "ext_write_err": ext_write_err,
-            "ext_mem_req_value": ext_mem_req_value,
+            "sections": sections,
+            "ext": external_interfaces,
             "parity": parity,
             "get_always_ff_event": self.dereferencer.get_always_ff_event,
             "ds": self.ds,
@@ -219,30 +381,31 @@ class RegblockExporter:
 
         module_file_path = os.path.join(output_dir, self.ds.module_name + ".sv")
         template = self.jj_env.get_template("module_tmpl.sv")
-        stream = template.stream(context)
-        stream.dump(module_file_path)
 
-        # Strip trailing whitespace from generated file
-        with open(module_file_path, "r") as f:
-            lines = f.readlines()
-        with open(module_file_path, "w") as f:
-            for line in lines:
-                f.write(line.rstrip() + "\n")
+        # Stream the rendered module to disk, stripping trailing whitespace and
+        # numbering loop labels in order of appearance on the fly
+        with profile_phase(self.profiler, "write_module"):
+            with self.output_files.open(module_file_path) as f:
+                LineStrippingWriter(f).write_all(template.generate(context))
 
         # Generate template example if requested
         if self.ds.generate_template:
             from .template_generator import TemplateGenerator
 
-            template_gen = TemplateGenerator(self)
-            template_gen.generate(output_dir, self.ds.module_name)
+            with profile_phase(self.profiler, "template"):
+                template_gen = TemplateGenerator(self)
+                template_gen.generate(output_dir, self.ds.module_name)
 
         # Generate hwif report if requested
         if self.generate_hwif_report:
             from .hwif_report_generator import HwifReportGenerator
 
-            report_path = os.path.join(output_dir, f"{self.ds.module_name}_hwif.rpt")
-            report_gen = HwifReportGenerator(self)
-            report_gen.generate(report_path)
+            with profile_phase(self.profiler, "hwif_report"):
+                report_path = os.path.join(
+                    output_dir, f"{self.ds.module_name}_hwif.rpt"
+                )
+                report_gen = HwifReportGenerator(self)
+                report_gen.generate(report_path)
 
 
 class DesignState:
@@ -251,7 +414,12 @@ class DesignState:
     design.
     """
 
-    def __init__(self, top_node: AddrmapNode, kwargs: Any) -> None:
+    def __init__(
+        self,
+        top_node: AddrmapNode,
+        kwargs: Any,
+        profiler: Optional[ExportProfiler] = None,
+    ) -> None:
         self.top_node = top_node
         msg = top_node.env.msg
 
@@ -272,6 +440,7 @@ class DesignState:
         self.retime_read_response = kwargs.pop(
             "retime_read_response", False
         )  # type: bool
+        self.retime_decode = kwargs.pop("retime_decode", False)  # type: bool
         self.retime_external_reg = kwargs.pop(
             "retime_external_reg", False
         )  # type: bool
@@ -303,6 +472,16 @@ class DesignState:
         self.generate_template = kwargs.pop("generate_template", False)  # type: bool
         self.err_if_bad_addr = kwargs.pop("err_if_bad_addr", False)  # type: bool
         self.err_if_bad_rw = kwargs.pop("err_if_bad_rw", False)  # type: bool
+        self.decode_style = kwargs.pop("decode_style", "flat")  # type: str
+        if self.decode_style not in ("flat", "tree"):
+            raise ValueError(
+                f"Invalid decode_style '{self.decode_style}'. Must be 'flat' or 'tree'"
+            )
+        self.readback_style = kwargs.pop("readback_style", "if")  # type: str
+        if self.readback_style not in ("if", "andor"):
+            raise ValueError(
+                f"Invalid readback_style '{self.readback_style}'. Must be 'if' or 'andor'"
+            )
 
         # ------------------------
         # Info about the design
@@ -326,8 +505,13 @@ class DesignState:
         # Track any referenced enums
         self.user_enums: List[Type[Any]] = []
 
+        # Traverse the design once to build the tables shared by all generators
+        with profile_phase(profiler, "design_ir"):
+            self.design_ir = DesignIR(self)
+
         # Scan the design to fill in above variables
-        DesignScanner(self).do_scan()
+        with profile_phase(profiler, "scan"):
+            DesignScanner(self).do_scan()
 
         if self.cpuif_data_width == 0:
             # Scanner did not find any registers in the design being exported,
@@ -366,6 +550,8 @@ class DesignState:
     @property
     def min_read_latency(self) -> int:
         n = 0
+        if self.retime_decode:
+            n += 1
         if self.retime_read_fanin:
             n += 1
         if self.retime_read_response:
@@ -375,4 +561,6 @@ class DesignState:
     @property
     def min_write_latency(self) -> int:
         n = 0
+        if self.retime_decode:
+            n += 1
         return n
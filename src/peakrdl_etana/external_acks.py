@@ -1,12 +1,11 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-from systemrdl.walker import WalkerAction
+from systemrdl.walker import RDLListener, WalkerAction
 from systemrdl.node import RegNode, RegfileNode, MemNode, AddrmapNode
 
-from .forloop_generator import RDLForLoopGenerator
+from .forloop_generator import ForLoopGenerator
 from .utils import (
     IndexedPath,
-    is_inside_external_block,
     external_policy,
     has_sw_writable_descendants,
     has_sw_readable_descendants,
@@ -17,271 +16,184 @@ if TYPE_CHECKING:
     from systemrdl.node import AddressableNode
 
 
-class ExternalWriteAckGenerator(RDLForLoopGenerator):
-    def __init__(self, exp: "RegblockExporter") -> None:
-        super().__init__()
-        self.exp = exp
-        self.ext_wacks: List[str] = []
-        self.policy = external_policy(self.exp.ds)
-
-    def has_external_write(self) -> bool:
-        if self.get_content(self.exp.ds.top_node) is None:
-            return False
-        return True
-
-    def get_implementation(self) -> str:
-        content = self.get_content(self.exp.ds.top_node)
-        if content is None:
-            return ""
-        return content
+class ExternalInterfaces:
+    """
+    Ack/err logic of all external blocks, as collected by
+    :class:`ExternalInterfaceCollector`.
 
-    def enter_Regfile(self, node: "RegfileNode") -> WalkerAction:
-        self.policy = external_policy(self.exp.ds)
-        if self.policy.is_external(node):
-            if has_sw_writable_descendants(node):
-                x = self.exp.hwif.get_external_wr_ack(node, True)
-                self.ext_wacks.append(x)
-            return WalkerAction.SkipDescendants
-        return WalkerAction.Continue
+    Each implementation is an empty string if there is nothing to emit.
+    """
 
-    def enter_Addrmap(self, node: "AddrmapNode") -> WalkerAction:
-        # Skip top-level
-        if node == self.exp.ds.top_node:
-            return WalkerAction.Continue
+    def __init__(
+        self,
+        external_blocks: List["AddressableNode"],
+        write_ack: Optional[str],
+        read_ack: Optional[str],
+        write_err: Optional[str],
+        read_err: Optional[str],
+        mem_req_value: Optional[str],
+    ) -> None:
+        # External regs/regfiles/addrmaps/mems, in design order
+        self.external_blocks = external_blocks
+        self.write_ack = write_ack or ""
+        self.read_ack = read_ack or ""
+        self.write_err = write_err or ""
+        self.read_err = read_err or ""
+        self.mem_req_value = mem_req_value or ""
 
-        if self.policy.is_external(node):
-            if has_sw_writable_descendants(node):
-                x = self.exp.hwif.get_external_wr_ack(node, True)
-                self.ext_wacks.append(x)
-            return WalkerAction.SkipDescendants
-        return WalkerAction.Continue
+    def has_external_write(self) -> bool:
+        return bool(self.write_ack)
 
-    def enter_Reg(self, node: "RegNode") -> WalkerAction:
-        # Skip registers inside external blocks
-        if is_inside_external_block(node, self.exp.ds.top_node, self.exp.ds):
-            return WalkerAction.SkipDescendants
+    def has_external_read(self) -> bool:
+        return bool(self.read_ack)
 
-        if self.policy.is_external(node):
-            if node.has_sw_writable:
-                x = self.exp.hwif.get_external_wr_ack(node, True)
-                self.ext_wacks.append(x)
-        return WalkerAction.Continue
+    def has_external_write_err(self) -> bool:
+        return bool(self.write_err)
 
-    def enter_Mem(self, node: "MemNode") -> WalkerAction:
-        if not node.external:
-            raise ValueError("Unexpected non-external memory")
-        if node.is_sw_writable:
-            x = self.exp.hwif.get_external_wr_ack(node, True)
-            self.ext_wacks.append(x)
-        return WalkerAction.Continue
+    def has_external_read_err(self) -> bool:
+        return bool(self.read_err)
 
-    def enter_AddressableComponent(self, node: "AddressableNode") -> WalkerAction:
-        super().enter_AddressableComponent(node)
-        self.ext_wacks = []
-        return WalkerAction.Continue
+    def has_req_value_mems(self) -> bool:
+        return bool(self.mem_req_value)
 
-    def exit_AddressableComponent(self, node: "AddressableNode") -> WalkerAction:
-        for ext_wack in self.ext_wacks:
-            self.add_content(f"wr_ack |= {ext_wack};")
-        # IMPORTANT: Call parent's exit method to balance the stack
-        self.ext_wacks = []
-        return super().exit_AddressableComponent(node)  # type: ignore[return-value]
 
+class ExternalInterfaceCollector(RDLListener):
+    """
+    Finds all external blocks in a single pass and builds their
+    wr_ack/rd_ack/wr_err/rd_err reductions and the err_support inflight_value
+    flops, each with its own array loop nesting.
+    """
 
-class ExternalReadAckGenerator(RDLForLoopGenerator):
     def __init__(self, exp: "RegblockExporter") -> None:
         super().__init__()
         self.exp = exp
-        self.ext_racks: List[str] = []
         self.policy = external_policy(self.exp.ds)
-
-    def has_external_read(self) -> bool:
-        if self.get_content(self.exp.ds.top_node) is None:
-            return False
-        return True
-
-    def get_implementation(self) -> str:
-        content = self.get_content(self.exp.ds.top_node)
-        if content is None:
-            return ""
-        return content
+        self.external_blocks: List["AddressableNode"] = []
+
+        self.write_ack = ForLoopGenerator()
+        self.read_ack = ForLoopGenerator()
+        self.write_err = ForLoopGenerator()
+        self.read_err = ForLoopGenerator()
+        self.mem_req_value = ForLoopGenerator()
+        self._generators = (
+            self.write_ack,
+            self.read_ack,
+            self.write_err,
+            self.read_err,
+            self.mem_req_value,
+        )
+
+    def collect(self) -> ExternalInterfaces:
+        for gen in self._generators:
+            gen.start()
+        self.exp.ds.design_ir.walk(self.exp.ds.top_node, self, skip_top=True)
+        return ExternalInterfaces(
+            self.external_blocks,
+            self.write_ack.finish(),
+            self.read_ack.finish(),
+            self.write_err.finish(),
+            self.read_err.finish(),
+            self.mem_req_value.finish(),
+        )
+
+    def enter_AddressableComponent(self, node: "AddressableNode") -> None:
+        if not node.array_dimensions:
+            return
+
+        for gen in self._generators:
+            for dim in node.array_dimensions:
+                gen.push_loop(dim)
+
+    def exit_AddressableComponent(self, node: "AddressableNode") -> None:
+        if not node.array_dimensions:
+            return
+
+        for gen in self._generators:
+            for _ in node.array_dimensions:
+                gen.pop_loop()
+
+    def _add_block_acks(self, node: "AddressableNode") -> None:
+        self.external_blocks.append(node)
+        if has_sw_writable_descendants(node, self.exp.ds):  # type: ignore[arg-type]
+            x = self.exp.hwif.get_external_wr_ack(node, True)
+            self.write_ack.add_content(f"wr_ack |= {x};")
+        if has_sw_readable_descendants(node, self.exp.ds):  # type: ignore[arg-type]
+            x = self.exp.hwif.get_external_rd_ack(node, True)
+            self.read_ack.add_content(f"rd_ack |= {x};")
 
     def enter_Regfile(self, node: "RegfileNode") -> WalkerAction:
         if self.policy.is_external(node):
-            if has_sw_readable_descendants(node):
-                x = self.exp.hwif.get_external_rd_ack(node, True)
-                self.ext_racks.append(x)
+            self._add_block_acks(node)
             return WalkerAction.SkipDescendants
         return WalkerAction.Continue
 
     def enter_Addrmap(self, node: "AddrmapNode") -> WalkerAction:
-        # Skip top-level
-        if node == self.exp.ds.top_node:
-            return WalkerAction.Continue
-
         if self.policy.is_external(node):
-            if has_sw_readable_descendants(node):
-                x = self.exp.hwif.get_external_rd_ack(node, True)
-                self.ext_racks.append(x)
+            self._add_block_acks(node)
             return WalkerAction.SkipDescendants
         return WalkerAction.Continue
 
     def enter_Reg(self, node: "RegNode") -> WalkerAction:
-        # Skip registers inside external blocks
-        if is_inside_external_block(node, self.exp.ds.top_node, self.exp.ds):
-            return WalkerAction.SkipDescendants
-
         if self.policy.is_external(node):
+            self.external_blocks.append(node)
+            if node.has_sw_writable:
+                x = self.exp.hwif.get_external_wr_ack(node, True)
+                self.write_ack.add_content(f"wr_ack |= {x};")
             if node.has_sw_readable:
                 x = self.exp.hwif.get_external_rd_ack(node, True)
-                self.ext_racks.append(x)
-        return WalkerAction.Continue
+                self.read_ack.add_content(f"rd_ack |= {x};")
+        return WalkerAction.SkipDescendants
 
     def enter_Mem(self, node: "MemNode") -> WalkerAction:
         if not node.external:
             raise ValueError("Unexpected non-external memory")
-        if node.is_sw_readable:
-            x = self.exp.hwif.get_external_rd_ack(node, True)
-            self.ext_racks.append(x)
-        return WalkerAction.Continue
-
-    def enter_AddressableComponent(self, node: "AddressableNode") -> WalkerAction:
-        super().enter_AddressableComponent(node)
-        self.ext_racks = []
-        return WalkerAction.Continue
-
-    def exit_AddressableComponent(self, node: "AddressableNode") -> WalkerAction:
-        for ext_rack in self.ext_racks:
-            self.add_content(f"rd_ack |= {ext_rack};")
-        # IMPORTANT: Call parent's exit method to balance the stack
-        self.ext_racks = []
-        return super().exit_AddressableComponent(node)  # type: ignore[return-value]
+        self.external_blocks.append(node)
 
+        rd_ack = self.exp.hwif.get_external_rd_ack(node, True)
+        wr_ack = self.exp.hwif.get_external_wr_ack(node, True)
+        readable = node.is_sw_readable
+        writable = node.is_sw_writable
 
-class ExternalReadErrGenerator(RDLForLoopGenerator):
-    """
-    Collects rd_ack & rd_err from external memories with err_support.
-    Used to propagate memory read errors to cpuif_rd_err.
-    """
-
-    def __init__(self, exp: "RegblockExporter") -> None:
-        super().__init__()
-        self.exp = exp
-        self.ext_rd_errs: List[str] = []
-        self.policy = external_policy(self.exp.ds)
-
-    def has_external_read_err(self) -> bool:
-        if self.get_content(self.exp.ds.top_node) is None:
-            return False
-        return True
-
-    def get_implementation(self) -> str:
-        content = self.get_content(self.exp.ds.top_node)
-        if content is None:
-            return ""
-        return content
+        if writable:
+            self.write_ack.add_content(f"wr_ack |= {wr_ack};")
+        if readable:
+            self.read_ack.add_content(f"rd_ack |= {rd_ack};")
 
-    def enter_Mem(self, node: "MemNode") -> WalkerAction:
-        if not node.external:
-            raise ValueError("Unexpected non-external memory")
-        if node.is_sw_readable and node.get_property("err_support", default=False):
+        if node.get_property("err_support", default=False):
             p = IndexedPath(self.exp.ds.top_node, node)
             inflight_value = f"{p.path}_inflight_value"
-            rd_ack = self.exp.hwif.get_external_rd_ack(node, True)
-            rd_err = self.exp.hwif.get_external_rd_err(node, True)
-            self.ext_rd_errs.append(f"({rd_ack} & {rd_err} & {inflight_value})")
-        return WalkerAction.Continue
-
-    def enter_AddressableComponent(self, node: "AddressableNode") -> WalkerAction:
-        super().enter_AddressableComponent(node)
-        self.ext_rd_errs = []
-        return WalkerAction.Continue
-
-    def exit_AddressableComponent(self, node: "AddressableNode") -> WalkerAction:
-        for expr in self.ext_rd_errs:
-            self.add_content(f"rd_err |= {expr};")
-        self.ext_rd_errs = []
-        return super().exit_AddressableComponent(node)  # type: ignore[return-value]
-
-
-class ExternalWriteErrGenerator(RDLForLoopGenerator):
-    """
-    Collects wr_ack & wr_err from external memories with err_support.
-    Used to propagate memory write errors to cpuif_wr_err.
-    """
-
-    def __init__(self, exp: "RegblockExporter") -> None:
-        super().__init__()
-        self.exp = exp
-        self.ext_wr_errs: List[str] = []
-        self.policy = external_policy(self.exp.ds)
-
-    def has_external_write_err(self) -> bool:
-        if self.get_content(self.exp.ds.top_node) is None:
-            return False
-        return True
-
-    def get_implementation(self) -> str:
-        content = self.get_content(self.exp.ds.top_node)
-        if content is None:
-            return ""
-        return content
 
-    def enter_Mem(self, node: "MemNode") -> WalkerAction:
-        if not node.external:
-            raise ValueError("Unexpected non-external memory")
-        if node.is_sw_writable and node.get_property("err_support", default=False):
-            wr_ack = self.exp.hwif.get_external_wr_ack(node, True)
-            wr_err = self.exp.hwif.get_external_wr_err(node, True)
-            self.ext_wr_errs.append(f"({wr_ack} & {wr_err})")
-        return WalkerAction.Continue
-
-    def enter_AddressableComponent(self, node: "AddressableNode") -> WalkerAction:
-        super().enter_AddressableComponent(node)
-        self.ext_wr_errs = []
-        return WalkerAction.Continue
-
-    def exit_AddressableComponent(self, node: "AddressableNode") -> WalkerAction:
-        for expr in self.ext_wr_errs:
-            self.add_content(f"wr_err |= {expr};")
-        self.ext_wr_errs = []
-        return super().exit_AddressableComponent(node)  # type: ignore[return-value]
-
-
-class ExternalMemReqValueGenerator(RDLForLoopGenerator):
-    """
-    For each external memory with err_support, generates a flopped inflight_value signal
-    that stays high from strobe until ack. Adapts to read-only, write-only, or both.
-    """
-
-    def __init__(self, exp: "RegblockExporter") -> None:
-        super().__init__()
-        self.exp = exp
-        self.policy = external_policy(self.exp.ds)
-        self.req_value_blocks: List[str] = []
-
-    def has_req_value_mems(self) -> bool:
-        return bool(self.get_content(self.exp.ds.top_node))
-
-    def get_implementation(self) -> str:
-        content = self.get_content(self.exp.ds.top_node)
-        return content or ""
-
-    def enter_Mem(self, node: "MemNode") -> WalkerAction:
-        if not node.external or not node.get_property("err_support", default=False):
-            return WalkerAction.Continue
-
-        p = IndexedPath(self.exp.ds.top_node, node)
-        sig_name = f"{p.path}_inflight_value"
+            if writable:
+                wr_err = self.exp.hwif.get_external_wr_err(node, True)
+                self.write_err.add_content(f"wr_err |= ({wr_ack} & {wr_err});")
+            if readable:
+                rd_err = self.exp.hwif.get_external_rd_err(node, True)
+                self.read_err.add_content(
+                    f"rd_err |= ({rd_ack} & {rd_err} & {inflight_value});"
+                )
+            self.mem_req_value.add_content(
+                self._get_inflight_value_block(
+                    node, inflight_value, rd_ack, wr_ack, readable, writable
+                )
+            )
+        return WalkerAction.SkipDescendants
+
+    def _get_inflight_value_block(
+        self,
+        node: "MemNode",
+        sig_name: str,
+        rd_ack: str,
+        wr_ack: str,
+        readable: bool,
+        writable: bool,
+    ) -> str:
+        """
+        Flopped inflight_value signal that stays high from strobe until ack.
+        Adapts to read-only, write-only, or both.
+        """
         strb = self.exp.dereferencer.get_external_block_access_strobe(node)
         strb_expr = strb.path + (strb.index_str or "")
 
-        rd_ack = self.exp.hwif.get_external_rd_ack(node, True)
-        wr_ack = self.exp.hwif.get_external_wr_ack(node, True)
-
-        readable = node.is_sw_readable
-        writable = node.is_sw_writable
-
         if readable and writable:
             clear_cond = f"{rd_ack} | {wr_ack}"
         elif readable:
@@ -289,7 +201,7 @@ class ExternalMemReqValueGenerator(RDLForLoopGenerator):
         else:
             clear_cond = wr_ack
 
-        block = f"""logic {sig_name};
+        return f"""logic {sig_name};
 always_ff {self.exp.dereferencer.get_always_ff_event(self.exp.ds.top_node.cpuif_reset)} begin
     if({self.exp.dereferencer.get_resetsignal(self.exp.ds.top_node.cpuif_reset)}) begin
         {sig_name} <= 1'h0;
@@ -299,5 +211,3 @@ always_ff {self.exp.dereferencer.get_always_ff_event(self.exp.ds.top_node.cpuif_
         {sig_name} <= 1'h1;
     end
 end"""
-        self.add_content(block)
-        return WalkerAction.Continue
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Union, Dict, List
+from typing import TYPE_CHECKING, Union, Dict, List, Iterable, Iterator, Optional
 
 from systemrdl.rdltypes import PrecedenceType, InterruptType
 
@@ -17,7 +17,7 @@ from ..sv_int import SVInt
 from .generators import FieldLogicGenerator
 
 if TYPE_CHECKING:
-    from systemrdl.node import AddrmapNode, FieldNode
+    from systemrdl.node import AddrmapNode, FieldNode, Node
     from ..exporter import RegblockExporter, DesignState
 
 
@@ -40,29 +40,61 @@ class FieldLogic:
 
     def get_declarations(self) -> str:
         """Generate field storage declarations only."""
+        return "".join(self.iter_declarations())
+
+    def iter_declarations(self) -> Iterator[str]:
+        """
+        Yield the field storage declarations in chunks, as the design is
+        walked
+        """
         gen = FieldLogicGenerator(self)
-        declarations = gen.get_declarations(self.top_node)
-        if declarations is None:
-            return ""
-        return declarations
+        return gen.iter_declarations(self.top_node)
 
     def get_implementation(self) -> str:
+        return "".join(self.iter_implementation())
+
+    def iter_implementation(self) -> Iterator[str]:
+        """
+        Yield the field logic in chunks, as the design is walked
+        """
         gen = FieldLogicGenerator(self)
-        s = gen.get_content(self.top_node)
-        if s is None:
-            return ""
-        return s
+        return gen.iter_content(self.top_node)
+
+    def iter_declaration_parts(self, children: Iterable["Node"]) -> Iterator[str]:
+        """
+        Yield the field storage declarations of each of the given top-level
+        children, one part per child
+        """
+        gen = FieldLogicGenerator(self)
+        return gen.iter_declaration_parts(children)
+
+    def iter_implementation_parts(self, children: Iterable["Node"]) -> Iterator[str]:
+        """
+        Yield the field logic of each of the given top-level children, one
+        part per child
+        """
+        gen = FieldLogicGenerator(self)
+        return gen.iter_parts(children)
 
     # ---------------------------------------------------------------------------
     # Field utility functions
     # ---------------------------------------------------------------------------
-    def get_storage_identifier(self, field: "FieldNode", declare: bool = False) -> str:
+    def get_storage_identifier(
+        self,
+        field: "FieldNode",
+        declare: bool = False,
+        index_exprs: Optional[Dict[str, str]] = None,
+    ) -> str:
         """
         Returns the Verilog string that represents the storage register element
         for the referenced field
+
+        index_exprs maps loop iterators to the expressions that index the
+        field's array dimensions instead.
         """
         assert field.implements_storage
         p = IndexedPath(self.top_node, field)
+        p.replace_index(index_exprs)
         s = f"field_storage_{p.path}_value"
         if declare and not 0 == len(p.index):
             s += f" {p.array_instances} "
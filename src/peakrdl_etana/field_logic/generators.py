@@ -1,5 +1,5 @@
 import re
-from typing import TYPE_CHECKING, Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Iterable, Iterator
 
 from collections import OrderedDict
 
@@ -48,18 +48,34 @@ class FieldLogicGenerator(RDLForLoopGenerator):
         self.halt_fields = []  # type: List[FieldNode]
         self.declarations_only = False  # Flag to control what gets generated
 
-    def get_declarations(self, node: "Node") -> Optional[str]:
-        """Walk the tree and generate only field storage declarations."""
-        from systemrdl.walker import RDLWalker
-
+    def iter_declarations(self, node: "Node") -> Iterator[str]:
+        """
+        Walk the tree and yield only the field storage declarations, one
+        top-level child at a time.
+        """
+        self.declarations_only = True
+        self.start()
+        for _ in self.walk_children(node):
+            # Declarations are pushed to the top section. Each one starts on a
+            # new line.
+            for s in self.top:
+                yield "\n"
+                yield s
+            self.top.clear()
+        self._stack.pop()
+
+    def iter_declaration_parts(self, children: Iterable["Node"]) -> Iterator[str]:
+        """
+        Yield the field storage declarations of each of the given top-level
+        children on its own. Joining the parts gives the text
+        iter_declarations() yields for these children.
+        """
         self.declarations_only = True
         self.start()
-        walker = RDLWalker()
-        walker.walk(node, self, skip_top=True)
-        # Return only the top section (declarations)
-        if not self.top:
-            return None
-        return self.top
+        for _ in self.walk_each(children):
+            yield "".join(f"\n{s}" for s in self.top)
+            self.top.clear()
+        self._stack.pop()
 
     def enter_Reg(self, node: "RegNode") -> Optional[WalkerAction]:
         # Check if this register is inside an external regfile/addrmap
@@ -82,7 +98,8 @@ class FieldLogicGenerator(RDLForLoopGenerator):
     def enter_Regfile(self, node: "RegfileNode") -> Optional[WalkerAction]:
         # For external regfiles, generate bus interface and skip descendants
         if is_external_for_codegen(node, self.ds):
-            self.assign_external_block_outputs(node)
+            if not self.declarations_only:
+                self.assign_external_block_outputs(node)
             return WalkerAction.SkipDescendants
         return WalkerAction.Continue
 
@@ -93,7 +110,8 @@ class FieldLogicGenerator(RDLForLoopGenerator):
 
         # For external addrmaps, generate bus interface and skip descendants
         if is_external_for_codegen(node, self.ds):
-            self.assign_external_block_outputs(node)
+            if not self.declarations_only:
+                self.assign_external_block_outputs(node)
             return WalkerAction.SkipDescendants
         return WalkerAction.Continue
 
@@ -103,12 +121,19 @@ class FieldLogicGenerator(RDLForLoopGenerator):
             raise
 
         # Is an external block
-        self.assign_external_block_outputs(node)
+        if not self.declarations_only:
+            self.assign_external_block_outputs(node)
 
         # Do not recurse
         return WalkerAction.SkipDescendants
 
     def enter_Field(self, node: "FieldNode") -> None:
+        if self.declarations_only:
+            # Only storage elements have declarations
+            if node.implements_storage and not is_external_for_codegen(node, self.ds):
+                self.generate_field_storage(node)
+            return
+
         if is_external_for_codegen(node, self.ds):
             # For external registers, track fields for wr_data/rd_data generation
             # We need sw_writable fields for wr_data and sw_readable fields for rd_data
@@ -128,13 +153,16 @@ class FieldLogicGenerator(RDLForLoopGenerator):
                 self.halt_fields.append(node)
 
     def exit_Reg(self, node: "RegNode") -> None:
+        if self.declarations_only:
+            return
+
         if is_external_for_codegen(node, self.ds):
             self.assign_external_reg_outputs(node)
             return
 
         # Handle verilog_reg_only: break up register vector into/from individual fields
         verilog_reg_only = node.get_property("verilog_reg_only", default=False)
-        if verilog_reg_only and not self.declarations_only:
+        if verilog_reg_only:
             self.generate_verilog_reg_only_signal_breakup(node)
 
         # Assign register's intr output
@@ -441,8 +469,10 @@ class FieldLogicGenerator(RDLForLoopGenerator):
         }
 
         # Use the same pattern as standard field storage
-        self.push_top(self.field_storage_sig_template.render(context))
-        self.add_content(self.field_storage_template.render(context))
+        if self.declarations_only:
+            self.push_top(self.field_storage_sig_template.render(context))
+        else:
+            self.add_content(self.field_storage_template.render(context))
 
     def assign_field_outputs(self, node: "FieldNode") -> None:
         # Field value output
@@ -549,8 +579,7 @@ class FieldLogicGenerator(RDLForLoopGenerator):
         # For external registers with only ONE field,
         # regblock generates per-register signals without field name suffix
         # Check if this is a single-field register
-        n_fields = sum(1 for f in node.fields() if f.is_sw_readable or f.is_sw_writable)
-        is_single_field = n_fields == 1
+        is_single_field = self.ds.design_ir.get_reg_fields(node).is_single_sw_field
 
         if is_single_field and len(self.fields) == 1:
             # Single-field external register - generate per-register signal without field name
@@ -611,16 +640,16 @@ class FieldLogicGenerator(RDLForLoopGenerator):
         readable = False
         if isinstance(node, RegfileNode):
             retime = self.ds.retime_external_regfile
-            writable = has_sw_writable_descendants(node)
-            readable = has_sw_readable_descendants(node)
+            writable = has_sw_writable_descendants(node, self.ds)
+            readable = has_sw_readable_descendants(node, self.ds)
         elif isinstance(node, MemNode):
             retime = self.ds.retime_external_mem
             writable = node.is_sw_writable
             readable = node.is_sw_readable
         elif isinstance(node, AddrmapNode):
             retime = self.ds.retime_external_addrmap
-            writable = has_sw_writable_descendants(node)
-            readable = has_sw_readable_descendants(node)
+            writable = has_sw_writable_descendants(node, self.ds)
+            readable = has_sw_readable_descendants(node, self.ds)
 
         context = {
             "is_sw_writable": writable,
@@ -1,23 +1,77 @@
-from typing import TYPE_CHECKING, Optional, List, Union
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    List,
+    Union,
+    Match,
+    TextIO,
+    Iterable,
+    Iterator,
+)
+import io
+import itertools
+import re
 import textwrap
 
-from systemrdl.walker import RDLListener, RDLWalker, WalkerAction
+from systemrdl.walker import RDLListener, WalkerAction
+
+from .profiling import profile_phase
 
 if TYPE_CHECKING:
     from systemrdl.node import AddressableNode, Node
+    from .exporter import RegblockExporter
 
 
 class Body:
+    """
+    Fragment tree node. Children are strings or nested bodies, separated by
+    newlines when written.
+
+    Indentation is applied once, when each string is written out, rather than
+    by re-indenting the complete text of every nested loop.
+    """
+
+    __slots__ = ("children",)
+
     def __init__(self) -> None:
         self.children: List[Union[str, "Body"]] = []
 
+    def iter_chunks(self, indent: str = "") -> Iterator[str]:
+        """
+        Yield the contents of this body in chunks, with every non-blank line
+        prefixed by indent
+        """
+        for i, child in enumerate(self.children):
+            if i:
+                yield "\n"
+            if isinstance(child, Body):
+                yield from child.iter_chunks(indent)
+            elif indent:
+                yield textwrap.indent(child, indent)
+            else:
+                yield child
+
+    def write(self, f: TextIO, indent: str = "") -> None:
+        """
+        Write the contents of this body to stream f, with every non-blank line
+        prefixed by indent
+        """
+        for chunk in self.iter_chunks(indent):
+            f.write(chunk)
+
     def __str__(self) -> str:
-        s = "\n".join((str(x) for x in self.children))
-        return s
+        f = io.StringIO()
+        self.write(f)
+        return f.getvalue()
 
 
 class LoopBody(Body):
-    _label_counter = 0  # Class-level counter for unique labels
+    # Class-level counter for unique labels. The numbers are placeholders
+    # only: they depend on the order in which sections were rendered, so
+    # labels are renumbered in order of appearance when the output is written.
+    _label_counter = 0
+
+    __slots__ = ("dim", "iterator", "i_type", "pre_loop", "label")
 
     def __init__(
         self, dim: int, iterator: str, i_type: str, label: Optional[str] = None
@@ -35,14 +89,32 @@ class LoopBody(Body):
         else:
             self.label = label
 
-    def __str__(self) -> str:
-        s = super().__str__()
-        val = ""
-        val = self.pre_loop
-        val += f"for({self.i_type} {self.iterator}=0; {self.iterator}<{self.dim}; {self.iterator}++) begin : {self.label}\n"
-        val += textwrap.indent(s, "    ")
-        val += "\nend"
-        return val
+    def iter_chunks(self, indent: str = "") -> Iterator[str]:
+        header = self.pre_loop
+        header += f"for({self.i_type} {self.iterator}=0; {self.iterator}<{self.dim}; {self.iterator}++) begin : {self.label}\n"
+        yield textwrap.indent(header, indent) if indent else header
+        yield from super().iter_chunks(indent + "    ")
+        yield f"\n{indent}end"
+
+
+class LoopLabelRenumberer:
+    """
+    Renumbers generated loop labels in order of appearance.
+
+    Makes the output independent of the order (or process) in which the
+    sections of a module were rendered.
+    """
+
+    label_re = re.compile(r"(begin : gen_loop_)\d+\b")
+
+    def __init__(self) -> None:
+        self._counter = itertools.count(1)
+
+    def _repl(self, m: Match) -> str:
+        return f"{m.group(1)}{next(self._counter)}"
+
+    def renumber(self, line: str) -> str:
+        return self.label_re.sub(self._repl, line)
 
 
 class ForLoopGenerator:
@@ -52,7 +124,9 @@ class ForLoopGenerator:
     def __init__(self) -> None:
         self._loop_level = 0
         self._stack: List["Body"] = []
-        self.top = ""
+        # Strings pushed with push_top(), each placed on its own line ahead
+        # of the loop content
+        self.top: List[str] = []
 
     @property
     def current_loop(self) -> Body:
@@ -68,8 +142,13 @@ class ForLoopGenerator:
         self.current_loop.children.append(s)
 
     def add_top(self) -> None:
-        if not "" == self.top:
-            self.current_loop.children.insert(0, self.top)
+        if self.top:
+            top = Body()
+            # Leading empty child so that every pushed string starts on a new
+            # line
+            top.children.append("")
+            top.children.extend(self.top)
+            self.current_loop.children.insert(0, top)
 
     def pop_loop(self) -> None:
         b = self._stack.pop()
@@ -95,15 +174,72 @@ class ForLoopGenerator:
 
 
 class RDLForLoopGenerator(ForLoopGenerator, RDLListener):
+    exp: "RegblockExporter"
+
     def get_content(self, node: "Node") -> Optional[str]:
+        with profile_phase(self.exp.profiler, f"generator:{type(self).__name__}"):
+            self.start()
+            self.exp.ds.design_ir.walk(node, self, skip_top=True)
+            return self.finish()
+
+    def walk_children(self, node: "Node") -> Iterator[None]:
+        """
+        Walk the children of node one at a time, yielding after each one.
+
+        Lets a generator hand off the content of every top-level child before
+        walking the next, so that only one child's fragments are held in
+        memory at a time.
+        """
+        return self.walk_each(self.exp.ds.design_ir.children(node))
+
+    def walk_each(self, nodes: Iterable["Node"]) -> Iterator[None]:
+        """
+        Walk the given nodes one at a time, yielding after each one
+        """
+        ir = self.exp.ds.design_ir
+        for node in nodes:
+            with profile_phase(self.exp.profiler, f"generator:{type(self).__name__}"):
+                ir.walk(node, self)
+            yield
+
+    def iter_content(self, node: "Node") -> Iterator[str]:
+        """
+        Streaming variant of get_content(). Yields the same text in chunks,
+        as the tree is walked.
+
+        Content pushed with push_top() would have to precede everything else,
+        so generators that use it cannot be streamed this way.
+        """
+        self.start()
+        root = self.current_loop
+        first = True
+        for _ in self.walk_children(node):
+            if not root.children:
+                continue
+            if not first:
+                yield "\n"
+            first = False
+            yield from root.iter_chunks()
+            root.children.clear()
+        assert not self.top, "push_top() is not supported by iter_content()"
+        self._stack.pop()
+
+    def iter_parts(self, children: Iterable["Node"]) -> Iterator[str]:
+        """
+        Yield the content of each of the given top-level children on its own,
+        or an empty string if it has none. Joining the non-empty parts with
+        newlines gives the text iter_content() yields for these children.
+        """
         self.start()
-        walker = RDLWalker()
-        walker.walk(node, self, skip_top=True)
-        return self.finish()
+        root = self.current_loop
+        for _ in self.walk_each(children):
+            yield "".join(root.iter_chunks())
+            root.children.clear()
+        assert not self.top, "push_top() is not supported by iter_parts()"
+        self._stack.pop()
 
     def push_top(self, s: str) -> None:
-        self.top += "\n"
-        self.top += s
+        self.top.append(s)
 
     def enter_AddressableComponent(
         self, node: "AddressableNode"
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Union, Optional
+from typing import TYPE_CHECKING, Union, Optional, Tuple, Dict
 
 from systemrdl.node import (
     AddrmapNode,
@@ -16,6 +16,7 @@ from ..identifier_filter import kw_filter as kwf
 from ..sv_int import SVInt
 
 from .generators import InputLogicGenerator
+from .port import Port
 
 if TYPE_CHECKING:
     from ..exporter import RegblockExporter, DesignState
@@ -39,6 +40,9 @@ class Hwif:
         self.hwif_in_str = hwif_in_str
         self.hwif_out_str = hwif_out_str
 
+        # hwif ports, computed once on first use
+        self._ports: Optional[Tuple[Port, ...]] = None
+
     @property
     def ds(self) -> "DesignState":
         return self.exp.ds
@@ -72,26 +76,35 @@ class Hwif:
         return ""
 
     @property
-    def has_hwif_ports(self) -> bool:
-        try:
-            hwif_ports = InputLogicGenerator(self)
-            self.logic = hwif_ports.get_logic(self.top_node)
-            return bool(self.logic and len(self.logic) > 0)
-        except Exception as e:
-            import traceback
+    def ports(self) -> Tuple[Port, ...]:
+        """
+        All I/O ports in the hwif group, in declaration order.
 
-            print(f"\n\nERROR in has_hwif_ports: {e}")
-            traceback.print_exc()
-            raise
+        The design is only walked on first access. The result is reused by the
+        module template, the template generator and the hwif report.
+        """
+        if self._ports is None:
+            try:
+                hwif_ports = InputLogicGenerator(self)
+                self._ports = tuple(hwif_ports.get_logic(self.top_node))
+            except Exception as e:
+                import traceback
+
+                print(f"\n\nERROR in has_hwif_ports: {e}")
+                traceback.print_exc()
+                raise
+        return self._ports
+
+    @property
+    def has_hwif_ports(self) -> bool:
+        return len(self.ports) > 0
 
     @property
     def port_declaration(self) -> str:
         """
         Returns the declaration string for all I/O ports in the hwif group
         """
-
-        assert self.has_hwif_ports is not None
-        return ",\n".join(self.logic) if self.logic is not None else ""
+        return ",\n".join(port.declaration for port in self.ports)
 
     # ---------------------------------------------------------------------------
     # hwif utility functions
@@ -119,6 +132,7 @@ class Hwif:
         obj: Union[FieldNode, SignalNode, PropertyReference],
         width: Optional[int] = None,
         index: Optional[bool] = True,
+        index_exprs: Optional[Dict[str, str]] = None,
     ) -> Union[SVInt, str]:
         """
         Returns the identifier string that best represents the input object.
@@ -130,14 +144,20 @@ class Hwif:
                 could be an implied hwclr/hwset/swwe/swwel/we/wel input
 
         raises an exception if obj is invalid
+
+        index_exprs maps loop iterators to the expressions that index a field's
+        array dimensions instead.
         """
         if isinstance(obj, FieldNode):
             next_value = obj.get_property("next")
             if next_value is not None:
                 # 'next' property replaces the inferred input signal
-                return self.exp.dereferencer.get_value(next_value, width)
+                return self.exp.dereferencer.get_value(
+                    next_value, width, index_exprs=index_exprs
+                )
             # Otherwise, use inferred
             p = IndexedPath(self.top_node, obj)
+            p.replace_index(index_exprs)
             s = f"{self.hwif_in_str}_{p.path}"
             if index:
                 s += p.index_str
@@ -163,10 +183,16 @@ class Hwif:
         raise RuntimeError(f"Unhandled reference to: {obj}")
 
     def get_external_rd_data(
-        self, node: Union[FieldNode, AddressableNode], index: bool = False
+        self,
+        node: Union[FieldNode, AddressableNode],
+        index: bool = False,
+        index_exprs: Optional[Dict[str, str]] = None,
     ) -> str:
         """
         Returns the identifier string for an external component's rd_data signal
+
+        index_exprs maps loop iterators to the expressions that index the
+        component's array dimensions instead.
         """
         if isinstance(node, FieldNode):
             if not node.is_sw_readable:
@@ -175,10 +201,8 @@ class Hwif:
                 )
             # Check if this is a register with only ONE field
             # For single-field external registers, regblock uses register-level signals (no field suffix)
-            n_fields = sum(
-                1 for f in node.parent.fields() if f.is_sw_readable or f.is_sw_writable
-            )
-            is_single_field = n_fields == 1
+            reg_fields = self.ds.design_ir.get_reg_fields(node.parent)
+            is_single_field = reg_fields.is_single_sw_field
 
             # Match regblock naming: {reg}_rd_data_{field} for multi-field registers
             # For single-field registers: {reg}_rd_data (no field suffix)
@@ -206,6 +230,7 @@ class Hwif:
                 f"Unhandled node type in get_external_rd_data: {type(node)}"
             )
         if index:
+            p.replace_index(index_exprs)
             s += p.index_str
         return s
 
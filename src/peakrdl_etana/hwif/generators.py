@@ -1,7 +1,7 @@
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, List, Tuple
 
 from systemrdl.node import FieldNode, RegNode, AddrmapNode, MemNode, SignalNode
-from systemrdl.walker import RDLListener, RDLWalker
+from systemrdl.walker import RDLListener
 
 from ..utils import (
     clog2,
@@ -10,6 +10,7 @@ from ..utils import (
     external_policy,
 )
 from ..identifier_filter import kw_filter as kwf
+from .port import Port
 
 if TYPE_CHECKING:
     from systemrdl.node import Node, RegfileNode
@@ -19,7 +20,7 @@ if TYPE_CHECKING:
 class InputLogicGenerator(RDLListener):
     def __init__(self, hwif: "Hwif") -> None:
         self.hwif = hwif
-        self.hwif_port: List[str] = []
+        self.hwif_port: List[Port] = []
         #         self.hwif_out = []
         super().__init__()
         self.regfile = False
@@ -27,24 +28,21 @@ class InputLogicGenerator(RDLListener):
         self.out_port: List[str] = []
         self.regfile_array: List[str] = []
         self.vector_text = ""  # Initialize to empty string
-        self.unpacked_dims = ""  # Initialize unpacked dimensions for after signal name
+        # Unpacked dimensions, declared after the signal name
+        self.array_dims: Tuple[int, ...] = ()
         self.policy = external_policy(self.hwif.ds)
         self.current_verilog_reg_only = (
             False  # Track if current register has verilog_reg_only property
         )
 
-    def get_logic(self, node: "Node") -> Optional[str]:
+    def get_logic(self, node: "Node") -> List[Port]:
 
-        walker = RDLWalker()
-        walker.walk(node, self, skip_top=True)
+        self.hwif.ds.design_ir.walk(node, self, skip_top=True)
 
         return self.finish()
 
-    def finish(self) -> Optional[str]:
-        self.lines = []
-        self.lines.extend(self.hwif_port)
-        #         self.lines.extend(self.hwif_out)
-        return self.lines  # type: ignore[return-value]
+    def finish(self) -> List[Port]:
+        return self.hwif_port
 
     def enter_Addrmap(self, node: "AddrmapNode") -> None:
         from ..utils import IndexedPath, clog2
@@ -62,44 +60,34 @@ class InputLogicGenerator(RDLListener):
             addr_width = clog2(node.size)
 
             # Output ports - always generate req, addr, and req_is_wr
-            self.hwif_port.append(f"output logic {prefix_out}_req")
-            if addr_width > 1:
-                self.hwif_port.append(
-                    f"output logic [{addr_width-1}:0] {prefix_out}_addr"
-                )
-            else:
-                self.hwif_port.append(f"output logic {prefix_out}_addr")
-            self.hwif_port.append(f"output logic {prefix_out}_req_is_wr")
+            self.hwif_port.append(Port("output", f"{prefix_out}_req", node=node))
+            self.hwif_port.append(
+                Port("output", f"{prefix_out}_addr", addr_width, node=node)
+            )
+            self.hwif_port.append(Port("output", f"{prefix_out}_req_is_wr", node=node))
 
             # Check if addrmap has sw-writable/readable registers
-            has_sw_wr = has_sw_writable_descendants(node)
-            has_sw_rd = has_sw_readable_descendants(node)
+            has_sw_wr = has_sw_writable_descendants(node, self.hwif.ds)
+            has_sw_rd = has_sw_readable_descendants(node, self.hwif.ds)
 
             if has_sw_wr:
                 # Get the data width - use cpuif data width as default
                 data_width = self.hwif.exp.cpuif.data_width
-                if data_width > 1:
-                    self.hwif_port.append(
-                        f"output logic [{data_width-1}:0] {prefix_out}_wr_data"
-                    )
-                    self.hwif_port.append(
-                        f"output logic [{data_width-1}:0] {prefix_out}_wr_biten"
-                    )
-                else:
-                    self.hwif_port.append(f"output logic {prefix_out}_wr_data")
-                    self.hwif_port.append(f"output logic {prefix_out}_wr_biten")
-                self.hwif_port.append(f"input wire {prefix_in}_wr_ack")
+                self.hwif_port.append(
+                    Port("output", f"{prefix_out}_wr_data", data_width, node=node)
+                )
+                self.hwif_port.append(
+                    Port("output", f"{prefix_out}_wr_biten", data_width, node=node)
+                )
+                self.hwif_port.append(Port("input", f"{prefix_in}_wr_ack", node=node))
 
             if has_sw_rd:
                 # Get the data width - use cpuif data width as default
                 data_width = self.hwif.exp.cpuif.data_width
-                if data_width > 1:
-                    self.hwif_port.append(
-                        f"input wire [{data_width-1}:0] {prefix_in}_rd_data"
-                    )
-                else:
-                    self.hwif_port.append(f"input wire {prefix_in}_rd_data")
-                self.hwif_port.append(f"input wire {prefix_in}_rd_ack")
+                self.hwif_port.append(
+                    Port("input", f"{prefix_in}_rd_data", data_width, node=node)
+                )
+                self.hwif_port.append(Port("input", f"{prefix_in}_rd_ack", node=node))
 
     def enter_Mem(self, node: "MemNode") -> None:
         # For external memories, data signals use CPUIF bus width, not memwidth
@@ -115,36 +103,41 @@ class InputLogicGenerator(RDLListener):
         p = IndexedPath(self.hwif.top_node, node)
         ext_in = f"{self.hwif.hwif_in_str}_{p.path}"
         ext_out = f"{self.hwif.hwif_out_str}_{p.path}"
-        if addr_width > 1:
-            self.hwif_port.append(f"output logic [{addr_width-1}:0] {ext_out}_addr")
-        else:
-            self.hwif_port.append(f"output logic {ext_out}_addr")
-        self.hwif_port.append(f"output logic {ext_out}_req")
+        self.hwif_port.append(Port("output", f"{ext_out}_addr", addr_width, node=node))
+        self.hwif_port.append(Port("output", f"{ext_out}_req", node=node))
         if node.is_sw_readable:
-            if data_width > 1:
-                self.hwif_port.append(
-                    f"input logic [{data_width-1}:0] {ext_in}_rd_data"
+            # Memory inputs are declared as logic rather than wire
+            self.hwif_port.append(
+                Port(
+                    "input",
+                    f"{ext_in}_rd_data",
+                    data_width,
+                    node=node,
+                    net_type="logic",
                 )
-            else:
-                self.hwif_port.append(f"input logic {ext_in}_rd_data")
-            self.hwif_port.append(f"input logic {ext_in}_rd_ack")
+            )
+            self.hwif_port.append(
+                Port("input", f"{ext_in}_rd_ack", node=node, net_type="logic")
+            )
             if node.get_property("err_support", default=False):
-                self.hwif_port.append(f"input logic {ext_in}_rd_err")
-        if node.is_sw_writable:
-            self.hwif_port.append(f"input logic {ext_in}_wr_ack")
-            self.hwif_port.append(f"output logic {ext_out}_req_is_wr")
-            if data_width > 1:
                 self.hwif_port.append(
-                    f"output logic [{data_width-1}:0] {ext_out}_wr_data"
+                    Port("input", f"{ext_in}_rd_err", node=node, net_type="logic")
                 )
+        if node.is_sw_writable:
+            self.hwif_port.append(
+                Port("input", f"{ext_in}_wr_ack", node=node, net_type="logic")
+            )
+            self.hwif_port.append(Port("output", f"{ext_out}_req_is_wr", node=node))
+            self.hwif_port.append(
+                Port("output", f"{ext_out}_wr_data", data_width, node=node)
+            )
+            self.hwif_port.append(
+                Port("output", f"{ext_out}_wr_biten", data_width, node=node)
+            )
+            if node.get_property("err_support", default=False):
                 self.hwif_port.append(
-                    f"output logic [{data_width-1}:0] {ext_out}_wr_biten"
+                    Port("input", f"{ext_in}_wr_err", node=node, net_type="logic")
                 )
-            else:
-                self.hwif_port.append(f"output logic {ext_out}_wr_data")
-                self.hwif_port.append(f"output logic {ext_out}_wr_biten")
-            if node.get_property("err_support", default=False):
-                self.hwif_port.append(f"input logic {ext_in}_wr_err")
 
     def enter_Regfile(self, node: "RegfileNode") -> None:
         from ..utils import IndexedPath, clog2
@@ -161,18 +154,15 @@ class InputLogicGenerator(RDLListener):
             addr_width = clog2(node.size)
 
             # Output ports - always generate req, addr, and req_is_wr
-            self.hwif_port.append(f"output logic {prefix_out}_req")
-            if addr_width > 1:
-                self.hwif_port.append(
-                    f"output logic [{addr_width-1}:0] {prefix_out}_addr"
-                )
-            else:
-                self.hwif_port.append(f"output logic {prefix_out}_addr")
-            self.hwif_port.append(f"output logic {prefix_out}_req_is_wr")
+            self.hwif_port.append(Port("output", f"{prefix_out}_req", node=node))
+            self.hwif_port.append(
+                Port("output", f"{prefix_out}_addr", addr_width, node=node)
+            )
+            self.hwif_port.append(Port("output", f"{prefix_out}_req_is_wr", node=node))
 
             # Check if regfile has sw-writable registers
-            has_sw_wr = has_sw_writable_descendants(node)
-            has_sw_rd = has_sw_readable_descendants(node)
+            has_sw_wr = has_sw_writable_descendants(node, self.hwif.ds)
+            has_sw_rd = has_sw_readable_descendants(node, self.hwif.ds)
 
             # For external blocks, data signals always match the CPUIF bus width
             # (same rule as external memories). Wide/narrow register semantics are
@@ -180,30 +170,23 @@ class InputLogicGenerator(RDLListener):
             data_width = self.hwif.exp.cpuif.data_width
 
             if has_sw_wr:
-                if data_width > 1:
-                    self.hwif_port.append(
-                        f"output logic [{data_width-1}:0] {prefix_out}_wr_data"
-                    )
-                    self.hwif_port.append(
-                        f"output logic [{data_width-1}:0] {prefix_out}_wr_biten"
-                    )
-                else:
-                    self.hwif_port.append(f"output logic {prefix_out}_wr_data")
-                    self.hwif_port.append(f"output logic {prefix_out}_wr_biten")
-                self.hwif_port.append(f"input wire {prefix_in}_wr_ack")
+                self.hwif_port.append(
+                    Port("output", f"{prefix_out}_wr_data", data_width, node=node)
+                )
+                self.hwif_port.append(
+                    Port("output", f"{prefix_out}_wr_biten", data_width, node=node)
+                )
+                self.hwif_port.append(Port("input", f"{prefix_in}_wr_ack", node=node))
 
             if has_sw_rd:
-                if data_width > 1:
-                    self.hwif_port.append(
-                        f"input wire [{data_width-1}:0] {prefix_in}_rd_data"
-                    )
-                else:
-                    self.hwif_port.append(f"input wire {prefix_in}_rd_data")
-                self.hwif_port.append(f"input wire {prefix_in}_rd_ack")
+                self.hwif_port.append(
+                    Port("input", f"{prefix_in}_rd_data", data_width, node=node)
+                )
+                self.hwif_port.append(Port("input", f"{prefix_in}_rd_ack", node=node))
 
     def exit_Regfile(self, node: "RegfileNode") -> None:
         self.regfile_array = []
-        self.unpacked_dims = ""  # Reset unpacked dimensions
+        self.array_dims = ()  # Reset unpacked dimensions
 
     def exit_Reg(self, node: "RegNode") -> None:
         # Reset verilog_reg_only flag when exiting register
@@ -212,13 +195,12 @@ class InputLogicGenerator(RDLListener):
     def enter_Reg(self, node: "RegNode") -> None:
         from ..utils import IndexedPath
 
-        self.n_subwords = node.get_property("regwidth") // node.get_property(
-            "accesswidth"
-        )
+        reg_fields = self.hwif.ds.design_ir.get_reg_fields(node)
+        self.n_subwords = reg_fields.n_subwords
 
         self.vector = 1
         self.vector_text = ""
-        self.unpacked_dims = ""  # Unpacked dimensions for after signal name
+        self.array_dims = ()
         self.current_verilog_reg_only = node.get_property(
             "verilog_reg_only", default=False
         )
@@ -229,8 +211,8 @@ class InputLogicGenerator(RDLListener):
 
         # Build unpacked dimensions (arrays) - placed AFTER signal name
         # Format: signal_name [3:0] [1:0] (unpacked array format)
+        self.array_dims = tuple(array_dimensions)
         for i in array_dimensions:
-            self.unpacked_dims += f" [{i-1}:0]"
             self.vector *= i
 
         # Skip generating ports for registers inside external regfiles/addrmaps
@@ -263,81 +245,70 @@ class InputLogicGenerator(RDLListener):
                 # Input vector for hw_writable fields
                 reg_identifier = f"{self.hwif.hwif_in_str}_{p.path}"
                 width = max_bit_writable + 1
-
-                if width > 1:
-                    packed_dim = f"[{width-1}:0]"
-                    self.hwif_port.append(
-                        f"input wire {packed_dim} {reg_identifier}{self.unpacked_dims}"
-                    )
-                else:
-                    self.hwif_port.append(
-                        f"input wire {reg_identifier}{self.unpacked_dims}"
-                    )
+                self.hwif_port.append(
+                    Port("input", reg_identifier, width, self.array_dims, node)
+                )
 
             if hw_readable_fields:
                 # Output vector for hw_readable fields
                 out_identifier = f"{self.hwif.hwif_out_str}_{p.path}"
                 width = max_bit_readable + 1
-
-                if width > 1:
-                    packed_dim = f"[{width-1}:0]"
-                    self.hwif_port.append(
-                        f"output logic {packed_dim} {out_identifier}{self.unpacked_dims}"
-                    )
-                else:
-                    self.hwif_port.append(
-                        f"output logic {out_identifier}{self.unpacked_dims}"
-                    )
+                self.hwif_port.append(
+                    Port("output", out_identifier, width, self.array_dims, node)
+                )
             # Don't process individual fields for verilog_reg_only registers
             # (enter_Field will check current_verilog_reg_only and skip)
 
         # Check for register-level interrupt outputs
         # Interrupt and halt are field properties, so check if any field in the register has them
-        has_intr = any(field.get_property("intr") for field in node.fields())
-        has_halt = any(
-            field.get_property("haltenable") is not None
-            or field.get_property("haltmask") is not None
-            for field in node.fields()
-        )
-
-        if has_intr:
+        if reg_fields.has_intr:
             # Register has interrupt output
             from ..utils import IndexedPath
 
             p = IndexedPath(self.hwif.top_node, node)
             intr_identifier = f"{self.hwif.hwif_out_str}_{p.path}_intr"
-            self.hwif_port.append(f"output logic {intr_identifier}{self.unpacked_dims}")
+            self.hwif_port.append(
+                Port("output", intr_identifier, array_dims=self.array_dims, node=node)
+            )
 
-        if has_halt:
+        if reg_fields.has_halt:
             # Register has halt output
             from ..utils import IndexedPath
 
             p = IndexedPath(self.hwif.top_node, node)
             halt_identifier = f"{self.hwif.hwif_out_str}_{p.path}_halt"
-            self.hwif_port.append(f"output logic {halt_identifier}{self.unpacked_dims}")
+            self.hwif_port.append(
+                Port("output", halt_identifier, array_dims=self.array_dims, node=node)
+            )
 
         if self.policy.is_external(node):
-            vector_extend = ""
-            if not 1 == self.n_subwords:
-                vector_extend = f"[{self.n_subwords-1}:0]"
-
+            # Wide registers get one req bit per subword
             x = self.hwif.get_output_identifier(node)  # type: ignore[arg-type]
-            if vector_extend:
-                self.hwif_port.append(
-                    f"output logic {vector_extend} {x}_req{self.unpacked_dims}"
-                )
-            else:
-                self.hwif_port.append(f"output logic {x}_req{self.unpacked_dims}")
+            self.hwif_port.append(
+                Port("output", f"{x}_req", self.n_subwords, self.array_dims, node)
+            )
             # Always generate req_is_wr for external registers
             # External modules need to distinguish read vs write requests
-            self.hwif_port.append(f"output logic {x}_req_is_wr{self.unpacked_dims}")
+            self.hwif_port.append(
+                Port("output", f"{x}_req_is_wr", array_dims=self.array_dims, node=node)
+            )
             if node.has_sw_readable:
                 self.hwif_port.append(
-                    f"input wire {self.hwif.get_external_rd_ack(node)}{self.unpacked_dims}"
+                    Port(
+                        "input",
+                        self.hwif.get_external_rd_ack(node),
+                        array_dims=self.array_dims,
+                        node=node,
+                    )
                 )
             if node.has_sw_writable:
                 self.hwif_port.append(
-                    f"input wire {self.hwif.get_external_wr_ack(node)}{self.unpacked_dims}"
+                    Port(
+                        "input",
+                        self.hwif.get_external_wr_ack(node),
+                        array_dims=self.array_dims,
+                        node=node,
+                    )
                 )
 
     def enter_Field(self, node: "FieldNode") -> None:
@@ -415,96 +386,62 @@ class InputLogicGenerator(RDLListener):
             return
 
         width = node.width
-        if width > 1:
-            packed_dim = f"[{width-1}:0]"
-        else:
-            packed_dim = ""
         if self.policy.is_external(node):
             # For external registers with only ONE field,
             # regblock generates per-register signals without field name suffix
             # Check if this is a single-field register
-            n_fields = sum(
-                1 for f in node.parent.fields() if f.is_sw_readable or f.is_sw_writable
-            )
-            is_single_field = n_fields == 1
+            reg_fields = self.hwif.ds.design_ir.get_reg_fields(node.parent)
+            is_single_field = reg_fields.is_single_sw_field
 
             # For external registers, always use accesswidth for data port width
             # This ensures correct width even when regwidth == accesswidth (not "wide")
-            accesswidth = node.parent.get_property("accesswidth")
-            port_width = accesswidth
-            if port_width > 1:
-                packed_dim = f"[{port_width-1}:0]"
-            else:
-                packed_dim = ""
+            port_width = reg_fields.accesswidth
 
             if node.is_sw_readable:
                 rd_data_name = self.hwif.get_external_rd_data(node)
-                if packed_dim:
-                    self.hwif_port.append(
-                        f"input wire {packed_dim} {rd_data_name}{self.unpacked_dims}"
-                    )
-                else:
-                    self.hwif_port.append(
-                        f"input wire {rd_data_name}{self.unpacked_dims}"
-                    )
+                self.hwif_port.append(
+                    Port("input", rd_data_name, port_width, self.array_dims, node)
+                )
             if node.is_sw_writable:
                 x = self.hwif.get_output_identifier(node.parent)  # type: ignore[arg-type]
                 # Match regblock naming: {reg}_wr_data_{field} for multi-field registers
                 # For single-field registers: {reg}_wr_data (no field suffix)
                 if is_single_field:
-                    if packed_dim:
-                        self.hwif_port.append(
-                            f"output logic {packed_dim} {x}_wr_data{self.unpacked_dims}"
-                        )
-                        self.hwif_port.append(
-                            f"output logic {packed_dim} {x}_wr_biten{self.unpacked_dims}"
-                        )
-                    else:
-                        self.hwif_port.append(
-                            f"output logic {x}_wr_data{self.unpacked_dims}"
-                        )
-                        self.hwif_port.append(
-                            f"output logic {x}_wr_biten{self.unpacked_dims}"
-                        )
+                    field_suffix = ""
                 else:
-                    field_suffix = kwf(node.inst_name.lower())
-                    if packed_dim:
-                        self.hwif_port.append(
-                            f"output logic {packed_dim} {x}_wr_data_{field_suffix}{self.unpacked_dims}"
-                        )
-                        self.hwif_port.append(
-                            f"output logic {packed_dim} {x}_wr_biten_{field_suffix}{self.unpacked_dims}"
-                        )
-                    else:
-                        self.hwif_port.append(
-                            f"output logic {x}_wr_data_{field_suffix}{self.unpacked_dims}"
-                        )
-                        self.hwif_port.append(
-                            f"output logic {x}_wr_biten_{field_suffix}{self.unpacked_dims}"
-                        )
+                    field_suffix = f"_{kwf(node.inst_name.lower())}"
+                self.hwif_port.append(
+                    Port(
+                        "output",
+                        f"{x}_wr_data{field_suffix}",
+                        port_width,
+                        self.array_dims,
+                        node,
+                    )
+                )
+                self.hwif_port.append(
+                    Port(
+                        "output",
+                        f"{x}_wr_biten{field_suffix}",
+                        port_width,
+                        self.array_dims,
+                        node,
+                    )
+                )
         else:
             if self.hwif.has_value_input(node):
                 # Check if field has 'next' property - if so, the signal provides the input
                 if node.get_property("next") is None:
                     input_identifier = self.hwif.get_input_identifier(node, index=False)
-                    if packed_dim:
-                        self.hwif_port.append(
-                            f"input wire {packed_dim} {input_identifier}{self.unpacked_dims}"
-                        )
-                    else:
-                        self.hwif_port.append(
-                            f"input wire {input_identifier}{self.unpacked_dims}"
-                        )
-            if self.hwif.has_value_output(node):
-                output_identifier = self.hwif.get_output_identifier(node, index=False)
-                if packed_dim:
+                    assert isinstance(input_identifier, str)
                     self.hwif_port.append(
-                        f"output logic {packed_dim} {output_identifier}{self.unpacked_dims}"
-                    )
-                else:
-                    self.hwif_port.append(
-                        f"output logic {output_identifier}{self.unpacked_dims}"
+                        Port("input", input_identifier, width, self.array_dims, node)
                     )
+            if self.hwif.has_value_output(node):
+                output_identifier = self.hwif.get_output_identifier(node, index=False)
+                self.hwif_port.append(
+                    Port("output", output_identifier, width, self.array_dims, node)
+                )
 
             # Add implied property output signals (bitwise reductions, access strobes, counter events)
             for prop in ["anded", "ored", "xored", "swmod", "swacc"]:
@@ -514,7 +451,12 @@ class InputLogicGenerator(RDLListener):
                     )
                     # These outputs are single-bit (no packed dimension, only unpacked)
                     self.hwif_port.append(
-                        f"output logic {prop_identifier}{self.unpacked_dims}"
+                        Port(
+                            "output",
+                            prop_identifier,
+                            array_dims=self.array_dims,
+                            node=node,
+                        )
                     )
 
             # Access strobe outputs
@@ -523,14 +465,18 @@ class InputLogicGenerator(RDLListener):
                     node, "rd_swacc", index=False
                 )
                 self.hwif_port.append(
-                    f"output logic {prop_identifier}{self.unpacked_dims}"
+                    Port(
+                        "output", prop_identifier, array_dims=self.array_dims, node=node
+                    )
                 )
             if node.get_property("wr_swacc", default=False):
                 prop_identifier = self.hwif.get_implied_prop_output_identifier(
                     node, "wr_swacc", index=False
                 )
                 self.hwif_port.append(
-                    f"output logic {prop_identifier}{self.unpacked_dims}"
+                    Port(
+                        "output", prop_identifier, array_dims=self.array_dims, node=node
+                    )
                 )
 
             # Counter event outputs
@@ -539,14 +485,18 @@ class InputLogicGenerator(RDLListener):
                     node, "overflow", index=False
                 )
                 self.hwif_port.append(
-                    f"output logic {prop_identifier}{self.unpacked_dims}"
+                    Port(
+                        "output", prop_identifier, array_dims=self.array_dims, node=node
+                    )
                 )
             if node.get_property("underflow", default=False):
                 prop_identifier = self.hwif.get_implied_prop_output_identifier(
                     node, "underflow", index=False
                 )
                 self.hwif_port.append(
-                    f"output logic {prop_identifier}{self.unpacked_dims}"
+                    Port(
+                        "output", prop_identifier, array_dims=self.array_dims, node=node
+                    )
                 )
 
             # Counter threshold outputs
@@ -555,14 +505,18 @@ class InputLogicGenerator(RDLListener):
                     node, "incrthreshold", index=False
                 )
                 self.hwif_port.append(
-                    f"output logic {prop_identifier}{self.unpacked_dims}"
+                    Port(
+                        "output", prop_identifier, array_dims=self.array_dims, node=node
+                    )
                 )
             if node.get_property("decrthreshold", default=False) is not False:
                 prop_identifier = self.hwif.get_implied_prop_output_identifier(
                     node, "decrthreshold", index=False
                 )
                 self.hwif_port.append(
-                    f"output logic {prop_identifier}{self.unpacked_dims}"
+                    Port(
+                        "output", prop_identifier, array_dims=self.array_dims, node=node
+                    )
                 )
 
             # Add implied property input signals
@@ -573,15 +527,13 @@ class InputLogicGenerator(RDLListener):
                 # Determine width based on property type
                 if prop in ["incrvalue", "decrvalue"]:
                     # These are value properties, use field width
-                    prop_packed_dim = f"[{width-1}:0]"
-                    self.hwif_port.append(
-                        f"input wire {prop_packed_dim} {prop_identifier}{self.unpacked_dims}"
-                    )
+                    prop_width = width
                 else:
                     # These are single-bit control signals
-                    self.hwif_port.append(
-                        f"input wire {prop_identifier}{self.unpacked_dims}"
-                    )
+                    prop_width = 1
+                self.hwif_port.append(
+                    Port("input", prop_identifier, prop_width, self.array_dims, node)
+                )
 
     def enter_Signal(self, node: "SignalNode") -> None:
         # Signals that are not promoted to top-level need to be added as ports
@@ -591,12 +543,14 @@ class InputLogicGenerator(RDLListener):
                 return
 
         width = node.width if node.width is not None else 1
-        if width > 1:
-            signal_packed_dim = f"[{width-1}:0]"
-            self.hwif_port.append(
-                f"input wire {signal_packed_dim} {self.hwif.get_input_identifier(node, index=False)}{self.unpacked_dims}"
-            )
-        else:
-            self.hwif_port.append(
-                f"input wire {self.hwif.get_input_identifier(node, index=False)}{self.unpacked_dims}"
+        input_identifier = self.hwif.get_input_identifier(node, index=False)
+        assert isinstance(input_identifier, str)
+        self.hwif_port.append(
+            Port(
+                "input",
+                input_identifier,
+                width,
+                self.array_dims,
+                node,
             )
+        )
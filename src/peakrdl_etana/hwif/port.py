@@ -0,0 +1,83 @@
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from systemrdl.node import Node
+
+
+class Port:
+    """
+    A single hwif port of the generated module.
+
+    This is the source of truth for the hwif port list. The SystemVerilog
+    declaration is rendered from it, and downstream generators (integration
+    template, wrappers, reports) can use the fields directly rather than
+    parsing the declaration text.
+    """
+
+    __slots__ = ("direction", "name", "width", "array_dims", "node", "net_type")
+
+    def __init__(
+        self,
+        direction: str,
+        name: str,
+        width: int = 1,
+        array_dims: Tuple[int, ...] = (),
+        node: Optional["Node"] = None,
+        net_type: Optional[str] = None,
+    ) -> None:
+        # "input" or "output"
+        self.direction = direction
+        self.name = name
+        # Packed width in bits. Ports of width 1 are declared without a
+        # packed range.
+        self.width = width
+        # Sizes of the unpacked dimensions, outermost first. Ports of
+        # register arrays have one dimension per array level.
+        self.array_dims = array_dims
+        # RDL node the port was generated for
+        self.node = node
+        if net_type is None:
+            net_type = "wire" if direction == "input" else "logic"
+        self.net_type = net_type
+
+    @property
+    def is_input(self) -> bool:
+        return self.direction == "input"
+
+    @property
+    def is_output(self) -> bool:
+        return self.direction == "output"
+
+    @property
+    def packed_dim(self) -> str:
+        """
+        Packed range of the port, e.g. "[7:0]", or "" for single-bit ports
+        """
+        if self.width > 1:
+            return f"[{self.width - 1}:0]"
+        return ""
+
+    @property
+    def unpacked_dims(self) -> str:
+        """
+        Unpacked dimensions that follow the port name, e.g. " [3:0] [1:0]"
+        """
+        return "".join(f" [{dim - 1}:0]" for dim in self.array_dims)
+
+    @property
+    def declaration(self) -> str:
+        """
+        SystemVerilog ANSI port declaration, without a trailing comma
+        """
+        if self.width > 1:
+            return (
+                f"{self.direction} {self.net_type} [{self.width - 1}:0] "
+                f"{self.name}{self.unpacked_dims}"
+            )
+        return f"{self.direction} {self.net_type} {self.name}{self.unpacked_dims}"
+
+    def __str__(self) -> str:
+        return self.declaration
+
+    def __repr__(self) -> str:
+        return f"<Port {self.declaration}>"
@@ -5,13 +5,24 @@ Generates reports mapping RDL fields to flattened signal names,
 including addresses, widths, and access properties.
 """
 
-from typing import TYPE_CHECKING, List, Optional
+import itertools
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
-from systemrdl.node import FieldNode, SignalNode
-from systemrdl.walker import RDLListener, RDLWalker
+from systemrdl.node import (
+    AddressableNode,
+    AddrmapNode,
+    FieldNode,
+    MemNode,
+    Node,
+    RegfileNode,
+    RegNode,
+    SignalNode,
+)
+from systemrdl.walker import RDLListener, WalkerAction
 
-from .utils import IndexedPath
+from .utils import IndexedPath, is_external_for_codegen
 
 if TYPE_CHECKING:
     from .exporter import RegblockExporter
@@ -146,6 +157,124 @@ class SignalCollector(RDLListener):
         )
 
 
+def _access_str(node: Node, prop: str) -> Optional[str]:
+    access = node.get_property(prop, default=None)
+    if access is None:
+        return None
+    return access.name
+
+
+def _reset_value(node: FieldNode) -> Optional[int]:
+    reset = node.get_property("reset", default=None)
+    if isinstance(reset, int):
+        return reset
+    return None
+
+
+class AddressIndexCollector(RDLListener):
+    """
+    Walks the design and collects every software-addressable register and
+    external block, together with the address of each of its array elements.
+    """
+
+    def __init__(self, generator: "HwifReportGenerator"):
+        self.ds = generator.ds
+        # Records of the collected registers and blocks
+        self.nodes: List[Dict[str, Any]] = []
+        # id(node.inst) -> index into nodes
+        self.node_index: Dict[int, int] = {}
+        # id(field.inst) -> (node index, field index)
+        self.field_index: Dict[int, Tuple[int, int]] = {}
+        # (address, size, node index, array indexes) of every array element
+        self.address_index: List[Tuple[int, int, int, Tuple[int, ...]]] = []
+
+        # Base address and (dimensions, stride) of the arrays of the current
+        # addressable node and its ancestors
+        self._base_stack = [self.ds.top_node.raw_absolute_address]
+        self._array_stack: List[Tuple[List[int], int]] = []
+        super().__init__()
+
+    def enter_AddressableComponent(self, node: AddressableNode) -> None:
+        self._base_stack.append(self._base_stack[-1] + node.raw_address_offset)
+        if node.array_dimensions:
+            assert node.array_stride is not None
+            self._array_stack.append((node.array_dimensions, node.array_stride))
+
+    def exit_AddressableComponent(self, node: AddressableNode) -> None:
+        self._base_stack.pop()
+        if node.array_dimensions:
+            self._array_stack.pop()
+
+    def enter_Reg(self, node: RegNode) -> WalkerAction:
+        record = self._add_node(node, "reg")
+        record["external"] = is_external_for_codegen(node, self.ds)
+        fields: List[Dict[str, Any]] = []
+        for child in self.ds.design_ir.children(node):
+            if not isinstance(child, FieldNode):
+                continue
+            self.field_index[id(child.inst)] = (len(self.nodes) - 1, len(fields))
+            fields.append(
+                {
+                    "name": child.inst_name,
+                    "lsb": child.lsb,
+                    "msb": child.msb,
+                    "sw_access": _access_str(child, "sw"),
+                    "hw_access": _access_str(child, "hw"),
+                    "reset": _reset_value(child),
+                    "signals": [],
+                }
+            )
+        record["fields"] = fields
+        return WalkerAction.SkipDescendants
+
+    def enter_Regfile(self, node: RegfileNode) -> Optional[WalkerAction]:
+        if is_external_for_codegen(node, self.ds):
+            self._add_node(node, "regfile")
+            return WalkerAction.SkipDescendants
+        return None
+
+    def enter_Addrmap(self, node: AddrmapNode) -> Optional[WalkerAction]:
+        if is_external_for_codegen(node, self.ds):
+            self._add_node(node, "addrmap")
+            return WalkerAction.SkipDescendants
+        return None
+
+    def enter_Mem(self, node: MemNode) -> WalkerAction:
+        self._add_node(node, "mem")
+        return WalkerAction.SkipDescendants
+
+    def _add_node(self, node: AddressableNode, node_type: str) -> Dict[str, Any]:
+        idx = len(self.nodes)
+        self.node_index[id(node.inst)] = idx
+
+        # Weight of each array index, outermost first. Multi-dimensional
+        # arrays are laid out in row-major order.
+        weights = []
+        for dims, stride in self._array_stack:
+            for i in range(len(dims)):
+                weight = stride
+                for dim in dims[i + 1 :]:
+                    weight *= dim
+                weights.append(weight)
+        array_dims = [dim for dims, _ in self._array_stack for dim in dims]
+
+        base = self._base_stack[-1]
+        for indexes in itertools.product(*(range(dim) for dim in array_dims)):
+            address = base + sum(i * w for i, w in zip(indexes, weights))
+            self.address_index.append((address, node.size, idx, indexes))
+
+        record = {
+            "type": node_type,
+            "rdl_path": node.get_path(),
+            "address": base,
+            "size": node.size,
+            "array_dims": array_dims,
+            "signals": [],
+        }
+        self.nodes.append(record)
+        return record
+
+
 class HwifReportGenerator:
     """
     Generate hardware interface signal reports for flattened signals.
@@ -170,11 +299,11 @@ class HwifReportGenerator:
             Will generate:
             - {base}.rpt - Markdown format
             - {base}.csv - CSV format
+            - {base}.json - JSON format, with an address index
         """
         # Collect all signal metadata
         collector = SignalCollector(self)
-        walker = RDLWalker()
-        walker.walk(self.ds.top_node, collector, skip_top=True)
+        self.ds.design_ir.walk(self.ds.top_node, collector, skip_top=True)
 
         # Sort signals: inputs first, then outputs, then by name
         input_signals = sorted(
@@ -193,6 +322,10 @@ class HwifReportGenerator:
         csv_path = report_file_path.replace(".rpt", ".csv")
         self._generate_csv_report(csv_path, input_signals, output_signals)
 
+        # Generate JSON report
+        json_path = report_file_path.replace(".rpt", ".json")
+        self._generate_json_report(json_path)
+
     def _generate_markdown_report(
         self,
         output_file: str,
@@ -265,7 +398,7 @@ class HwifReportGenerator:
         lines.append("")
 
         # Write to file
-        with open(output_file, "w") as f:
+        with self.exp.output_files.open(output_file) as f:
             f.write("\n".join(lines))
 
     def _generate_csv_report(
@@ -297,6 +430,70 @@ class HwifReportGenerator:
             )
 
         # Write to file
-        with open(output_file, "w") as f:
+        with self.exp.output_files.open(output_file) as f:
             f.write("\n".join(lines))
             f.write("\n")  # Trailing newline
+
+    def _generate_json_report(self, output_file: str) -> None:
+        """
+        Generate JSON-formatted report.
+
+        Signals are taken from the hwif port list, so every port of the
+        module is listed exactly as declared. Each one refers to the register
+        or external block it belongs to, and the address index lists the
+        address of every array element of those, sorted for bisection.
+        """
+        collector = AddressIndexCollector(self)
+        self.ds.design_ir.walk(self.ds.top_node, collector, skip_top=True)
+        nodes = collector.nodes
+
+        signals: List[Dict[str, Any]] = []
+        for port in self.hwif.ports:
+            node = port.node
+            node_idx: Optional[int] = None
+            field: Optional[Dict[str, Any]] = None
+            if isinstance(node, FieldNode):
+                node_idx, field_idx = collector.field_index.get(
+                    id(node.inst), (None, None)
+                )
+                if node_idx is not None and field_idx is not None:
+                    field = nodes[node_idx]["fields"][field_idx]
+            elif node is not None:
+                node_idx = collector.node_index.get(id(node.inst))
+
+            sig_idx = len(signals)
+            if field is not None:
+                field["signals"].append(sig_idx)
+            elif node_idx is not None:
+                nodes[node_idx]["signals"].append(sig_idx)
+
+            signals.append(
+                {
+                    "name": port.name,
+                    "direction": port.direction,
+                    "width": port.width,
+                    "array_dims": list(port.array_dims),
+                    "rdl_path": node.get_path() if node is not None else None,
+                    "node": node_idx,
+                    "address": (
+                        nodes[node_idx]["address"] if node_idx is not None else None
+                    ),
+                    "sw_access": field["sw_access"] if field is not None else None,
+                    "hw_access": field["hw_access"] if field is not None else None,
+                    "reset": field["reset"] if field is not None else None,
+                }
+            )
+
+        address_index = sorted(collector.address_index)
+
+        report = {
+            "module_name": self.ds.module_name,
+            "top": self.ds.top_node.inst_name,
+            "signals": signals,
+            "nodes": nodes,
+            "address_index": [list(entry) for entry in address_index],
+        }
+
+        with self.exp.output_files.open(output_file) as f:
+            json.dump(report, f, separators=(",", ":"))
+            f.write("\n")
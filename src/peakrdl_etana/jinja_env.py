@@ -0,0 +1,81 @@
+"""
+Process-wide Jinja environments.
+
+Templates are compiled at most once per process, and the compiled bytecode
+is kept in Jinja's on-disk bytecode cache so that later invocations skip
+parsing altogether. Cache entries are validated against a checksum of the
+template source, so edited templates are always recompiled.
+"""
+
+import os
+from typing import Dict, Optional
+
+import jinja2 as jj
+
+_jj_env: Optional[jj.Environment] = None
+_cpuif_jj_env: Optional[jj.Environment] = None
+
+# Template directory of each CPUIF class -> its prefix in the CPUIF environment
+_cpuif_prefixes: Dict[str, str] = {}
+_cpuif_loaders: Dict[str, jj.BaseLoader] = {}
+
+
+def _get_bytecode_cache() -> Optional[jj.BytecodeCache]:
+    if os.environ.get("PEAKRDL_ETANA_NO_BYTECODE_CACHE"):
+        return None
+    try:
+        return jj.FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        # No usable temporary directory. Templates are still cached in memory.
+        return None
+
+
+def get_jj_env() -> jj.Environment:
+    """
+    Returns the environment used for all of the exporter's own templates
+    """
+    global _jj_env  # pylint: disable=global-statement
+    if _jj_env is None:
+        loader = jj.ChoiceLoader(
+            [
+                jj.FileSystemLoader(os.path.dirname(__file__)),
+                jj.PrefixLoader(
+                    {
+                        "base": jj.FileSystemLoader(os.path.dirname(__file__)),
+                    },
+                    delimiter=":",
+                ),
+            ]
+        )
+
+        _jj_env = jj.Environment(
+            loader=loader,
+            undefined=jj.StrictUndefined,
+            bytecode_cache=_get_bytecode_cache(),
+        )
+    return _jj_env
+
+
+def get_cpuif_template(class_dir: str, template_path: str) -> jj.Template:
+    """
+    Returns a CPUIF template, relative to the directory of the CPUIF class
+    that defines it.
+
+    All CPUIF classes, including those provided by plugins, share one
+    environment. Each class directory gets its own prefix.
+    """
+    global _cpuif_jj_env  # pylint: disable=global-statement
+    if _cpuif_jj_env is None:
+        _cpuif_jj_env = jj.Environment(
+            loader=jj.PrefixLoader(_cpuif_loaders),
+            undefined=jj.StrictUndefined,
+            bytecode_cache=_get_bytecode_cache(),
+        )
+
+    prefix = _cpuif_prefixes.get(class_dir)
+    if prefix is None:
+        prefix = f"cpuif{len(_cpuif_prefixes)}"
+        _cpuif_prefixes[class_dir] = prefix
+        _cpuif_loaders[prefix] = jj.FileSystemLoader(class_dir)
+
+    return _cpuif_jj_env.get_template(f"{prefix}/{template_path}")
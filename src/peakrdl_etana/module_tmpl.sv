@@ -71,12 +71,17 @@ module {{ds.module_name}}
         end
     end
 {%- endif %}
+{%- if ds.retime_decode %}
+    {%- set external_busy = "external_pending | external_req" %}
+{%- else %}
+    {%- set external_busy = "external_pending" %}
+{%- endif %}
 {% if ds.min_read_latency == ds.min_write_latency %}
     // Read & write latencies are balanced. Stalls not required
     {%- if ds.has_external_addressable %}
     // except if external
-    assign cpuif_req_stall_rd = external_pending;
-    assign cpuif_req_stall_wr = external_pending;
+    assign cpuif_req_stall_rd = {{external_busy}};
+    assign cpuif_req_stall_wr = {{external_busy}};
     {%- else %}
     assign cpuif_req_stall_rd = '0;
     assign cpuif_req_stall_wr = '0;
@@ -94,8 +99,8 @@ module {{ds.module_name}}
         end
     end
     {%- if ds.has_external_addressable %}
-    assign cpuif_req_stall_rd = external_pending;
-    assign cpuif_req_stall_wr = cpuif_req_stall_sr[0] | external_pending;
+    assign cpuif_req_stall_rd = {{external_busy}};
+    assign cpuif_req_stall_wr = cpuif_req_stall_sr[0] | {{external_busy}};
     {%- else %}
     assign cpuif_req_stall_rd = '0;
     assign cpuif_req_stall_wr = cpuif_req_stall_sr[0];
@@ -113,8 +118,8 @@ module {{ds.module_name}}
         end
     end
     {%- if ds.has_external_addressable %}
-    assign cpuif_req_stall_rd = cpuif_req_stall_sr[0] | external_pending;
-    assign cpuif_req_stall_wr = external_pending;
+    assign cpuif_req_stall_rd = cpuif_req_stall_sr[0] | {{external_busy}};
+    assign cpuif_req_stall_wr = {{external_busy}};
     {%- else %}
     assign cpuif_req_stall_rd = cpuif_req_stall_sr[0];
     assign cpuif_req_stall_wr = '0;
@@ -127,14 +132,20 @@ module {{ds.module_name}}
     //--------------------------------------------------------------------------
     // Address Decode
     //--------------------------------------------------------------------------
-    {{address_decode.get_strobe_logic()|indent}}
+    {% for chunk in sections.decode_strobes.indent() %}{{chunk}}{% endfor %}
 {%- if ds.has_external_addressable %}
     logic decoded_strb_is_external;
+    {%- if ds.retime_decode %}
+    logic next_decoded_strb_is_external;
+    {%- endif %}
 {% endif %}
 {%- if ds.err_if_bad_addr or ds.err_if_bad_rw %}
     logic decoded_err;
+    {%- if ds.retime_decode %}
+    logic next_decoded_err;
+    {%- endif %}
 {% endif %}
-{%- if ds.has_external_block %}
+{%- if ds.has_external_block or ds.retime_decode %}
     logic [{{cpuif.addr_width-1}}:0] decoded_addr;
 {% endif %}
     logic decoded_req;
@@ -168,22 +179,67 @@ module {{ds.module_name}}
         is_valid_rw = '0;
         {%- endif %}
     {%- endif %}
-        {{address_decode.get_implementation()|indent(8)}}
+        {% for chunk in sections.address_decode.indent(8) %}{{chunk}}{% endfor %}
     {%- if ds.has_external_addressable %}
+        {%- if ds.retime_decode %}
+        next_decoded_strb_is_external = is_external;
+        {%- else %}
         decoded_strb_is_external = is_external;
         external_req = is_external;
+        {%- endif %}
     {%- endif %}
     {%- if ds.err_if_bad_addr or ds.err_if_bad_rw %}
+        {%- if ds.retime_decode %}
+            {%- set err_lhs = "next_decoded_err" %}
+            {%- set err_req = "cpuif_req_masked" %}
+        {%- else %}
+            {%- set err_lhs = "decoded_err" %}
+            {%- set err_req = "decoded_req" %}
+        {%- endif %}
         {%- if ds.err_if_bad_addr and ds.err_if_bad_rw %}
-        decoded_err = (~is_valid_addr | (is_valid_addr & ~is_valid_rw)) & decoded_req;
+        {{err_lhs}} = (~is_valid_addr | (is_valid_addr & ~is_valid_rw)) & {{err_req}};
         {%- elif ds.err_if_bad_addr %}
-        decoded_err = ~is_valid_addr & decoded_req;
+        {{err_lhs}} = ~is_valid_addr & {{err_req}};
         {%- elif ds.err_if_bad_rw %}
-        decoded_err = (is_valid_addr & ~is_valid_rw) & decoded_req;
+        {{err_lhs}} = (is_valid_addr & ~is_valid_rw) & {{err_req}};
         {%- endif %}
     {%- endif %}
     end
-
+{% if ds.retime_decode %}
+    // Decode stage registers
+    always_ff {{get_always_ff_event(cpuif.reset)}} begin
+        if({{get_resetsignal(cpuif.reset)}}) begin
+            decoded_req <= '0;
+            decoded_req_is_wr <= '0;
+            decoded_addr <= '0;
+            decoded_wr_data <= '0;
+            decoded_wr_biten <= '0;
+        {%- if ds.has_external_addressable %}
+            decoded_strb_is_external <= '0;
+        {%- endif %}
+        {%- if ds.err_if_bad_addr or ds.err_if_bad_rw %}
+            decoded_err <= '0;
+        {%- endif %}
+            {{address_decode.get_retimed_strobe_reset()|indent(12)}}
+        end else begin
+            decoded_req <= cpuif_req_masked;
+            decoded_req_is_wr <= cpuif_req_is_wr;
+            decoded_addr <= cpuif_addr;
+            decoded_wr_data <= cpuif_wr_data;
+            decoded_wr_biten <= cpuif_wr_biten;
+        {%- if ds.has_external_addressable %}
+            decoded_strb_is_external <= next_decoded_strb_is_external;
+        {%- endif %}
+        {%- if ds.err_if_bad_addr or ds.err_if_bad_rw %}
+            decoded_err <= next_decoded_err;
+        {%- endif %}
+            {{address_decode.get_retimed_strobe_update()|indent(12)}}
+        end
+    end
+{%- if ds.has_external_addressable %}
+    assign external_req = decoded_strb_is_external;
+{%- endif %}
+{% else %}
     // Pass down signals to next stage
 {%- if ds.has_external_block %}
     assign decoded_addr = cpuif_addr;
@@ -192,6 +248,7 @@ module {{ds.module_name}}
     assign decoded_req_is_wr = cpuif_req_is_wr;
     assign decoded_wr_data = cpuif_wr_data;
     assign decoded_wr_biten = cpuif_wr_biten;
+{%- endif %}
 {% if ds.has_writable_msb0_fields %}
     // bitswap for use by fields with msb0 ordering
     logic [{{cpuif.data_width-1}}:0] decoded_wr_data_bswap;
@@ -209,25 +266,25 @@ module {{ds.module_name}}
     //--------------------------------------------------------------------------
     // Field storage declarations
     //--------------------------------------------------------------------------
-    {{field_logic.get_declarations()|indent}}
+    {% for chunk in sections.field_declarations.indent() %}{{chunk}}{% endfor %}
 
 {%- if ds.has_buffered_write_regs %}
 
     //--------------------------------------------------------------------------
     // Write double-buffers
     //--------------------------------------------------------------------------
-    {{write_buffering.get_implementation()|indent}}
+    {% for chunk in sections.write_buffering.indent() %}{{chunk}}{% endfor %}
 {%- endif %}
     //--------------------------------------------------------------------------
     // Field logic
     //--------------------------------------------------------------------------
-    {{field_logic.get_implementation()|indent}}
+    {% for chunk in sections.field_logic.indent() %}{{chunk}}{% endfor %}
 
-{%- if ext_mem_req_value.has_req_value_mems() %}
+{%- if ext.has_req_value_mems() %}
     //--------------------------------------------------------------------------
     // External mem inflight_value (err_support): flopped request-pending per mem
     //--------------------------------------------------------------------------
-{{ext_mem_req_value.get_implementation()|indent}}
+{{ext.mem_req_value|indent}}
 {%- endif %}
 
 {%- if ds.has_paritycheck %}
@@ -253,17 +310,17 @@ module {{ds.module_name}}
     // Read double-buffers
     //--------------------------------------------------------------------------
 
-    {{read_buffering.get_implementation()|indent}}
+    {% for chunk in sections.read_buffering.indent() %}{{chunk}}{% endfor %}
 {%- endif %}
 
     //--------------------------------------------------------------------------
     // Write response
     //--------------------------------------------------------------------------
-{%- if ext_write_acks.has_external_write() %}
+{%- if ext.has_external_write() %}
     always @(*) begin
         logic wr_ack;
         wr_ack = '0;
-        {{ext_write_acks.get_implementation()|indent(8)}}
+        {{ext.write_ack|indent(8)}}
         external_wr_ack = wr_ack;
     end
     assign cpuif_wr_ack = external_wr_ack | (decoded_req & decoded_req_is_wr & ~decoded_strb_is_external);
@@ -274,12 +331,12 @@ module {{ds.module_name}}
     assign cpuif_wr_ack = decoded_req & decoded_req_is_wr;
 {%- endif %}
     // Write error: decoded (bad addr/rw) or external mem wr_err from err_support
-{%- if ext_write_err.has_external_write_err() %}
+{%- if ext.has_external_write_err() %}
     logic external_wr_err;
     always @(*) begin
         logic wr_err;
         wr_err = '0;
-        {{ext_write_err.get_implementation()|indent(8)}}
+        {{ext.write_err|indent(8)}}
         external_wr_err = wr_err;
     end
     {%- if ds.err_if_bad_addr or ds.err_if_bad_rw %}
@@ -297,12 +354,12 @@ module {{ds.module_name}}
 // Readback
 //--------------------------------------------------------------------------
     logic readback_external_rd_ack;
-{%- if ext_read_acks.has_external_read() %}
+{%- if ext.has_external_read() %}
     logic readback_external_rd_ack_c;
     always @(*) begin
         logic rd_ack;
         rd_ack = '0;
-        {{ext_read_acks.get_implementation()|indent(8)}}
+        {{ext.read_ack|indent(8)}}
         readback_external_rd_ack_c = rd_ack;
     end
 
@@ -324,11 +381,11 @@ module {{ds.module_name}}
 {%- endif %}
 
     logic readback_external_rd_err;
-{%- if ext_read_err.has_external_read_err() %}
+{%- if ext.has_external_read_err() %}
     always @(*) begin
         logic rd_err;
         rd_err = '0;
-        {{ext_read_err.get_implementation()|indent(8)}}
+        {{ext.read_err|indent(8)}}
         readback_external_rd_err = rd_err;
     end
 {%- else %}
@@ -345,10 +402,19 @@ module {{ds.module_name}}
         if({{get_resetsignal(cpuif.reset)}}) begin
             pending_rd_addr <= '0;
         end else begin
+{%- if ds.retime_decode %}
+            if(decoded_req) pending_rd_addr <= decoded_addr;
+        end
+    end
+    assign rd_mux_addr = decoded_req ? decoded_addr : pending_rd_addr;
+{%- else %}
             if(decoded_req) pending_rd_addr <= cpuif_addr;
         end
     end
     assign rd_mux_addr = decoded_req ? cpuif_addr : pending_rd_addr;
+{%- endif %}
+{%- elif ds.retime_decode %}
+    assign rd_mux_addr = decoded_addr;
 {%- else %}
     assign rd_mux_addr = cpuif_addr;
 {%- endif %}
@@ -356,7 +422,7 @@ module {{ds.module_name}}
     logic readback_err;
     logic readback_done;
     logic [{{cpuif.data_width-1}}:0] readback_data;
-{{readback_implementation|indent}}
+{% for chunk in sections.readback.indent() %}{{chunk}}{% endfor %}
 {% if ds.retime_read_response %}
     always_ff {{get_always_ff_event(cpuif.reset)}} begin
         if({{get_resetsignal(cpuif.reset)}}) begin
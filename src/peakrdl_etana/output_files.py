@@ -0,0 +1,87 @@
+"""
+Writing of the exporter's output files.
+
+In write-if-changed mode, each file is first written next to its
+destination and only moved into place if its content differs from the
+existing file. Unchanged files keep their timestamps, so make-based flows do
+not rebuild everything that depends on them.
+"""
+
+import contextlib
+import hashlib
+import os
+import shutil
+from typing import Iterator, List, TextIO
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def same_content(path_a: str, path_b: str) -> bool:
+    """
+    Returns True if both files have the same content
+    """
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    return _file_hash(path_a) == _file_hash(path_b)
+
+
+class OutputFiles:
+    """
+    Opens output files for writing and keeps track of which ones were
+    actually replaced.
+
+    Parameters
+    ----------
+    write_if_changed: bool
+        Leave existing files untouched if their content would not change.
+    """
+
+    def __init__(self, write_if_changed: bool = False) -> None:
+        self.write_if_changed = write_if_changed
+        # Paths of files that were written
+        self.written: List[str] = []
+        # Paths of existing files that were left untouched
+        self.unchanged: List[str] = []
+
+    @contextlib.contextmanager
+    def open(self, path: str) -> Iterator[TextIO]:
+        """
+        Context manager that opens the output file at path for writing
+        """
+        if not (self.write_if_changed and os.path.exists(path)):
+            try:
+                with open(path, "w") as f:
+                    yield f
+            except BaseException:
+                # Sections are generated while the file is written, so an
+                # error can leave it incomplete
+                os.remove(path)
+                raise
+            self.written.append(path)
+            return
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                yield f
+            if same_content(tmp_path, path):
+                self.unchanged.append(path)
+            else:
+                shutil.copymode(path, tmp_path)
+                os.replace(tmp_path, path)
+                self.written.append(path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.written)} files written, "
+            f"{len(self.unchanged)} unchanged files left untouched"
+        )
@@ -0,0 +1,209 @@
+"""
+Per-phase instrumentation of an export.
+
+An :class:`ExportProfiler` records the wall time, call count and, optionally,
+the peak memory of each phase of an export (design scan, validation, each
+rendered section, each for-loop generator class, template streaming, ...).
+It can also run the whole export under :mod:`cProfile` and dump the
+statistics to a pstats file.
+"""
+
+import contextlib
+import cProfile
+import os
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class PhaseStats:
+    """
+    Accumulated measurements of one phase
+    """
+
+    __slots__ = ("name", "calls", "time", "peak_memory")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        # Total wall time in seconds. Nested calls of the same phase are only
+        # counted once.
+        self.time = 0.0
+        # Largest increase of traced memory above the amount in use when the
+        # phase was entered, in bytes. None if memory was not traced.
+        self.peak_memory: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "time": self.time,
+            "peak_memory": self.peak_memory,
+        }
+
+
+class _MemoryFrame:
+    __slots__ = ("start", "peak")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.peak = start
+
+
+class ExportProfiler:
+    """
+    Collects per-phase statistics of an export.
+
+    Parameters
+    ----------
+    trace_memory: bool
+        Measure the peak memory of each phase using :mod:`tracemalloc`. This
+        slows down the export considerably, which also inflates the recorded
+        times. Requires Python 3.9 or later.
+    profile_dir: str
+        If set, the export is run under :mod:`cProfile` and the statistics
+        are written to ``<module_name>.pstats`` in this directory, for
+        inspection with :mod:`pstats` or tools such as snakeviz.
+    """
+
+    def __init__(
+        self, trace_memory: bool = False, profile_dir: Optional[str] = None
+    ) -> None:
+        self.trace_memory = trace_memory and hasattr(tracemalloc, "reset_peak")
+        self.profile_dir = profile_dir
+        # Path of the pstats file written by the most recent export
+        self.profile_path: Optional[str] = None
+        self.phases: Dict[str, PhaseStats] = {}
+        self.total_time = 0.0
+        # Highest traced memory during the export, in bytes. Phases reset the
+        # tracemalloc peak, so anyone else tracing the export must use this
+        # instead. None if memory was not traced.
+        self.peak_memory: Optional[int] = None
+
+        self._active: Dict[str, int] = {}
+        self._memory_stack: List[_MemoryFrame] = []
+        self._started_tracemalloc = False
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._t_start = 0.0
+
+    def start(self) -> None:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.profile_dir is not None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._t_start = time.perf_counter()
+
+    def stop(self, name: str) -> None:
+        """
+        Stop profiling the export of the module with the given name
+        """
+        self.total_time += time.perf_counter() - self._t_start
+        if self.trace_memory and tracemalloc.is_tracing():
+            self._record_peak(tracemalloc.get_traced_memory()[1])
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            assert self.profile_dir is not None
+            os.makedirs(self.profile_dir, exist_ok=True)
+            self.profile_path = os.path.join(self.profile_dir, f"{name}.pstats")
+            self._cprofile.dump_stats(self.profile_path)
+            self._cprofile = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _record_peak(self, peak: int) -> None:
+        if self.peak_memory is None or peak > self.peak_memory:
+            self.peak_memory = peak
+
+    def _enter_memory(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        if self._memory_stack:
+            outer = self._memory_stack[-1]
+            outer.peak = max(outer.peak, peak)
+        else:
+            self._record_peak(peak)
+        self._memory_stack.append(_MemoryFrame(current))
+        tracemalloc.reset_peak()
+
+    def _exit_memory(self, stats: PhaseStats) -> None:
+        frame = self._memory_stack.pop()
+        frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+        if self._memory_stack:
+            outer = self._memory_stack[-1]
+            outer.peak = max(outer.peak, frame.peak)
+        else:
+            self._record_peak(frame.peak)
+        tracemalloc.reset_peak()
+
+        used = frame.peak - frame.start
+        if stats.peak_memory is None or used > stats.peak_memory:
+            stats.peak_memory = used
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Context manager that records one call of the named phase
+        """
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = PhaseStats(name)
+            self.phases[name] = stats
+        stats.calls += 1
+
+        outermost = self._active.get(name, 0) == 0
+        self._active[name] = self._active.get(name, 0) + 1
+        trace = self.trace_memory and tracemalloc.is_tracing()
+        if trace:
+            self._enter_memory()
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            if outermost:
+                stats.time += time.perf_counter() - t
+            if trace:
+                self._exit_memory(stats)
+            self._active[name] -= 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the recorded statistics as a JSON-serializable dictionary
+        """
+        return {
+            "total_time": self.total_time,
+            "phases": {name: stats.to_dict() for name, stats in self.phases.items()},
+        }
+
+    def report(self) -> str:
+        """
+        Returns the recorded statistics as a human-readable table
+        """
+        width = max([len("phase")] + [len(name) for name in self.phases])
+        lines = [f"{'phase':<{width}}  {'calls':>6}  {'time (s)':>9}  {'%':>6}"]
+        if self.trace_memory:
+            lines[0] += f"  {'peak (MiB)':>10}"
+        for stats in self.phases.values():
+            share = stats.time / self.total_time * 100 if self.total_time else 0.0
+            line = f"{stats.name:<{width}}  {stats.calls:>6}  {stats.time:>9.3f}  {share:>6.1f}"
+            if self.trace_memory:
+                if stats.peak_memory is None:
+                    line += f"  {'-':>10}"
+                else:
+                    line += f"  {stats.peak_memory / 2**20:>10.2f}"
+            lines.append(line)
+        lines.append(f"{'total':<{width}}  {'':>6}  {self.total_time:>9.3f}")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.report()
+
+
+def profile_phase(profiler: Optional[ExportProfiler], name: str) -> Any:
+    """
+    Returns a context manager that records the named phase if profiling is
+    enabled, and does nothing otherwise
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name)
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Union, Optional, Dict
 
 from systemrdl.node import AddrmapNode, RegNode, SignalNode, FieldNode
 
@@ -23,11 +23,20 @@ class ReadBuffering:
         assert s is not None
         return s
 
-    def get_rbuf_data(self, node: Union[RegNode, FieldNode]) -> str:
-        """Get the name of the read buffer storage signal for a register."""
+    def get_rbuf_data(
+        self,
+        node: Union[RegNode, FieldNode],
+        index_exprs: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Get the name of the read buffer storage signal for a register.
+
+        index_exprs maps loop iterators to the expressions that index the
+        register's array dimensions instead.
+        """
         if isinstance(node, FieldNode):
             node = node.parent
         p = IndexedPath(self.top_node, node)
+        p.replace_index(index_exprs)
         rbuf_data = f"rbuf_storage_{p.path}"
         if not 0 == len(p.index):
             rbuf_data += f"{p.index_str}"
@@ -2,10 +2,11 @@ from typing import TYPE_CHECKING
 
 from .readback_mux_generator import (
     ReadbackMuxGenerator,
+    AndOrReadbackMuxGenerator,
     RetimedReadbackMuxGenerator,
     RetimedExtBlockReadbackMuxGenerator,
 )
-from ..utils import clog2
+from ..utils import clog2, roundup_pow2
 
 if TYPE_CHECKING:
     from ..exporter import RegblockExporter, DesignState
@@ -22,6 +23,8 @@ class Readback:
     def get_implementation(self) -> str:
         if self.ds.retime_read_fanin:
             return self.get_2stage_implementation()
+        elif self.ds.readback_style == "andor":
+            return self.get_andor_implementation()
         else:
             return self.get_1stage_implementation()
 
@@ -54,6 +57,28 @@ class Readback:
         template = self.exp.jj_env.get_template("readback/templates/readback_no_rt.sv")
         return template.render(context)
 
+    def get_andor_implementation(self) -> str:
+        """
+        Implements readback without any retiming, as an AND-OR of one-hot
+        selected terms
+        """
+        gen = AndOrReadbackMuxGenerator(self.exp)
+        mux_impl = gen.get_content(self.ds.top_node)
+
+        if not mux_impl:
+            # Design has no readable registers.
+            return self.get_empty_implementation()
+
+        context = {
+            "readback_mux": mux_impl,
+            "n_terms": gen.n_terms,
+            "n_leaves": roundup_pow2(gen.n_terms),
+            "cpuif": self.exp.cpuif,
+            "ds": self.ds,
+        }
+        template = self.exp.jj_env.get_template("readback/templates/readback_andor.sv")
+        return template.render(context)
+
     def get_2stage_implementation(self) -> str:
         """
         Implements readback that is retimed to 2 stages
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, List, Sequence, Optional
+from typing import TYPE_CHECKING, Dict, List, Sequence, Optional, Tuple
 
 from systemrdl.node import (
     RegNode,
@@ -10,7 +10,7 @@ from systemrdl.node import (
 )
 from systemrdl.walker import WalkerAction
 
-from ..forloop_generator import RDLForLoopGenerator
+from ..forloop_generator import RDLForLoopGenerator, LoopBody
 from ..sv_int import SVInt
 from ..utils import do_bitswap, do_slice, has_sw_readable_descendants
 
@@ -19,12 +19,24 @@ if TYPE_CHECKING:
 
 
 class ReadbackMuxGenerator(RDLForLoopGenerator):
+    # Read register arrays whose indexes are address bit slices with a direct
+    # indexed select instead of a loop over every element
+    index_arrays = True
+
     def __init__(self, exp: "RegblockExporter") -> None:
         super().__init__()
         self.exp = exp
 
         # List of address strides for each dimension
         self._array_stride_stack: List[int] = []
+        # Size of each dimension in _array_stride_stack
+        self._array_dim_stack: List[int] = []
+
+        # Register array that is currently read by index, and the rd_mux_addr
+        # slice that indexes each of its array dimensions in place of a loop
+        # iterator
+        self._indexed_reg: Optional[RegNode] = None
+        self._index_exprs: Dict[str, str] = {}
 
     @property
     def ds(self) -> "DesignState":
@@ -33,8 +45,6 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
     def enter_AddressableComponent(
         self, node: AddressableNode
     ) -> Optional[WalkerAction]:
-        super().enter_AddressableComponent(node)
-
         if node.array_dimensions:
             assert node.array_stride is not None
             # Collect strides for each array dimension
@@ -45,6 +55,13 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
                 current_stride *= dim
             strides.reverse()
             self._array_stride_stack.extend(strides)
+            self._array_dim_stack.extend(node.array_dimensions)
+
+        if isinstance(node, RegNode) and node.array_dimensions and self.index_arrays:
+            self._start_indexed_reg(node)
+
+        if self._indexed_reg is None:
+            super().enter_AddressableComponent(node)
 
         if node.external and not isinstance(node, RegNode):
             # External blocks only participate in readback if they are SW-readable.
@@ -53,7 +70,7 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
                 return WalkerAction.SkipDescendants
             if isinstance(
                 node, (RegfileNode, AddrmapNode)
-            ) and not has_sw_readable_descendants(node):
+            ) and not has_sw_readable_descendants(node, self.exp.ds):
                 return WalkerAction.SkipDescendants
             # Is an external block
             self.process_external_block(node)
@@ -73,17 +90,13 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
         else:
             cond = f"(rd_mux_addr >= {addr_lo}) && (rd_mux_addr <= {addr_hi})"
 
-        self.add_content(f"if({cond}) begin")
         data = self.exp.hwif.get_external_rd_data(node, True)
-        self.add_content(f"    readback_data_var = {data};")
-        self.add_content("end")
+        self.add_readback_entry(cond, [f"readback_data_var = {data};"])
 
     def enter_Reg(self, node: RegNode) -> WalkerAction:
-        # systemrdl-compiler API compatibility: some versions do not support
-        # RegNode.fields(sw_readable_only=...). Filter manually.
-        fields = [f for f in node.fields() if f.is_sw_readable]
-        # Ensure deterministic field order (ascending low bit)
-        fields.sort(key=lambda f: f.low)
+        # sw-readable fields, in ascending low bit order
+        reg_fields = self.exp.ds.design_ir.get_reg_fields(node)
+        fields = reg_fields.readable_fields
         if not fields:
             # Reg has no readable fields
             return WalkerAction.SkipDescendants
@@ -92,9 +105,9 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
             self.process_external_reg(node)
             return WalkerAction.SkipDescendants
 
-        accesswidth = node.get_property("accesswidth")
-        regwidth = node.get_property("regwidth")
-        rbuf = node.get_property("buffer_reads")
+        accesswidth = reg_fields.accesswidth
+        regwidth = reg_fields.regwidth
+        rbuf = reg_fields.buffer_reads
 
         if rbuf:
             trigger = node.get_property("rbuffer_trigger")
@@ -136,45 +149,56 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
     def get_readback_data_var(self, addr: str) -> str:
         return "readback_data_var"
 
+    def add_readback_entry(self, conditional: str, assignments: List[str]) -> None:
+        """
+        Add the assignments of readback data that apply when conditional is true
+        """
+        self.add_content(f"if({conditional}) begin")
+        for assignment in assignments:
+            self.add_content("    " + assignment)
+        self.add_content("end")
+
     def process_external_reg(self, node: RegNode) -> None:
-        accesswidth = node.get_property("accesswidth")
-        regwidth = node.get_property("regwidth")
+        reg_fields = self.exp.ds.design_ir.get_reg_fields(node)
+        accesswidth = reg_fields.accesswidth
+        regwidth = reg_fields.regwidth
         # External register readback semantics differ depending on whether the
         # register has one sw-readable field or multiple.
         #
         # - Single-field external regs use register-level rd_data (no field suffix)
         # - Multi-field external regs use per-field rd_data signals which must be
         #   reassembled into a full readback word.
-        readable_fields = [f for f in node.fields() if f.is_sw_readable]
-        readable_fields.sort(key=lambda f: f.low)
-        data = self.exp.hwif.get_external_rd_data(node, True)
+        readable_fields = reg_fields.readable_fields
+        data = self.exp.hwif.get_external_rd_data(node, True, self._index_exprs)
 
         if regwidth > accesswidth:
             # Is wide reg.
             # The retiming scheme requires singular address comparisons rather than
             # ranges. To support this, unroll the subwords
-            n_subwords = regwidth // accesswidth
+            n_subwords = reg_fields.n_subwords
             subword_stride = accesswidth // 8
             for subword_idx in range(n_subwords):
                 addr = self._get_address_str(
                     node, subword_offset=subword_idx * subword_stride
                 )
-                conditional = self.get_addr_compare_conditional(addr)
+                conditional = self.get_reg_conditional(
+                    node, subword_offset=subword_idx * subword_stride
+                )
                 var = self.get_readback_data_var(addr)
-                self.add_content(f"if({conditional}) begin")
-                self.add_content(f"    {var} = {data};")
-                self.add_content("end")
+                self.add_readback_entry(conditional, [f"{var} = {data};"])
         else:
             addr = self._get_address_str(node)
-            conditional = self.get_addr_compare_conditional(addr)
+            conditional = self.get_reg_conditional(node)
             var = self.get_readback_data_var(addr)
-            self.add_content(f"if({conditional}) begin")
+            assignments = []
             if len(readable_fields) > 1:
                 # Reassemble multi-field external register using per-field rd_data signals
                 for field in readable_fields:
                     # External per-field rd_data is right-aligned (LSBs), not placed
                     # at the field's absolute bit position.
-                    value = self.exp.hwif.get_external_rd_data(field, True)
+                    value = self.exp.hwif.get_external_rd_data(
+                        field, True, self._index_exprs
+                    )
                     value = (
                         do_slice(value, field.width - 1, 0)
                         if field.width > 1
@@ -183,38 +207,39 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
                     if field.msb < field.lsb:
                         value = do_bitswap(value, field.width)
                     if field.width == 1:
-                        self.add_content(f"    {var}[{field.low}] = {value};")
+                        assignments.append(f"{var}[{field.low}] = {value};")
                     else:
-                        self.add_content(
-                            f"    {var}[{field.high}:{field.low}] = {value};"
+                        assignments.append(
+                            f"{var}[{field.high}:{field.low}] = {value};"
                         )
             elif regwidth < self.exp.cpuif.data_width:
-                self.add_content(f"    {var}[{regwidth-1}:0] = {data};")
+                assignments.append(f"{var}[{regwidth-1}:0] = {data};")
             else:
-                self.add_content(f"    {var} = {data};")
-            self.add_content("end")
+                assignments.append(f"{var} = {data};")
+            self.add_readback_entry(conditional, assignments)
 
     def process_reg(self, node: RegNode, fields: Sequence[FieldNode]) -> None:
         """
         Process a regular register
         """
         addr = self._get_address_str(node)
-        conditional = self.get_addr_compare_conditional(addr)
+        conditional = self.get_reg_conditional(node)
         var = self.get_readback_data_var(addr)
-        self.add_content(f"if({conditional}) begin")
-
+        assignments = []
         for field in fields:
-            value = self.exp.dereferencer.get_value(field)
+            value = self.exp.dereferencer.get_value(
+                field, index_exprs=self._index_exprs
+            )
             if field.msb < field.lsb:
                 # Field gets bitswapped since it is in [low:high] orientation
                 value = do_bitswap(value, field.width)
 
             if field.width == 1:
-                self.add_content(f"    {var}[{field.low}] = {value};")
+                assignments.append(f"{var}[{field.low}] = {value};")
             else:
-                self.add_content(f"    {var}[{field.high}:{field.low}] = {value};")
+                assignments.append(f"{var}[{field.high}:{field.low}] = {value};")
 
-        self.add_content("end")
+        self.add_readback_entry(conditional, assignments)
 
     def process_buffered_reg(
         self, node: RegNode, regwidth: int, accesswidth: int
@@ -222,7 +247,7 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
         """
         Process a register which is fully buffered
         """
-        rbuf = self.exp.read_buffering.get_rbuf_data(node)
+        rbuf = self.exp.read_buffering.get_rbuf_data(node, self._index_exprs)
 
         if accesswidth < regwidth:
             # Is wide reg
@@ -232,22 +257,20 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
                 addr = self._get_address_str(
                     node, subword_offset=subword_idx * subword_stride
                 )
-                conditional = self.get_addr_compare_conditional(addr)
+                conditional = self.get_reg_conditional(
+                    node, subword_offset=subword_idx * subword_stride
+                )
                 var = self.get_readback_data_var(addr)
                 bslice = (
                     f"[{(subword_idx + 1) * accesswidth - 1}:{subword_idx*accesswidth}]"
                 )
-                self.add_content(f"if({conditional}) begin")
-                self.add_content(f"    {var} = {rbuf}{bslice};")
-                self.add_content("end")
+                self.add_readback_entry(conditional, [f"{var} = {rbuf}{bslice};"])
         else:
             # Is regular reg
             addr = self._get_address_str(node)
-            conditional = self.get_addr_compare_conditional(addr)
+            conditional = self.get_reg_conditional(node)
             var = self.get_readback_data_var(addr)
-            self.add_content(f"if({conditional}) begin")
-            self.add_content(f"    {var}[{regwidth-1}:0] = {rbuf};")
-            self.add_content("end")
+            self.add_readback_entry(conditional, [f"{var}[{regwidth-1}:0] = {rbuf};"])
 
     def process_wide_buffered_reg_with_bypass(
         self,
@@ -268,17 +291,13 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
             node, fields, regwidth, accesswidth
         )
         if subword_assignments[0]:
-            addr = self._get_address_str(node, subword_offset=0)
-            conditional = self.get_addr_compare_conditional(addr)
-            self.add_content(f"if({conditional}) begin")
-            for assignment in subword_assignments[0]:
-                self.add_content("    " + assignment)
-            self.add_content("end")
+            conditional = self.get_reg_conditional(node, subword_offset=0)
+            self.add_readback_entry(conditional, subword_assignments[0])
 
         # Assign remainder of subwords from read buffer
         n_subwords = regwidth // accesswidth
         subword_stride = accesswidth // 8
-        rbuf = self.exp.read_buffering.get_rbuf_data(node)
+        rbuf = self.exp.read_buffering.get_rbuf_data(node, self._index_exprs)
         for subword_idx in range(1, n_subwords):
             addr = self._get_address_str(
                 node, subword_offset=subword_idx * subword_stride
@@ -286,11 +305,11 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
             bslice = (
                 f"[{(subword_idx + 1) * accesswidth - 1}:{subword_idx*accesswidth}]"
             )
-            conditional = self.get_addr_compare_conditional(addr)
+            conditional = self.get_reg_conditional(
+                node, subword_offset=subword_idx * subword_stride
+            )
             var = self.get_readback_data_var(addr)
-            self.add_content(f"if({conditional}) begin")
-            self.add_content(f"    {var} = {rbuf}{bslice};")
-            self.add_content("end")
+            self.add_readback_entry(conditional, [f"{var} = {rbuf}{bslice};"])
 
     def get_wide_reg_subword_assignments(
         self,
@@ -318,7 +337,9 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
                 low = field.low - accesswidth * subword_idx
                 high = field.high - accesswidth * subword_idx
 
-                value = self.exp.dereferencer.get_value(field)
+                value = self.exp.dereferencer.get_value(
+                    field, index_exprs=self._index_exprs
+                )
                 if field.msb < field.lsb:
                     # Field gets bitswapped since it is in [low:high] orientation
                     value = do_bitswap(value, field.width)
@@ -361,13 +382,21 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
                         slice_width = f_high - f_low + 1
                         value = do_bitswap(
                             do_slice(
-                                self.exp.dereferencer.get_value(field), f_high, f_low
+                                self.exp.dereferencer.get_value(
+                                    field, index_exprs=self._index_exprs
+                                ),
+                                f_high,
+                                f_low,
                             ),
                             slice_width,
                         )
                     else:
                         value = do_slice(
-                            self.exp.dereferencer.get_value(field), f_high, f_low
+                            self.exp.dereferencer.get_value(
+                                field, index_exprs=self._index_exprs
+                            ),
+                            f_high,
+                            f_low,
                         )
 
                     addr = self._get_address_str(
@@ -402,23 +431,157 @@ class ReadbackMuxGenerator(RDLForLoopGenerator):
         for subword_idx, assignments in enumerate(subword_assignments):
             if not assignments:
                 continue
-            addr = self._get_address_str(
+            conditional = self.get_reg_conditional(
                 node, subword_offset=subword_idx * subword_stride
             )
-            conditional = self.get_addr_compare_conditional(addr)
-            self.add_content(f"if({conditional}) begin")
-            for assignment in assignments:
-                self.add_content("    " + assignment)
-            self.add_content("end")
+            self.add_readback_entry(conditional, assignments)
 
     def exit_AddressableComponent(self, node: AddressableNode) -> None:
-        super().exit_AddressableComponent(node)
+        if self._indexed_reg is None:
+            super().exit_AddressableComponent(node)
+        elif node == self._indexed_reg:
+            # No loops were opened for the register
+            self._indexed_reg = None
+            self._index_exprs = {}
 
         if not node.array_dimensions:
             return
 
         for _ in node.array_dimensions:
             self._array_stride_stack.pop()
+            self._array_dim_stack.pop()
+
+    def _get_index_slices(
+        self, node: RegNode, subword_offset: int = 0
+    ) -> Optional[List[Optional[Tuple[int, int]]]]:
+        addr_decode = self.exp.address_decode
+        return addr_decode.get_index_slices(
+            addr_decode.get_top_scope(),
+            node.raw_absolute_address
+            - self.ds.top_node.raw_absolute_address
+            + subword_offset,
+            self._array_dim_stack,
+            self._array_stride_stack,
+        )
+
+    def _start_indexed_reg(self, node: RegNode) -> None:
+        """
+        Read the register array node by index if the address bits of all of
+        its array indexes, and of its parents' array indexes, are plain slices
+        of the address.
+
+        The register's own loops are not generated. Its array elements are
+        selected directly by their slices of rd_mux_addr, so the readback
+        depth grows with the log of the array size instead of linearly.
+        """
+        regwidth = node.get_property("regwidth")
+        accesswidth = node.get_property("accesswidth")
+        slices = None
+        for subword_idx in range(regwidth // accesswidth):
+            slices = self._get_index_slices(
+                node, subword_offset=subword_idx * (accesswidth // 8)
+            )
+            if slices is None:
+                return
+
+        for field in self.exp.ds.design_ir.get_reg_fields(node).readable_fields:
+            if not field.implements_storage and field.get_property("next"):
+                # Value may come from a reference to another component
+                return
+
+        assert slices is not None
+        assert node.array_dimensions is not None
+        n_outer = len(slices) - len(node.array_dimensions)
+        self._indexed_reg = node
+        self._index_exprs = {}
+        for i, sl in enumerate(slices[n_outer:], n_outer):
+            if sl is None:
+                self._index_exprs[f"i{i}"] = "0"
+            else:
+                self._index_exprs[f"i{i}"] = f"rd_mux_addr[{sl[0]}:{sl[1]}]"
+
+    def get_reg_conditional(self, node: RegNode, subword_offset: int = 0) -> str:
+        """
+        Returns the condition that selects the register, or the subword of a
+        wide register at subword_offset, for readback
+        """
+        if self._indexed_reg is None:
+            addr = self._get_address_str(node, subword_offset=subword_offset)
+            return self.get_addr_compare_conditional(addr)
+
+        addr_decode = self.exp.address_decode
+        addr = (
+            node.raw_absolute_address
+            - self.ds.top_node.raw_absolute_address
+            + subword_offset
+        )
+        slices = self._get_index_slices(node, subword_offset)
+        assert slices is not None
+        terms = addr_decode.get_index_range_terms(
+            addr_decode.get_top_scope(), addr, slices, "rd_mux_addr"
+        )
+        assert node.array_dimensions is not None
+        n_outer = len(slices) - len(node.array_dimensions)
+        for i, sl in enumerate(slices):
+            if sl is None:
+                continue
+            msb, lsb = sl
+            width = msb - lsb + 1
+            if i < n_outer:
+                # Parent array, still unrolled as a loop
+                terms.append(f"(rd_mux_addr[{msb}:{lsb}] == ({width})'(i{i}))")
+            elif self._array_dim_stack[i] < (1 << width):
+                # Slice can address past the end of the array
+                dim = self._array_dim_stack[i]
+                terms.append(f"(rd_mux_addr[{msb}:{lsb}] <= {SVInt(dim - 1, width)})")
+        if not terms:
+            # Every address bit is an index into the array
+            return "1'b1"
+        return " & ".join(terms)
+
+
+class AndOrReadbackMuxGenerator(ReadbackMuxGenerator):
+    """
+    Alternate variant that assigns each readback entry to its own term instead
+    of conditionally assigning readback_data_var.
+
+    Every entry sets one bit of the one-hot readback_hit vector and its
+    register value in readback_term. The terms are masked by their hit bit and
+    ORed together as a balanced tree by the readback template.
+    """
+
+    def __init__(self, exp: "RegblockExporter") -> None:
+        super().__init__(exp)
+        # Number of terms allocated so far
+        self.n_terms = 0
+
+    def _get_term_index(self) -> str:
+        """
+        Allocate a term for every iteration of the currently open loops, and
+        return the index expression of the term of the current iteration
+        """
+        parts = []
+        n = 1
+        for loop in reversed(self._stack[1:]):
+            assert isinstance(loop, LoopBody)
+            if n == 1:
+                parts.append(loop.iterator)
+            else:
+                parts.append(f"{loop.iterator}*{n}")
+            n *= loop.dim
+        if self.n_terms or not parts:
+            parts.append(str(self.n_terms))
+        self.n_terms += n
+        return " + ".join(reversed(parts))
+
+    def add_readback_entry(self, conditional: str, assignments: List[str]) -> None:
+        term = f"readback_term[{self._get_term_index()}]"
+        hit = term.replace("readback_term", "readback_hit", 1)
+        self.add_content(f"{hit} = {conditional};")
+        if not any(a.startswith("readback_data_var = ") for a in assignments):
+            self.add_content(f"{term} = '0;")
+        for assignment in assignments:
+            self.add_content(assignment.replace("readback_data_var", term, 1))
 
 
 class RetimedReadbackMuxGenerator(ReadbackMuxGenerator):
@@ -426,6 +589,9 @@ class RetimedReadbackMuxGenerator(ReadbackMuxGenerator):
     Alternate variant that is dedicated to building the 1st decode stage
     """
 
+    # Every element is assigned to the bin of its own address
+    index_arrays = False
+
     def process_external_block(self, node: AddressableNode) -> None:
         # Do nothing. External blocks are handled in a completely separate readback mux
         pass
@@ -0,0 +1,28 @@
+always @(*) begin
+    // Icarus limitation: does not support overriding variable lifetime (automatic).
+    // A regular block-local temp is sufficient here since logic is purely combinational.
+    logic [{{n_terms-1}}:0] readback_hit;
+    logic [{{cpuif.data_width-1}}:0] readback_term[{{n_terms}}];
+    logic [{{cpuif.data_width-1}}:0] readback_tree[{{2 * n_leaves}}];
+    {{readback_mux|indent}}
+
+    // Balanced OR tree of the terms, masked by their one-hot hit bits.
+    // Leaves are readback_tree[{{n_leaves}}..{{2 * n_leaves - 1}}], the root is readback_tree[1]
+    for(int i=0; i<{{n_terms}}; i++) readback_tree[{{n_leaves}}+i] = readback_term[i] & {{'{'}}{{cpuif.data_width}}{readback_hit[i]}};
+    {%- if n_leaves > n_terms %}
+    for(int i={{n_terms}}; i<{{n_leaves}}; i++) readback_tree[{{n_leaves}}+i] = '0;
+    {%- endif %}
+    for(int i={{n_leaves-1}}; i>0; i--) readback_tree[i] = readback_tree[2*i] | readback_tree[2*i+1];
+    readback_data = readback_tree[1];
+
+    {%- if ds.has_external_addressable %}
+    readback_done = decoded_req & ~decoded_req_is_wr & ~decoded_strb_is_external;
+    {%- else %}
+    readback_done = decoded_req & ~decoded_req_is_wr;
+    {%- endif %}
+    {%- if ds.err_if_bad_addr or ds.err_if_bad_rw %}
+    readback_err = decoded_err;
+    {%- else %}
+    readback_err = '0;
+    {%- endif %}
+end
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, Optional
 
-from systemrdl.walker import RDLListener, RDLWalker, WalkerAction
+from systemrdl.walker import RDLListener, WalkerAction
 from systemrdl.node import SignalNode, RegNode
 
 if TYPE_CHECKING:
@@ -58,7 +58,7 @@ class DesignScanner(RDLListener):
                 ),
             )
 
-        RDLWalker().walk(self.top_node, self)
+        self.ds.design_ir.walk(self.top_node, self)
         if self.msg.had_error:
             self.msg.fatal("Unable to export due to previous errors")
 
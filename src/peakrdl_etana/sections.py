@@ -0,0 +1,274 @@
+"""
+Rendering of the large, independent sections of the module template.
+
+Once the design has been scanned and validated, these sections are pure
+text producers. They can therefore be rendered up-front, either serially or
+in forked worker processes that inherit the compiled design, and are then
+joined by the module template in template order.
+
+Sections that can be produced in chunks (the field logic and its
+declarations) are not rendered up-front in a plain serial export. They are
+generated while the module template streams them to disk, so their text is
+never held in memory as a whole.
+"""
+
+import multiprocessing
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .profiling import profile_phase
+
+if TYPE_CHECKING:
+    from systemrdl.node import Node
+    from .exporter import RegblockExporter
+    from .export_cache import ExportCache
+
+# Section name -> renderer. Ordered roughly from most to least expensive so
+# that the longest-running sections are dispatched to workers first.
+SECTIONS: Dict[str, Callable[["RegblockExporter"], str]] = {
+    "field_logic": lambda exp: exp.field_logic.get_implementation(),
+    "readback": lambda exp: exp.readback.get_implementation(),
+    "field_declarations": lambda exp: exp.field_logic.get_declarations(),
+    "address_decode": lambda exp: exp.address_decode.get_implementation(),
+    "decode_strobes": lambda exp: exp.address_decode.get_strobe_logic(),
+    "write_buffering": lambda exp: (
+        exp.write_buffering.get_implementation()
+        if exp.ds.has_buffered_write_regs
+        else ""
+    ),
+    "read_buffering": lambda exp: (
+        exp.read_buffering.get_implementation() if exp.ds.has_buffered_read_regs else ""
+    ),
+}
+
+# Section name -> (renderer of the parts of the given top-level children,
+# joiner of the parts), for sections that are cached per top-level child
+CHILD_SECTIONS: Dict[
+    str,
+    Tuple[
+        Callable[["RegblockExporter", List["Node"]], List[str]],
+        Callable[[List[str]], str],
+    ],
+] = {
+    "field_logic": (
+        lambda exp, children: list(exp.field_logic.iter_implementation_parts(children)),
+        lambda parts: "\n".join(part for part in parts if part),
+    ),
+    "field_declarations": (
+        lambda exp, children: list(exp.field_logic.iter_declaration_parts(children)),
+        "".join,
+    ),
+}
+
+# Section name -> chunk generator, for sections that can be streamed
+STREAMED_SECTIONS: Dict[str, Callable[["RegblockExporter"], Iterable[str]]] = {
+    "field_logic": lambda exp: exp.field_logic.iter_implementation(),
+    "field_declarations": lambda exp: exp.field_logic.iter_declarations(),
+}
+
+
+class Section:
+    """
+    Content of a section as used by the module template: either its
+    rendered text, or a generator of chunks that is consumed once, as the
+    module is written.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self.chunks = chunks
+
+    def indent(self, width: int = 4) -> Iterator[str]:
+        """
+        Yield the chunks with all lines but the first indented by width
+        spaces, like Jinja's indent filter. Blank lines are indented too, but
+        the module writer strips trailing whitespace.
+        """
+        newline = "\n" + " " * width
+        for chunk in self.chunks:
+            yield chunk.replace("\n", newline)
+
+
+def _profiled_chunks(exp: "RegblockExporter", name: str) -> Iterator[str]:
+    # The phase also covers writing the chunks out, since both are
+    # interleaved
+    with profile_phase(exp.profiler, f"section:{name}"):
+        yield from STREAMED_SECTIONS[name](exp)
+
+
+# Exporter and top-level children inherited by forked worker processes
+_worker_exp: Optional["RegblockExporter"] = None
+_worker_children: Optional[List["Node"]] = None
+
+
+def _render_one(
+    exp: "RegblockExporter", name: str, children: Optional[List["Node"]]
+) -> Any:
+    """
+    Render a section, or only the parts of the given top-level children if
+    it is one of CHILD_SECTIONS
+    """
+    if children is not None and name in CHILD_SECTIONS:
+        return CHILD_SECTIONS[name][0](exp, children)
+    return SECTIONS[name](exp)
+
+
+def _render_section(name: str) -> Any:
+    assert _worker_exp is not None
+    return _render_one(_worker_exp, name, _worker_children)
+
+
+def can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _render(
+    exp: "RegblockExporter",
+    names: List[str],
+    jobs: int,
+    children: Optional[List["Node"]] = None,
+) -> Dict[str, Any]:
+    global _worker_exp, _worker_children  # pylint: disable=global-statement
+
+    if jobs <= 1 or len(names) <= 1 or not can_fork():
+        results = {}
+        for name in names:
+            with profile_phase(exp.profiler, f"section:{name}"):
+                results[name] = _render_one(exp, name, children)
+        return results
+
+    _worker_exp = exp
+    _worker_children = children
+    try:
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(min(jobs, len(names))) as pool:
+            results = pool.map(_render_section, names, chunksize=1)
+    finally:
+        _worker_exp = None
+        _worker_children = None
+    return dict(zip(names, results))
+
+
+def render_sections(
+    exp: "RegblockExporter", jobs: int = 1, cache: Optional["ExportCache"] = None
+) -> Dict[str, Section]:
+    """
+    Render all sections of the module template.
+
+    If jobs > 1, sections are rendered by a pool of up to that many forked
+    worker processes. Platforms that cannot fork fall back to rendering
+    serially. Either way, the result is identical.
+
+    If an export cache is given, sections it already holds for the current
+    design are reused and only the missing ones are rendered. The field
+    logic is cached per top-level child, so it is only rendered for the
+    children that changed.
+
+    Otherwise, streamable sections are returned unrendered and are generated
+    as the module template consumes them.
+    """
+    names = list(SECTIONS.keys())
+
+    if cache is None and (jobs <= 1 or not can_fork()):
+        sections = {}
+        rendered = _render(
+            exp, [name for name in names if name not in STREAMED_SECTIONS], 1
+        )
+        for name in names:
+            if name in STREAMED_SECTIONS:
+                sections[name] = Section(_profiled_chunks(exp, name))
+            else:
+                sections[name] = Section([rendered[name]])
+        return sections
+
+    if cache is not None:
+        return _render_cached(exp, jobs, cache)
+
+    rendered = _render(exp, names, jobs)
+    return {name: Section([rendered[name]]) for name in names}
+
+
+def _has_child_parts(entry: Dict[str, Any]) -> bool:
+    return all(isinstance(entry.get(name), str) for name in CHILD_SECTIONS)
+
+
+def _render_cached(
+    exp: "RegblockExporter", jobs: int, cache: "ExportCache"
+) -> Dict[str, Section]:
+    """
+    Render the sections that are not in the export cache, and store them.
+
+    The CHILD_SECTIONS are only rendered for the top-level children whose
+    parts are not cached, and the cached parts of the others are joined in.
+    """
+    names = list(SECTIONS.keys())
+
+    with profile_phase(exp.profiler, "cache_load"):
+        cached = cache.load()
+        cached_children = [cache.load(key) for _, key in cache.child_keys]
+
+    results: Dict[str, str] = {}
+    for name in names:
+        if name in CHILD_SECTIONS:
+            continue
+        if isinstance(cached.get(name), str):
+            results[name] = cached[name]
+            cache.hits += 1
+        else:
+            cache.misses += 1
+
+    missing_children = []
+    for (child, _), entry in zip(cache.child_keys, cached_children):
+        if _has_child_parts(entry):
+            cache.child_hits += 1
+        else:
+            missing_children.append(child)
+            cache.child_misses += 1
+
+    missing = [
+        name
+        for name in names
+        if name not in results and (name not in CHILD_SECTIONS or missing_children)
+    ]
+    rendered = _render(exp, missing, jobs, missing_children)
+
+    new_parts = {name: iter(rendered.get(name, [])) for name in CHILD_SECTIONS}
+    parts: Dict[str, List[str]] = {name: [] for name in CHILD_SECTIONS}
+    new_entries = []
+    for (_, key), entry in zip(cache.child_keys, cached_children):
+        if not _has_child_parts(entry):
+            entry = {name: next(new_parts[name]) for name in CHILD_SECTIONS}
+            new_entries.append((key, entry))
+        for name in CHILD_SECTIONS:
+            parts[name].append(entry[name])
+    for name, (_, join) in CHILD_SECTIONS.items():
+        results[name] = join(parts[name])
+
+    missing_sections = [name for name in missing if name not in CHILD_SECTIONS]
+    for name in missing_sections:
+        results[name] = rendered[name]
+
+    if missing_sections or new_entries:
+        with profile_phase(exp.profiler, "cache_store"):
+            if missing_sections:
+                cache.store(
+                    {
+                        name: results[name]
+                        for name in names
+                        if name not in CHILD_SECTIONS
+                    }
+                )
+            for key, entry in new_entries:
+                cache.store(entry, key)
+
+    return {name: Section([results[name]]) for name in names}
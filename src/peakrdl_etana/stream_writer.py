@@ -0,0 +1,43 @@
+from typing import TextIO, Iterable
+
+from .forloop_generator import LoopLabelRenumberer
+
+
+class LineStrippingWriter:
+    """
+    Output sink for rendered template chunks.
+
+    Chunks are split into lines as they arrive. Each complete line is written
+    immediately with trailing whitespace stripped and loop labels renumbered,
+    so only the current partial line is ever held in memory.
+    """
+
+    def __init__(self, f: TextIO) -> None:
+        self.f = f
+        self.renumberer = LoopLabelRenumberer()
+        self._partial = ""
+
+    def write(self, s: str) -> None:
+        if "\n" not in s:
+            self._partial += s
+            return
+
+        lines = (self._partial + s).split("\n")
+        self._partial = lines.pop()
+        self.f.write(
+            "".join(self.renumberer.renumber(line.rstrip()) + "\n" for line in lines)
+        )
+
+    def write_all(self, chunks: Iterable[str]) -> None:
+        for chunk in chunks:
+            self.write(chunk)
+        self.finish()
+
+    def finish(self) -> None:
+        """
+        Write out the last line. Like every other line, it is terminated with a
+        newline.
+        """
+        if self._partial:
+            self.f.write(self.renumberer.renumber(self._partial.rstrip()) + "\n")
+            self._partial = ""
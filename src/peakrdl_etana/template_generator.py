@@ -64,7 +64,7 @@ class TemplateGenerator:
 
         # Write to file
         output_file = f"{output_dir}/{module_name}_example.sv"
-        with open(output_file, "w") as f:
+        with self.exp.output_files.open(output_file) as f:
             f.write(template_code)
 
     def _get_apb_signals(self) -> List[SignalInfo]:
@@ -143,59 +143,38 @@ class TemplateGenerator:
 
     def _get_hwif_signals(self) -> List[SignalInfo]:
         """
-        Extract hardware interface signals from hwif port declarations.
+        Extract hardware interface signals from the hwif ports.
 
         Returns list of hwif signals with w_ prefix applied to base names.
         """
         signals: List[SignalInfo] = []
 
-        # Get hwif port declarations
-        if not self.hwif.has_hwif_ports:
-            return signals
-
-        hwif_ports = self.hwif.port_declaration
-
-        if not hwif_ports:
-            return signals
-
-        # Parse each port declaration line
-        for line in hwif_ports.split("\n"):
-            line = line.strip().rstrip(",")  # Strip trailing comma
-            if not line or line.startswith("//"):
+        for port in self.hwif.ports:
+            # Ports of register arrays are not included in the template
+            if port.array_dims:
                 continue
 
-            # Parse port declaration
-            match = re.match(
-                r"^(input|output)\s+(wire|logic)?\s*((?:\s*\[[\w:\s]+\])+)?\s*(\w+)\s*$",
-                line,
-            )
-
-            if match:
-                direction = match.group(1)
-                wire_type = match.group(2) or "wire"
-                packed_dim = (match.group(3) or "").strip()
-                name = match.group(4)
-
-                # Extract base name by removing hwif_in_/hwif_out_ or i_/o_ prefix
-                base_name = name
-                if name.startswith(f"{self.hwif.hwif_in_str}_"):
-                    base_name = name[len(self.hwif.hwif_in_str) + 1 :]
-                elif name.startswith(f"{self.hwif.hwif_out_str}_"):
-                    base_name = name[len(self.hwif.hwif_out_str) + 1 :]
-                elif name.startswith("i_"):
-                    base_name = name[2:]
-                elif name.startswith("o_"):
-                    base_name = name[2:]
-
-                signals.append(
-                    SignalInfo(
-                        name=name,
-                        direction=direction,
-                        wire_type=wire_type,
-                        packed_dim=packed_dim,
-                        base_name=base_name,
-                    )
+            # Extract base name by removing hwif_in_/hwif_out_ or i_/o_ prefix
+            name = port.name
+            base_name = name
+            if name.startswith(f"{self.hwif.hwif_in_str}_"):
+                base_name = name[len(self.hwif.hwif_in_str) + 1 :]
+            elif name.startswith(f"{self.hwif.hwif_out_str}_"):
+                base_name = name[len(self.hwif.hwif_out_str) + 1 :]
+            elif name.startswith("i_"):
+                base_name = name[2:]
+            elif name.startswith("o_"):
+                base_name = name[2:]
+
+            signals.append(
+                SignalInfo(
+                    name=name,
+                    direction=port.direction,
+                    wire_type=port.net_type,
+                    packed_dim=port.packed_dim,
+                    base_name=base_name,
                 )
+            )
 
         return signals
 
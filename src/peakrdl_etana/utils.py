@@ -1,5 +1,5 @@
 import re
-from typing import Match, Union, Optional, List, TYPE_CHECKING
+from typing import Match, Union, Optional, List, Dict, Tuple, TYPE_CHECKING
 
 from systemrdl.rdltypes.references import PropertyReference
 from systemrdl.node import Node, AddrmapNode, RegNode, FieldNode, RegfileNode
@@ -11,16 +11,100 @@ if TYPE_CHECKING:
     from .exporter import DesignState
 
 
+# path, index iterators, array dimensions, width
+_IndexedPathEntry = Tuple[
+    str, Tuple[str, ...], Optional[Tuple[int, ...]], Optional[int]
+]
+
+
+class IdentifierCache:
+    """
+    Memoizes the path computation of :class:`IndexedPath`.
+
+    A cache is only installed for the duration of one export, so entries
+    never outlive the design they were computed from. Hit/miss counters are
+    kept after the entries are cleared.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[tuple, "_IndexedPathEntry"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def get_key(top_node: Node, target_node: Node) -> tuple:
+        # Node objects are re-created on every traversal and are not hashable,
+        # but each instance in the elaborated tree has its own component.
+        # Array indexes are included in case the node was reached by unrolling.
+        idx = []
+        current: Optional[Node] = target_node
+        while current is not None and current.inst is not top_node.inst:
+            if getattr(current, "current_idx", None) is not None:
+                idx.append(tuple(current.current_idx))  # type: ignore[attr-defined]
+            current = current.parent
+        return (id(top_node.inst), id(target_node.inst), tuple(idx))
+
+    def get(self, top_node: Node, target_node: Node) -> "_IndexedPathEntry":
+        key = self.get_key(top_node, target_node)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = IndexedPath.compute(top_node, target_node)
+            self._entries[key] = entry
+        else:
+            self.hits += 1
+        return entry
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses "
+            f"({self.hit_rate:.1%} hit rate, {len(self)} entries)"
+        )
+
+
 class IndexedPath:
+    # Identifier cache of the export in progress, if any
+    cache: Optional[IdentifierCache] = None
+
     def __init__(self, top_node: Node, target_node: Node) -> None:
 
         self.top_node = top_node
         self.target_node = target_node
-        self.index = []
+
+        if IndexedPath.cache is None:
+            entry = self.compute(top_node, target_node)
+        else:
+            entry = IndexedPath.cache.get(top_node, target_node)
+        path, index, array_dimensions, width = entry
+
+        # Callers are free to modify these, so hand out copies
+        self.path = path
+        self.index = list(index)
+        self.array_dimensions: List[int] = (
+            list(array_dimensions) if array_dimensions is not None else None  # type: ignore[assignment]
+        )
+        self.width = width
+
+    @staticmethod
+    def compute(top_node: Node, target_node: Node) -> _IndexedPathEntry:
+        index = []
 
         # Collect ALL array dimensions from target up to top
         # Walk up the hierarchy and collect array dimensions from all regfiles
-        self.array_dimensions: List[int] = []
+        array_dimensions: List[int] = []
         current = target_node
 
         # For FieldNodes, start from the parent (the register)
@@ -34,9 +118,7 @@ class IndexedPath:
                 and current.array_dimensions is not None
             ):
                 # Prepend dimensions (outer dimensions come first)
-                self.array_dimensions = (
-                    list(current.array_dimensions) + self.array_dimensions
-                )
+                array_dimensions = list(current.array_dimensions) + array_dimensions
 
             # Move to parent
             if hasattr(current, "parent"):
@@ -44,39 +126,51 @@ class IndexedPath:
             else:
                 break
 
-        # Convert to None if empty
-        if not self.array_dimensions:
-            self.array_dimensions = None  # type: ignore[assignment]
-
         try:
-            self.width = self.target_node.width  # type: ignore[attr-defined]
+            width = target_node.width  # type: ignore[attr-defined]
         except AttributeError:
-            self.width = None
+            width = None
 
-        self.path = self.target_node.get_rel_path(
-            self.top_node, empty_array_suffix="[!]", hier_separator=":"
+        path = target_node.get_rel_path(
+            top_node, empty_array_suffix="[!]", hier_separator=":"
         )
 
         def kw_filter_repl(m: Match) -> str:
             return kwf(m.group(0))
 
-        self.path = re.sub(r"\w+", kw_filter_repl, self.path).lower()
+        path = re.sub(r"\w+", kw_filter_repl, path).lower()
 
-        for i, g in enumerate(re.findall(r"\[!\]", self.path)):
-            self.index.append(f"i{i}")
-        self.path = re.sub(r"\[!\]", "", self.path)
+        for i, g in enumerate(re.findall(r"\[!\]", path)):
+            index.append(f"i{i}")
+        path = re.sub(r"\[!\]", "", path)
 
         # When a reg and a field have the same name it is redundant so we only use one
-        elem = self.path.split(":")
+        elem = path.split(":")
         try:
             if elem[-1] == elem[-2]:
-                self.path = "_".join(elem[:-1])
+                path = "_".join(elem[:-1])
             else:
-                self.path = "_".join(elem)
+                path = "_".join(elem)
         except IndexError:
             pass
 
-        self.path = re.sub(r":", "", self.path)
+        path = re.sub(r":", "", path)
+
+        # Convert to None if empty
+        return (
+            path,
+            tuple(index),
+            tuple(array_dimensions) if array_dimensions else None,
+            width,
+        )
+
+    def replace_index(self, index_exprs: Optional[Dict[str, str]]) -> None:
+        """
+        Replace the loop iterators in index with the expressions that
+        index_exprs maps them to
+        """
+        if index_exprs:
+            self.index = [index_exprs.get(i, i) for i in self.index]
 
     @property
     def index_str(self) -> str:
@@ -298,6 +392,13 @@ def is_inside_external_block(
     Returns:
         True if node is inside an external block, False otherwise
     """
+    if (
+        ds is not None
+        and top_node.inst is ds.top_node.inst
+        and ds.design_ir.is_indexed(node)
+    ):
+        return ds.design_ir.is_inside_external(node)
+
     parent = node.parent
     while parent is not None and parent != top_node:
         if hasattr(parent, "external") and parent.external:
@@ -310,7 +411,9 @@ def is_inside_external_block(
     return False
 
 
-def has_sw_writable_descendants(node: Union[RegfileNode, AddrmapNode]) -> bool:
+def has_sw_writable_descendants(
+    node: Union[RegfileNode, AddrmapNode], ds: Optional["DesignState"] = None
+) -> bool:
     """
     Check if node has any sw-writable descendants.
 
@@ -318,10 +421,17 @@ def has_sw_writable_descendants(node: Union[RegfileNode, AddrmapNode]) -> bool:
 
     Args:
         node: RegfileNode or AddrmapNode to check
+        ds: Optional DesignState. Nodes of the design being exported are
+            looked up in its precomputed index
 
     Returns:
         True if any descendants are sw-writable, False otherwise
     """
+    if ds is not None:
+        access = ds.design_ir.get_sw_access(node)
+        if access is not None:
+            return access[1]
+
     if isinstance(node, RegfileNode):
         return any(reg.has_sw_writable for reg in node.registers())
     elif isinstance(node, AddrmapNode):
@@ -331,7 +441,9 @@ def has_sw_writable_descendants(node: Union[RegfileNode, AddrmapNode]) -> bool:
     return False
 
 
-def has_sw_readable_descendants(node: Union[RegfileNode, AddrmapNode]) -> bool:
+def has_sw_readable_descendants(
+    node: Union[RegfileNode, AddrmapNode], ds: Optional["DesignState"] = None
+) -> bool:
     """
     Check if node has any sw-readable descendants.
 
@@ -339,10 +451,17 @@ def has_sw_readable_descendants(node: Union[RegfileNode, AddrmapNode]) -> bool:
 
     Args:
         node: RegfileNode or AddrmapNode to check
+        ds: Optional DesignState. Nodes of the design being exported are
+            looked up in its precomputed index
 
     Returns:
         True if any descendants are sw-readable, False otherwise
     """
+    if ds is not None:
+        access = ds.design_ir.get_sw_access(node)
+        if access is not None:
+            return access[0]
+
     if isinstance(node, RegfileNode):
         return any(reg.has_sw_readable for reg in node.registers())
     elif isinstance(node, AddrmapNode):
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, Optional, List
 
-from systemrdl.walker import RDLListener, RDLWalker, WalkerAction
+from systemrdl.walker import RDLListener, WalkerAction
 from systemrdl.rdltypes import PropertyReference
 from systemrdl.node import Node, RegNode, FieldNode, SignalNode, AddressableNode
 from systemrdl.node import RegfileNode, AddrmapNode
@@ -31,7 +31,7 @@ class DesignValidator(RDLListener):
         return self.exp.ds.top_node
 
     def do_validate(self) -> None:
-        RDLWalker().walk(self.top_node, self)
+        self.exp.ds.design_ir.walk(self.top_node, self)
         if self.msg.had_error:
             self.msg.fatal("Unable to export due to previous errors")
 
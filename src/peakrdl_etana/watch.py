@@ -0,0 +1,172 @@
+"""
+Watch mode: re-export a register block whenever its sources change.
+
+A :class:`DesignWatcher` keeps a single exporter resident between runs, so
+the Jinja environment, compiled templates and imported generator modules are
+only set up once. It polls the modification times of every SystemRDL file
+that contributed to the elaborated design, including included files, and
+recompiles and re-exports the design when one of them changes. Together
+with an export cache and write-if-changed output, a re-export only
+regenerates the field logic of the top-level children that changed and only
+touches the output files whose content changed.
+"""
+
+import os
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Set
+
+from systemrdl import RDLCompileError
+
+from .exporter import RegblockExporter
+
+if TYPE_CHECKING:
+    from systemrdl.node import AddrmapNode
+
+
+def get_source_files(top_node: "AddrmapNode") -> Set[str]:
+    """
+    Returns the paths of all SystemRDL files that the elaborated design was
+    compiled from
+    """
+    files = set()
+    seen = set()
+
+    def visit(node: Any) -> None:
+        inst = node.inst
+        if id(inst) in seen:
+            return
+        seen.add(id(inst))
+        for src_ref in (inst.def_src_ref, inst.inst_src_ref):
+            filename = getattr(src_ref, "filename", None)
+            if filename:
+                files.add(os.path.abspath(filename))
+        for child in node.children():
+            visit(child)
+
+    visit(top_node)
+    return files
+
+
+def _get_mtimes(paths: Iterable[str]) -> Dict[str, Optional[int]]:
+    mtimes: Dict[str, Optional[int]] = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+class DesignWatcher:
+    """
+    Compiles and exports a design, then re-exports it each time one of its
+    source files changes.
+
+    Parameters
+    ----------
+    compile_fn: callable
+        Compiles and elaborates the design from scratch and returns its
+        top-level node. Raises ``RDLCompileError`` if the design has errors.
+    output_dir: str
+        Output directory passed to ``RegblockExporter.export()``
+    export_kwargs: dict
+        Additional keyword arguments passed to ``RegblockExporter.export()``
+    input_files: list
+        Files to watch in addition to the ones found in the elaborated
+        design. Used so that a design that fails to compile is still
+        retried once its inputs are fixed.
+    interval: float
+        Polling interval in seconds
+    """
+
+    def __init__(
+        self,
+        compile_fn: Callable[[], "AddrmapNode"],
+        output_dir: str,
+        export_kwargs: Dict[str, Any],
+        input_files: Iterable[str] = (),
+        interval: float = 0.5,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.compile_fn = compile_fn
+        self.output_dir = output_dir
+        self.export_kwargs = export_kwargs
+        self.input_files = {os.path.abspath(path) for path in input_files}
+        self.interval = interval
+        self.log = log
+
+        # Kept between runs so that templates are only compiled once
+        self.exporter = RegblockExporter()
+
+        # Modification times of the watched files as of the most recent run
+        self.mtimes: Dict[str, Optional[int]] = {}
+        self.runs = 0
+
+    def run_once(self) -> bool:
+        """
+        Compile and export the design once. Returns True on success.
+        """
+        self.runs += 1
+        sources = set(self.input_files)
+        # Snapshot before compiling, so that an edit made while the export
+        # is running triggers another run
+        self.mtimes = _get_mtimes(sources)
+
+        t_start = time.perf_counter()
+        try:
+            top_node = self.compile_fn()
+        except RDLCompileError:
+            self.log(f"[run {self.runs}] compile failed. Waiting for changes...")
+            return False
+        t_compile = time.perf_counter()
+
+        # Add the files that were included by the input files
+        included = get_source_files(top_node) - sources
+        self.mtimes.update(_get_mtimes(included))
+
+        try:
+            self.exporter.export(top_node, self.output_dir, **self.export_kwargs)
+        except Exception as e:  # pylint: disable=broad-except
+            self.log(f"[run {self.runs}] export failed: {e}")
+            return False
+        t_export = time.perf_counter()
+
+        summary = (
+            f"[run {self.runs}] compile {t_compile - t_start:.3f}s, "
+            f"export {t_export - t_compile:.3f}s, "
+            f"total {t_export - t_start:.3f}s; {self.exporter.output_files}"
+        )
+        if self.exporter.export_cache is not None:
+            summary += f"; export cache: {self.exporter.export_cache}"
+        self.log(summary)
+        return True
+
+    def get_changed_files(self) -> Set[str]:
+        """
+        Returns the watched files whose modification time changed since the
+        most recent run
+        """
+        current = _get_mtimes(self.mtimes.keys())
+        return {path for path, mtime in current.items() if mtime != self.mtimes[path]}
+
+    def run(self, max_runs: Optional[int] = None) -> None:
+        """
+        Export the design, then keep re-exporting it whenever its sources
+        change, until interrupted or max_runs exports were done.
+        """
+        self.run_once()
+        try:
+            while max_runs is None or self.runs < max_runs:
+                time.sleep(self.interval)
+                changed = self.get_changed_files()
+                if not changed:
+                    continue
+                for path in sorted(changed):
+                    self.log(f"changed: {os.path.relpath(path)}")
+                # Editors often write a file in several steps. Give them a
+                # moment to finish before compiling.
+                time.sleep(min(self.interval, 0.1))
+                self.run_once()
+        except KeyboardInterrupt:
+            print("", file=sys.stderr)
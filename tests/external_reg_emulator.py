@@ -0,0 +1,223 @@
+"""Emulators for external register arrays and external memories
+
+Shared by tests whose designs have ``external`` register arrays or memories.
+Each emulator watches the request strobes of one hwif_out prefix, keeps its
+own storage for verification and drives the ack strobes. Acks are returned
+the cycle after the request, or later if an ack delay is given.
+"""
+
+import random
+from typing import Optional, Sequence, Tuple, Union
+
+from cocotb.triggers import RisingEdge
+
+AckDelay = Union[int, Tuple[int, int]]
+
+
+def apply_mask(current: int, new: int, mask: int) -> int:
+    return (current & ~mask) | (new & mask)
+
+
+class _DelayedAck:
+    """Holds a single outstanding request until its ack delay has elapsed
+
+    ack_delay: 0 acks the cycle after the request, an int adds that many
+    cycles, and a (min, max) tuple picks a random delay per request.
+    """
+
+    def __init__(self, ack_delay: AckDelay) -> None:
+        self.ack_delay = ack_delay
+        self.pending: Optional[Tuple[bool, int]] = None
+        self.remaining = 0
+
+    def start(self, is_write: bool, idx: int) -> None:
+        if isinstance(self.ack_delay, (list, tuple)):
+            self.remaining = random.randint(*self.ack_delay)
+        else:
+            self.remaining = max(0, int(self.ack_delay))
+        self.pending = (is_write, idx)
+
+    def pop_if_due(self) -> Optional[Tuple[bool, int]]:
+        """Return the pending request once it is due, counting down otherwise"""
+        if self.pending is None:
+            return None
+        if self.remaining > 0:
+            self.remaining -= 1
+            return None
+        pending = self.pending
+        self.pending = None
+        return pending
+
+
+class ExternalRegArrayEmulator:
+    """Emulator for an external register array, e.g. hwif_out_e[*]
+
+    fields lists the (name, lsb, width) of each field of the register, for
+    registers whose data ports are split per field (hwif_out_e_wr_data_f).
+    Leave it as None for registers with register-level data ports
+    (hwif_out_e_wr_data).
+    """
+
+    def __init__(
+        self,
+        dut,
+        clk,
+        prefix: str,
+        fields: Optional[Sequence[Tuple[str, int, int]]] = None,
+        reset_value: int = 0,
+        ack_delay: AckDelay = 0,
+    ):
+        self.dut = dut
+        self.clk = clk
+        self.fields = fields
+
+        # Request side (driven by DUT)
+        self.req = getattr(dut, f"hwif_out_{prefix}_req")
+        self.req_is_wr = getattr(dut, f"hwif_out_{prefix}_req_is_wr")
+
+        # Response side (driven by emulator)
+        self.rd_ack = getattr(dut, f"hwif_in_{prefix}_rd_ack")
+        self.wr_ack = getattr(dut, f"hwif_in_{prefix}_wr_ack")
+
+        # Data ports, one set per field or a single register-level set
+        suffixes = [""] if fields is None else [f"_{name}" for name, _, _ in fields]
+        self.wr_data = [getattr(dut, f"hwif_out_{prefix}_wr_data{s}") for s in suffixes]
+        self.wr_biten = [
+            getattr(dut, f"hwif_out_{prefix}_wr_biten{s}") for s in suffixes
+        ]
+        self.rd_data = [getattr(dut, f"hwif_in_{prefix}_rd_data{s}") for s in suffixes]
+
+        self.num_regs = len(self.req)
+        self.storage = [reset_value] * self.num_regs
+        self._ack = _DelayedAck(ack_delay)
+
+        # Initialize driven signals to safe defaults (unpacked arrays - each element)
+        for i in range(self.num_regs):
+            self.rd_ack[i].value = 0
+            self.wr_ack[i].value = 0
+            for rd_data in self.rd_data:
+                rd_data[i].value = 0
+
+    @property
+    def ack_delay(self) -> AckDelay:
+        return self._ack.ack_delay
+
+    @ack_delay.setter
+    def ack_delay(self, ack_delay: AckDelay) -> None:
+        self._ack.ack_delay = ack_delay
+
+    def _layout(self):
+        """(lsb, width) of each data port within the register"""
+        if self.fields is None:
+            return [(0, len(self.wr_data[0][0]))]
+        return [(lsb, width) for _, lsb, width in self.fields]
+
+    async def run(self):
+        """Clocked process that services external requests."""
+        while True:
+            await RisingEdge(self.clk)
+            # Default: deassert acknowledgments each cycle (unpacked arrays)
+            for i in range(self.num_regs):
+                self.rd_ack[i].value = 0
+                self.wr_ack[i].value = 0
+
+            if self._ack.pending is None:
+                for idx in range(self.num_regs):
+                    try:
+                        if not int(self.req[idx].value):
+                            continue
+                        is_write = bool(int(self.req_is_wr[idx].value))
+                    except ValueError:
+                        # Ignore cycles with unknowns
+                        continue
+                    if is_write:
+                        self._write(idx)
+                    self._ack.start(is_write, idx)
+                    break  # Only one entry can be active per cycle
+
+            done = self._ack.pop_if_due()
+            if done is None:
+                continue
+            is_write, idx = done
+            if is_write:
+                self.wr_ack[idx].value = 1
+            else:
+                for rd_data, (lsb, width) in zip(self.rd_data, self._layout()):
+                    rd_data[idx].value = (self.storage[idx] >> lsb) & (2**width - 1)
+                self.rd_ack[idx].value = 1
+
+    def _write(self, idx: int):
+        for wr_data, wr_biten, (lsb, width) in zip(
+            self.wr_data, self.wr_biten, self._layout()
+        ):
+            data = int(wr_data[idx].value) << lsb
+            mask = (int(wr_biten[idx].value) & (2**width - 1)) << lsb
+            self.storage[idx] = apply_mask(self.storage[idx], data, mask)
+
+
+class ExternalMemEmulator:
+    """Emulator for an external memory, e.g. hwif_out_mm"""
+
+    def __init__(self, dut, clk, prefix: str, ack_delay: AckDelay = 0):
+        self.dut = dut
+        self.clk = clk
+
+        # Request interface
+        self.req = getattr(dut, f"hwif_out_{prefix}_req")
+        self.req_is_wr = getattr(dut, f"hwif_out_{prefix}_req_is_wr")
+        self.addr = getattr(dut, f"hwif_out_{prefix}_addr")
+        self.wr_data = getattr(dut, f"hwif_out_{prefix}_wr_data")
+        self.wr_biten = getattr(dut, f"hwif_out_{prefix}_wr_biten")
+
+        # Response interface
+        self.rd_ack = getattr(dut, f"hwif_in_{prefix}_rd_ack")
+        self.wr_ack = getattr(dut, f"hwif_in_{prefix}_wr_ack")
+        self.rd_data = getattr(dut, f"hwif_in_{prefix}_rd_data")
+
+        # Entries are indexed by word address
+        self.storage = {}
+        self._ack = _DelayedAck(ack_delay)
+
+        self.rd_ack.value = 0
+        self.wr_ack.value = 0
+        self.rd_data.value = 0
+
+    @property
+    def ack_delay(self) -> AckDelay:
+        return self._ack.ack_delay
+
+    @ack_delay.setter
+    def ack_delay(self, ack_delay: AckDelay) -> None:
+        self._ack.ack_delay = ack_delay
+
+    async def run(self):
+        while True:
+            await RisingEdge(self.clk)
+            self.rd_ack.value = 0
+            self.wr_ack.value = 0
+
+            if self._ack.pending is None:
+                try:
+                    req = int(self.req.value)
+                    is_write = bool(int(self.req_is_wr.value))
+                    idx = int(self.addr.value) >> 2
+                except ValueError:
+                    req = 0
+                if req:
+                    if is_write:
+                        self.storage[idx] = apply_mask(
+                            self.storage.get(idx, 0),
+                            int(self.wr_data.value),
+                            int(self.wr_biten.value),
+                        )
+                    self._ack.start(is_write, idx)
+
+            done = self._ack.pop_if_due()
+            if done is None:
+                continue
+            is_write, idx = done
+            if is_write:
+                self.wr_ack.value = 1
+            else:
+                self.rd_data.value = self.storage.get(idx, 0)
+                self.rd_ack.value = 1
@@ -80,10 +80,16 @@ if [ "$GHDL" -eq 1 ] || [ "$NVC" -eq 1 ]; then
     SKIP_TESTS+=("test_addrmap")
     SKIP_TESTS+=("test_cpuif_err_rsp")
     SKIP_TESTS+=("test_ahb_pipeline")
+    SKIP_TESTS+=("test_decode_tree")
+    SKIP_TESTS+=("test_rt_decode")
+    SKIP_TESTS+=("test_readback_andor")
 fi
 # Skip certain tests when REGBLOCK=1
 if [ "$REGBLOCK" -eq 1 ]; then
     SKIP_TESTS+=("test_addrmap")
+    SKIP_TESTS+=("test_decode_tree")
+    SKIP_TESTS+=("test_rt_decode")
+    SKIP_TESTS+=("test_readback_andor")
 fi
 # Skip certain tests when using specific simulators
 # if [ "$SIM" = "verilator" ]; then
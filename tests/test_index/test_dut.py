@@ -2,11 +2,9 @@ import sys
 from random import randint, shuffle
 from pathlib import Path
 
-# Add test root and local directory to path to access shared modules
-module_dir = Path(__file__).parent
-test_dir = module_dir.parent
+# Add parent directory to path to access shared test modules
+test_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(test_dir))
-sys.path.insert(0, str(module_dir))
 from cocotb import test, start_soon  # noqa: E402
 
 from tb_base import testbench  # noqa: E402
@@ -22,9 +20,11 @@ async def test_dut_simple(dut):
     await tb.clk.wait_clkn(200)
 
     # Start emulator for the external register bank
-    ext_regs = ExternalRegArrayEmulator(dut, tb.clk.clk)
+    ext_regs = ExternalRegArrayEmulator(
+        dut, tb.clk.clk, "e", fields=[("f", 0, 8), ("g", 16, 8)], reset_value=0x110011
+    )
     start_soon(ext_regs.run())
-    ext_mem = ExternalMemEmulator(dut, tb.clk.clk)
+    ext_mem = ExternalMemEmulator(dut, tb.clk.clk, "mm")
     start_soon(ext_mem.run())
 
     def build_block_accesses(start_addr: int, count: int, mask: int):
@@ -11,6 +11,8 @@ ifeq ($(COCOTB_REV),2.0.0)
 endif
 
 PEAKRDL_ARGS+=
+# peakrdl etana options that the regblock and regblock-vhdl targets don't accept
+ETANA_ARGS+=
 # Supported CPUIFs: apb4-flat, apb3-flat, ahblite-flat, ahb-flat, axi4-lite-flat,
 # avalon-mm-flat, obi-flat, wishbone-flat, passthrough
 CPUIF?=apb4-flat
@@ -137,7 +139,7 @@ check-gen:
 
 etana:
 	rm -rf etana-rtl/*
-	peakrdl etana ${UDPS} regblock.rdl -o etana-rtl/ --cpuif ${CPUIF} ${PEAKRDL_ARGS} --rename regblock
+	peakrdl etana ${UDPS} regblock.rdl -o etana-rtl/ --cpuif ${CPUIF} ${PEAKRDL_ARGS} ${ETANA_ARGS} --rename regblock
 	@if [ "$(GIT_CHECK)" -eq 1 ]; then \
 		$(MAKE) check-etana; \
 	fi
@@ -147,9 +149,8 @@ check-etana:
 
 regblock:
 	rm -rf regblock-rtl/*
-	#peakrdl regblock ${UDPS} regblock.rdl -o regblock-rtl/ --hwif-wrapper --cpuif ${CPUIF} --rename regblock
-	peakrdl regblock ${UDPS} regblock.rdl -o regblock-rtl/ --cpuif ${CPUIF} ${PEAKRDL_ARGS} --rename regblock
-	../../scripts/hwif_wrapper_tool/generate_wrapper.py ${UDPS} regblock.rdl -o regblock-rtl/ --cpuif ${CPUIF} --rename regblock
+	# Writes the regblock module, package and hwif wrapper in one run
+	../../scripts/hwif_wrapper_tool/generate_wrapper.py ${UDPS} regblock.rdl -o regblock-rtl/ --cpuif ${CPUIF} ${PEAKRDL_ARGS} --rename regblock
 	../../scripts/strip_trailing_whitespace.py regblock-rtl/
 	@if [ "$(GIT_CHECK)" -eq 1 ]; then \
 		$(MAKE) check-regblock; \